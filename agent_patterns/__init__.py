@@ -0,0 +1,7 @@
+"""
+Runnable reference implementations of the patterns described in the book.
+
+Each subpackage mirrors a chapter: memory (Chapter 4), and so on as more
+patterns gain executable form. Benchmarks live in the top-level benchmarks/
+directory and are run as modules, e.g. ``python -m benchmarks.bench_vector_store``.
+"""
@@ -0,0 +1,17 @@
+"""Retrieval-Enhanced Development Assistant case study (Chapter 6)."""
+
+from agent_patterns.dev_assistant.validation import (
+    CodeValidator,
+    ForbiddenCalls,
+    ModuleResolver,
+    ValidationResult,
+    ValidationService,
+)
+
+__all__ = [
+    'CodeValidator',
+    'ForbiddenCalls',
+    'ModuleResolver',
+    'ValidationResult',
+    'ValidationService',
+]
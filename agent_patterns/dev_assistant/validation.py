@@ -0,0 +1,246 @@
+"""
+Parallel, cached validation of generated code (Chapter 6).
+
+The case study's ``validate_code_generation`` runs ``ast.parse`` and then
+``check_imports`` on each generated snippet, one snippet at a time. A naive
+``check_imports`` calls ``importlib.util.find_spec`` for every import of
+every snippet, and each miss scans ``sys.path`` on disk. LLM output batches
+also repeat themselves, through retries, samples of the same prompt and
+shared boilerplate. This module removes that repeated work:
+
+- ``ModuleResolver`` caches ``find_spec`` results by top-level module name.
+  Only top-level names are resolved, because resolving ``a.b`` would import
+  ``a`` and run its code.
+- ``CodeValidator`` parses each snippet once and runs the import check and
+  any extra checks on that one tree. A check is a picklable callable
+  ``check(tree) -> list of issue strings``; it must be a pure function of the
+  tree and must not modify it. ``ForbiddenCalls`` is an example. The
+  outcome is cached in a bounded LRU keyed by the snippet's content hash,
+  so an identical snippet is neither parsed nor checked again. The
+  cache holds results, not the trees: thousands of live ASTs are millions of
+  GC-tracked objects, which every collection has to scan, and that cost more
+  than re-parsing. Input the parser cannot handle, or a check that raises,
+  makes that one snippet invalid with the error as its issue.
+- ``ValidationService.validate_batch`` removes duplicate snippets by content
+  hash and spreads the unique ones over an ``AgentProcessPool``. Each worker
+  keeps its own validator, and its caches, for the life of the service.
+  With a single worker it validates in-process, since a one-process pool
+  only adds IPC.
+
+Results unpack like the chapter's ``(valid, message)`` tuple.
+"""
+
+import ast
+import os
+import time
+import hashlib
+import importlib.util
+from collections import OrderedDict
+
+from agent_patterns.multi_agent.process_pool import AgentProcessPool
+
+
+class ValidationResult:
+    """Outcome of validating one snippet; iterates as (valid, message)."""
+
+    __slots__ = ('valid', 'message', 'issues')
+
+    def __init__(self, valid, message, issues=()):
+        self.valid = valid
+        self.message = message
+        self.issues = tuple(issues)
+
+    def __iter__(self):
+        return iter((self.valid, self.message))
+
+    def __eq__(self, other):
+        return isinstance(other, ValidationResult) and (self.valid, self.issues) == (other.valid, other.issues)
+
+    def __repr__(self):
+        return f"ValidationResult(valid={self.valid}, message={self.message!r})"
+
+
+def content_hash(code):
+    return hashlib.blake2b(code.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ModuleResolver:
+    """Cached `importlib.util.find_spec` lookups of top-level module names."""
+
+    def __init__(self):
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def exists(self, module):
+        name = module.partition('.')[0]
+        found = self._cache.get(name)
+        if found is not None:
+            self.hits += 1
+            return found
+        self.misses += 1
+        try:
+            found = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            found = False
+        self._cache[name] = found
+        return found
+
+    def clear(self):
+        """Forget cached lookups, e.g. after installing packages."""
+        self._cache.clear()
+
+
+def imported_modules(tree):
+    """Absolute module names imported anywhere in the tree, in first-seen order."""
+    names = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                names[alias.name] = None
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names[node.module] = None
+    return list(names)
+
+
+class MissingImports:
+    """Reports imports whose top-level module cannot be found."""
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+
+    def __call__(self, tree):
+        missing = [name for name in imported_modules(tree) if not self.resolver.exists(name)]
+        return [f"Missing imports: {', '.join(missing)}"] if missing else []
+
+
+class ForbiddenCalls:
+    """Reports calls to the given builtin names, such as eval and exec."""
+
+    def __init__(self, names=('eval', 'exec')):
+        self.names = frozenset(names)
+
+    def __call__(self, tree):
+        found = sorted({node.func.id for node in ast.walk(tree)
+                        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                        and node.func.id in self.names})
+        return [f"Forbidden calls: {', '.join(found)}"] if found else []
+
+
+class CodeValidator:
+    """Syntax, import and extra checks for one process, with outcome and module-resolution caches."""
+
+    def __init__(self, checks=(), resolver=None, max_cached=4096):
+        self.resolver = resolver or ModuleResolver()
+        self.checks = [MissingImports(self.resolver)] + list(checks)
+        self.max_cached = max_cached
+        self._results = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _check(self, code):
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            return ValidationResult(False, f"Syntax error: {e}", [f"Syntax error: {e}"])
+        except (MemoryError, RecursionError, ValueError) as e:
+            # Deeply nested input exhausts the parser; older Pythons raise ValueError on null bytes
+            issue = f"Cannot parse: {type(e).__name__}" + (f": {e}" if str(e) else '')
+            return ValidationResult(False, issue, [issue])
+        issues = []
+        for check in self.checks:
+            try:
+                issues.extend(check(tree))
+            except Exception as e:
+                # A failing check invalidates this snippet only, not the whole batch
+                issues.append(f"Check {type(check).__name__} failed: {type(e).__name__}: {e}")
+        if issues:
+            return ValidationResult(False, '; '.join(issues), issues)
+        return ValidationResult(True, 'Validation passed')
+
+    def validate(self, code, language='python'):
+        """Validate generated code; only Python is checked, as in the chapter."""
+        if language != 'python':
+            return ValidationResult(True, 'Validation passed')
+        key = content_hash(code)
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            self.cache_hits += 1
+            return result
+        self.cache_misses += 1
+        result = self._results[key] = self._check(code)
+        if len(self._results) > self.max_cached:
+            self._results.popitem(last=False)
+        return result
+
+    def __call__(self, item):
+        code, language = item
+        return self.validate(code, language)
+
+    def metrics(self):
+        return {
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'module_hits': self.resolver.hits,
+            'module_misses': self.resolver.misses,
+        }
+
+
+class _ValidatorFactory:
+    """Picklable factory building one CodeValidator per pool worker."""
+
+    def __init__(self, checks, max_cached):
+        self.checks = checks
+        self.max_cached = max_cached
+
+    def __call__(self, shared):
+        return CodeValidator(self.checks, max_cached=self.max_cached)
+
+
+class ValidationService:
+    """Validates batches of generated snippets across worker processes."""
+
+    def __init__(self, checks=(), workers=None, max_cached=4096, start_method=None):
+        self.checks = list(checks)
+        self.workers = workers or os.cpu_count() or 1
+        self.validator = CodeValidator(self.checks, max_cached=max_cached)
+        self._pool = None
+        if self.workers > 1:
+            self._pool = AgentProcessPool(_ValidatorFactory(self.checks, max_cached),
+                                          workers=self.workers, start_method=start_method)
+        self.last_batch = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def validate(self, code, language='python'):
+        """Validate one snippet in the calling process."""
+        return self.validator.validate(code, language)
+
+    def validate_batch(self, snippets, language='python', chunksize=None):
+        """Validate snippets, each distinct one once; results are in input order."""
+        start = time.perf_counter()
+        unique = {}
+        positions = [unique.setdefault(content_hash(code), (len(unique), code))[0] for code in snippets]
+        items = [(code, language) for _, code in unique.values()]
+        if self._pool is not None:
+            results = self._pool.map(items, chunksize)
+        else:
+            results = [self.validator(item) for item in items]
+        seconds = time.perf_counter() - start
+        self.last_batch = {
+            'snippets': len(positions),
+            'unique': len(items),
+            'seconds': seconds,
+            'snippets_per_second': len(positions) / seconds if seconds else 0.0,
+        }
+        return [results[i] for i in positions]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
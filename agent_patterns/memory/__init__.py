@@ -0,0 +1,30 @@
+"""Memory and State Patterns (Chapter 4)."""
+
+from agent_patterns.memory.vector_store import VectorStore, VectorContextManager
+from agent_patterns.memory.mmap_store import MmapVectorStore
+from agent_patterns.memory.ann_index import IVFIndex
+from agent_patterns.memory.working import WorkingMemory
+from agent_patterns.memory.tiered import TieredMemory, LRUPolicy, LFUPolicy, ARCPolicy
+from agent_patterns.memory.conversation import ConversationMemory, BackgroundSummarizingMemory
+from agent_patterns.memory.quantization import (
+    ScalarQuantizer,
+    ProductQuantizer,
+    QuantizedVectorStore,
+)
+
+__all__ = [
+    'VectorStore',
+    'VectorContextManager',
+    'MmapVectorStore',
+    'IVFIndex',
+    'ScalarQuantizer',
+    'ProductQuantizer',
+    'QuantizedVectorStore',
+    'ConversationMemory',
+    'BackgroundSummarizingMemory',
+    'WorkingMemory',
+    'TieredMemory',
+    'LRUPolicy',
+    'LFUPolicy',
+    'ARCPolicy',
+]
@@ -0,0 +1,177 @@
+"""
+IVF approximate nearest-neighbour index for long-term memory retrieval.
+
+An inverted-file (IVF) index partitions normalized embeddings into ``n_lists``
+clusters found by spherical k-means. A query is compared against the cluster
+centroids first and then scanned exhaustively only inside the ``n_probe``
+closest clusters, so search cost falls from O(N) to roughly O(N * n_probe /
+n_lists). Raising ``n_probe`` trades latency for recall.
+
+The index exposes the same ``add`` / ``similarity_search`` interface as
+``VectorStore``. Vectors added before the index is trained are kept in a flat
+buffer and searched exactly; once ``train_size`` vectors have arrived the
+coarse quantizer is trained on them and every later insertion is routed to
+its cluster incrementally.
+"""
+
+import numpy as np
+
+from agent_patterns.memory.vector_store import normalize_rows, top_k
+
+
+def spherical_kmeans(vectors, n_clusters, iterations=20, seed=0):
+    """Cluster row-normalized vectors by cosine similarity; return unit centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=n_clusters)
+
+        empty = counts == 0
+        if empty.any():
+            # Reseed empty clusters from random points so no list goes unused
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+class _InvertedList:
+    """Growable (vectors, ids) arrays for one cluster, doubling on overflow."""
+
+    __slots__ = ('vectors', 'ids', 'size')
+
+    def __init__(self, dim, capacity=16):
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+
+    def append(self, vectors, ids):
+        needed = self.size + len(ids)
+        if needed > len(self.ids):
+            capacity = len(self.ids)
+            while capacity < needed:
+                capacity *= 2
+            grown_vectors = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown_vectors[:self.size] = self.vectors[:self.size]
+            grown_ids = np.empty(capacity, dtype=np.int64)
+            grown_ids[:self.size] = self.ids[:self.size]
+            self.vectors, self.ids = grown_vectors, grown_ids
+        self.vectors[self.size:needed] = vectors
+        self.ids[self.size:needed] = ids
+        self.size = needed
+
+
+class IVFIndex:
+    """Approximate cosine-similarity index with k-means coarse quantization.
+
+    ``n_lists`` sets the number of clusters (around sqrt(N) is a good start),
+    ``n_probe`` how many clusters each query scans, and ``train_size`` how many
+    vectors to collect before training (default: 40 per list).
+    """
+
+    def __init__(self, dim, n_lists=1024, n_probe=8, train_size=None,
+                 kmeans_iterations=20, seed=0):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_size = train_size or 40 * n_lists
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+        self.centroids = None
+        self._lists = None
+        self._buffer = []
+        self._buffer_ids = []
+        self._items = []
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def item(self, index):
+        return self._items[index]
+
+    def train(self, sample=None):
+        """Train the coarse quantizer on sample (default: the buffered vectors)."""
+        if self.is_trained:
+            raise ValueError("Index is already trained")
+        buffered = np.concatenate(self._buffer) if self._buffer else np.empty((0, self.dim), np.float32)
+        sample = buffered if sample is None else normalize_rows(sample)
+        if len(sample) < self.n_lists:
+            raise ValueError(f"Need at least n_lists={self.n_lists} vectors to train, got {len(sample)}")
+
+        self.centroids = spherical_kmeans(sample, self.n_lists, self.kmeans_iterations, self.seed)
+        self._lists = [_InvertedList(self.dim) for _ in range(self.n_lists)]
+        if len(buffered):
+            self._route(buffered, np.asarray(self._buffer_ids, dtype=np.int64))
+        self._buffer, self._buffer_ids = [], []
+
+    def _route(self, vectors, ids):
+        """Append vectors to the inverted list of their nearest centroid."""
+        assignment = np.argmax(vectors @ self.centroids.T, axis=1)
+        order = np.argsort(assignment, kind='stable')
+        boundaries = np.flatnonzero(np.diff(assignment[order])) + 1
+        for group in np.split(order, boundaries):
+            self._lists[assignment[group[0]]].append(vectors[group], ids[group])
+
+    def add(self, embeddings, items=None):
+        """Insert embeddings with optional payloads; return their ids."""
+        rows = normalize_rows(embeddings)
+        if rows.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional embeddings, got {rows.shape[1]}")
+        if items is None:
+            items = [None] * len(rows)
+        elif len(items) != len(rows):
+            raise ValueError("Number of items must match number of embeddings")
+
+        ids = np.arange(len(self._items), len(self._items) + len(rows), dtype=np.int64)
+        self._items.extend(items)
+
+        if self.is_trained:
+            self._route(rows, ids)
+        else:
+            self._buffer.append(rows)
+            self._buffer_ids.extend(ids.tolist())
+            if len(self._buffer_ids) >= self.train_size:
+                self.train()
+        return ids.tolist()
+
+    def search_batch(self, query_embeddings, k=5, n_probe=None):
+        """Return (ids, scores) arrays of shape (num_queries, k), padded with -1/-inf."""
+        queries = normalize_rows(query_embeddings)
+        result_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        result_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+
+        if not self.is_trained:
+            if self._buffer:
+                rows, scores = top_k(queries @ np.concatenate(self._buffer).T, k)
+                buffer_ids = np.asarray(self._buffer_ids, dtype=np.int64)
+                result_ids[:, :rows.shape[1]] = buffer_ids[rows]
+                result_scores[:, :rows.shape[1]] = scores
+            return result_ids, result_scores
+
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        probes, _ = top_k(queries @ self.centroids.T, n_probe)
+
+        for q, query in enumerate(queries):
+            lists = [self._lists[p] for p in probes[q] if self._lists[p].size]
+            if not lists:
+                continue
+            candidates = np.concatenate([lst.vectors[:lst.size] for lst in lists])
+            candidate_ids = np.concatenate([lst.ids[:lst.size] for lst in lists])
+            rows, scores = top_k((candidates @ query)[np.newaxis, :], k)
+            result_ids[q, :rows.shape[1]] = candidate_ids[rows[0]]
+            result_scores[q, :rows.shape[1]] = scores[0]
+
+        return result_ids, result_scores
+
+    def similarity_search(self, query_embedding, k=5, n_probe=None):
+        """Return up to k approximate nearest items as (item, score) pairs, best first."""
+        ids, scores = self.search_batch(query_embedding, k, n_probe)
+        return [(self._items[i], float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
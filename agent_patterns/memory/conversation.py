@@ -0,0 +1,286 @@
+"""
+Token-budgeted Conversation Memory Pattern (Chapter 4, Figure "Conversation Memory").
+
+Every message is tokenized exactly once, when it is stored. Messages live in a
+growable ring buffer together with a running (cumulative) token count, so the
+"Check token count" step of the sequence diagram is O(1) and the token total
+of any suffix of the history is a subtraction of two prefix sums. When the
+window exceeds ``max_tokens``, the cut point that leaves at most
+``keep_recent_tokens`` of recent messages is found by binary search over those
+prefix sums; the older messages are folded into the running summary and
+dropped from the front of the ring. The newest message is always retained,
+and truncated in ``get_context`` if it alone exceeds the budget.
+
+``BackgroundSummarizingMemory`` moves that summarization off the request path
+into a background asyncio task started at a soft watermark.
+"""
+
+import time
+import asyncio
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def approximate_token_count(text):
+    """Cheap tokenizer-free estimate (about four characters per token)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def truncate_to_tokens(text, max_tokens, token_counter):
+    """Longest prefix of text that token_counter counts as at most max_tokens (binary search)."""
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if token_counter(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low]
+
+
+def truncating_summarizer(previous_summary, messages):
+    """Default summarizer: keeps the previous summary and drops older messages (sliding window)."""
+    return previous_summary
+
+
+class Message:
+    """One stored message with its token count cached at insertion."""
+
+    __slots__ = ('role', 'content', 'tokens', 'cumulative')
+
+    def __init__(self, role, content, tokens, cumulative):
+        self.role = role
+        self.content = content
+        self.tokens = tokens
+        # Running total of tokens of every message stored up to and including this one
+        self.cumulative = cumulative
+
+    def as_dict(self):
+        return {'role': self.role, 'content': self.content}
+
+
+class ConversationMemory:
+    """Conversation history kept within a token budget by summarizing older turns.
+
+    ``summarizer(previous_summary, messages)`` returns the new summary text for
+    the messages being evicted; ``token_counter(text)`` returns a token count and
+    is called once per stored message and once per new summary.
+    """
+
+    def __init__(self, max_tokens=3000, keep_recent_tokens=None, summarizer=None,
+                 token_counter=None, capacity=64):
+        self.max_tokens = max_tokens
+        self.keep_recent_tokens = keep_recent_tokens if keep_recent_tokens is not None else max_tokens // 2
+        self.summarizer = summarizer or truncating_summarizer
+        self.token_counter = token_counter or approximate_token_count
+        self.summary = ''
+        self.summary_tokens = 0
+        self._ring = [None] * capacity
+        self._head = 0
+        self._count = 0
+        self._cumulative = 0
+        self._evicted_cumulative = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """Message at logical position index (0 is the oldest retained message)."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._ring[(self._head + index) % len(self._ring)]
+
+    @property
+    def window_tokens(self):
+        """Tokens in the retained (unsummarized) messages."""
+        return self._cumulative - self._evicted_cumulative
+
+    @property
+    def total_tokens(self):
+        """Tokens the context window would occupy: summary plus retained messages."""
+        return self.summary_tokens + self.window_tokens
+
+    def _grow(self):
+        old = self._ring
+        self._ring = [self[i] for i in range(self._count)] + [None] * len(old)
+        self._head = 0
+
+    def add_message(self, role, content):
+        """Store a message, summarizing older history if the budget is exceeded."""
+        if self._count == len(self._ring):
+            self._grow()
+        tokens = self.token_counter(content)
+        self._cumulative += tokens
+        self._ring[(self._head + self._count) % len(self._ring)] = Message(
+            role, content, tokens, self._cumulative)
+        self._count += 1
+        self._check_budget()
+
+    def _check_budget(self):
+        """The diagram's "Check token count" step, run after every stored message."""
+        if self.total_tokens > self.max_tokens:
+            self.summarize()
+
+    def tokens_since(self, index):
+        """Tokens in messages from logical position index to the newest, in O(1)."""
+        if index >= self._count:
+            return 0
+        before = self[index - 1].cumulative if index > 0 else self._evicted_cumulative
+        return self._cumulative - before
+
+    def cut_point(self, keep_tokens):
+        """Smallest logical index whose suffix fits in keep_tokens (binary search).
+
+        The newest message is never cut, even when it alone exceeds keep_tokens,
+        so the turn being answered always stays in the context.
+        """
+        low, high = 0, max(self._count - 1, 0)
+        while low < high:
+            mid = (low + high) // 2
+            if self.tokens_since(mid) <= keep_tokens:
+                high = mid
+            else:
+                low = mid + 1
+        return low
+
+    def evict(self, count):
+        """Drop the oldest count messages from the ring and return them."""
+        evicted = [self[i] for i in range(count)]
+        for i in range(count):
+            self._ring[(self._head + i) % len(self._ring)] = None
+        self._head = (self._head + count) % len(self._ring)
+        self._count -= count
+        if evicted:
+            self._evicted_cumulative = evicted[-1].cumulative
+        return evicted
+
+    def summarize(self):
+        """Fold the messages older than the keep_recent_tokens suffix into the summary."""
+        cut = self.cut_point(self.keep_recent_tokens)
+        if cut == 0:
+            return
+        evicted = self.evict(cut)
+        self._set_summary(self.summarizer(self.summary, [m.as_dict() for m in evicted]))
+
+    def _set_summary(self, summary):
+        self.summary = summary
+        self.summary_tokens = self.token_counter(summary) if summary else 0
+
+    def get_context(self):
+        """Return the summary (as a system message) followed by the retained messages."""
+        context = []
+        if self.summary:
+            context.append({'role': 'system', 'content': f"Summary of earlier conversation: {self.summary}"})
+        context.extend(self[i].as_dict() for i in range(self._count))
+        return self._fit_newest(context)
+
+    def _fit_newest(self, context):
+        """Truncate the newest message if it alone exceeds the budget left after the summary."""
+        budget = max(self.max_tokens - self.summary_tokens, 0)
+        if self._count and self[-1].tokens > budget:
+            context[-1]['content'] = truncate_to_tokens(context[-1]['content'], budget, self.token_counter)
+        return context
+
+
+class BackgroundSummarizingMemory(ConversationMemory):
+    """Conversation memory that summarizes ahead of time in a background asyncio task.
+
+    Once the context crosses ``soft_limit_tokens`` a summarization task is
+    started for the messages older than the ``keep_recent_tokens`` suffix; the
+    request path never waits for it. When it completes, the new summary and the
+    eviction of the summarized messages are applied together, with no await in
+    between, so readers see either the old state or the new one. Until then,
+    turns are served from the old summary plus the unsummarized tail, trimmed
+    to ``max_tokens`` if necessary.
+
+    ``summarizer(previous_summary, messages)`` may be a coroutine function, such
+    as ``StubLLM.summarize``. ``add_message`` must be called from a running
+    event loop.
+
+    A failed summarization is kept in ``summarization_error`` and logged on the
+    next ``add_message`` or ``get_context``; ``wait_for_summary`` raises it. The
+    next attempt waits ``retry_backoff`` seconds, doubling with each consecutive
+    failure up to ``max_retry_backoff``, instead of retrying on every turn.
+    """
+
+    def __init__(self, max_tokens=3000, soft_limit_tokens=None, keep_recent_tokens=None,
+                 summarizer=None, token_counter=None, capacity=64, retry_backoff=1.0, max_retry_backoff=60.0):
+        super().__init__(max_tokens, keep_recent_tokens, summarizer, token_counter, capacity)
+        self.soft_limit_tokens = soft_limit_tokens if soft_limit_tokens is not None else max_tokens * 3 // 4
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.summarization_error = None
+        self.summarization_failures = 0
+        self._error_logged = False
+        self._retry_at = 0.0
+        self._task = None
+
+    @property
+    def summarizing(self):
+        return self._task is not None and not self._task.done()
+
+    def _check_budget(self):
+        if (self.total_tokens > self.soft_limit_tokens and not self.summarizing
+                and time.monotonic() >= self._retry_at):
+            cut = self.cut_point(self.keep_recent_tokens)
+            if cut:
+                self._task = asyncio.get_running_loop().create_task(self._summarize_prefix(cut))
+
+    async def _summarize_prefix(self, cut):
+        # Only appends happen while we await, so the first `cut` messages stay put
+        messages = [self[i].as_dict() for i in range(cut)]
+        boundary = self[cut - 1].cumulative
+        try:
+            summary = self.summarizer(self.summary, messages)
+            if inspect.isawaitable(summary):
+                summary = await summary
+        except Exception as e:
+            self.summarization_failures += 1
+            self.summarization_error = e
+            self._error_logged = False
+            self._retry_at = time.monotonic() + min(
+                self.max_retry_backoff, self.retry_backoff * 2 ** (self.summarization_failures - 1))
+            return
+
+        self.summarization_failures = 0
+        self.summarization_error = None
+        if self._count >= cut and self[cut - 1].cumulative == boundary:
+            self.evict(cut)
+            self._set_summary(summary)
+        # Messages that arrived meanwhile may already call for the next round
+        self._task = None
+        self._check_budget()
+
+    def _report_error(self):
+        # Once per failure: the request path keeps working on the old summary, so it is not raised
+        if self.summarization_error is not None and not self._error_logged:
+            self._error_logged = True
+            logger.warning("Background summarization failed %d time(s) in a row; next attempt in %.1f s",
+                           self.summarization_failures, max(self._retry_at - time.monotonic(), 0.0),
+                           exc_info=self.summarization_error)
+
+    async def wait_for_summary(self):
+        """Wait until no background summarization is in flight; raise the error if it failed."""
+        while self.summarizing:
+            await asyncio.shield(self._task)
+        error, self.summarization_error = self.summarization_error, None
+        if error is not None:
+            raise RuntimeError(f"Background summarization failed: {error!r}") from error
+
+    def add_message(self, role, content):
+        super().add_message(role, content)
+        self._report_error()
+
+    def get_context(self):
+        """Summary plus the unsummarized tail, dropping the oldest turns if over max_tokens."""
+        self._report_error()
+        context = super().get_context()
+        if self.total_tokens <= self.max_tokens:
+            return context
+        skip = self.cut_point(self.max_tokens - self.summary_tokens)
+        offset = 1 if self.summary else 0
+        return self._fit_newest(context[:offset] + context[offset + skip:])
@@ -0,0 +1,377 @@
+"""
+Persistent, memory-mapped vector store for the Long-Term Memory Pattern.
+
+A store is a directory of immutable segments plus a small manifest:
+
+    manifest.json          live segment names, dimension, dtype, next id
+    seg-000001.vec         64-byte header followed by a row-major float32/float16 matrix
+    seg-000001.idx         table of (id, metadata offset, metadata length) records
+    seg-000001.meta        concatenated JSON metadata documents
+
+Opening a store reads only the manifest and maps each segment, so start-up
+time and resident memory do not grow with the number of stored memories; the
+operating system pages vectors in as searches touch them. New embeddings are
+buffered and written as a fresh append-only segment on flush. When segments
+accumulate, they are merged into one by a background compaction thread and
+swapped in by atomically replacing the manifest. Segment files and the
+directory are fsynced before the manifest that names them, so a crash never
+leaves a manifest pointing at missing or partial segments. A failed
+background compaction is raised from ``wait_for_compaction`` (and ``close``).
+"""
+
+import os
+import json
+import struct
+import threading
+
+import numpy as np
+
+from agent_patterns.memory.vector_store import normalize_rows, top_k
+
+MAGIC = b'APVS'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHIQ')
+HEADER_SIZE = 64
+DTYPES = {'float32': (0, np.float32), 'float16': (1, np.float16)}
+DTYPE_NAMES = {code: name for name, (code, _) in DTYPES.items()}
+TABLE_DTYPE = np.dtype([('id', '<u8'), ('offset', '<u8'), ('length', '<u4')])
+MANIFEST = 'manifest.json'
+META_COPY_BYTES = 1 << 20
+
+
+def _sync(f):
+    """Push a file's written bytes through to the disk."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _sync_directory(path):
+    """Persist new and renamed directory entries (skipped where directories cannot be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(path, data):
+    """Write bytes to path via a temporary file and rename."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        _sync(f)
+    os.replace(tmp_path, path)
+    _sync_directory(os.path.dirname(path) or '.')
+
+
+def _map(path, dtype, offset=0, shape=None):
+    """Memory-map a file read-only, tolerating empty arrays."""
+    if (shape is not None and 0 in shape) or os.path.getsize(path) <= offset:
+        return np.empty(shape or (0,), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+class _Segment:
+    """Read-only mapped view of one segment's vectors, id table and metadata."""
+
+    def __init__(self, directory, name):
+        self.name = name
+        base = os.path.join(directory, name)
+
+        with open(base + '.vec', 'rb') as f:
+            magic, version, dtype_code, dim, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{base}.vec is not a version {FORMAT_VERSION} vector segment")
+
+        self.dim = dim
+        self.dtype = DTYPES[DTYPE_NAMES[dtype_code]][1]
+        self.vectors = _map(base + '.vec', self.dtype, HEADER_SIZE, (count, dim))
+        self.table = _map(base + '.idx', TABLE_DTYPE, shape=(count,))
+        self.meta = _map(base + '.meta', np.uint8)
+
+    def __len__(self):
+        return len(self.table)
+
+    def locate(self, memory_id):
+        """Return the row holding memory_id, or None."""
+        row = int(np.searchsorted(self.table['id'], memory_id))
+        if row < len(self.table) and self.table['id'][row] == memory_id:
+            return row
+        return None
+
+    def metadata(self, row):
+        record = self.table[row]
+        start = int(record['offset'])
+        return json.loads(bytes(self.meta[start:start + int(record['length'])]))
+
+    def paths(self, directory):
+        return self.paths_for(directory, self.name)
+
+    @staticmethod
+    def paths_for(directory, name):
+        base = os.path.join(directory, name)
+        return [base + '.vec', base + '.idx', base + '.meta']
+
+
+def write_segment(directory, name, vectors, ids, items, dtype):
+    """Write one immutable segment (vectors must already be normalized)."""
+    base = os.path.join(directory, name)
+    code, np_dtype = DTYPES[dtype]
+    vectors = np.ascontiguousarray(vectors, dtype=np_dtype)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, code, vectors.shape[1], len(vectors))
+    with open(base + '.vec', 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(vectors.tobytes())
+        _sync(f)
+
+    table = np.empty(len(ids), dtype=TABLE_DTYPE)
+    chunks = []
+    offset = 0
+    for row, (memory_id, item) in enumerate(zip(ids, items)):
+        encoded = json.dumps(item, separators=(',', ':')).encode('utf-8')
+        table[row] = (memory_id, offset, len(encoded))
+        chunks.append(encoded)
+        offset += len(encoded)
+
+    with open(base + '.idx', 'wb') as f:
+        f.write(table.tobytes())
+        _sync(f)
+    with open(base + '.meta', 'wb') as f:
+        f.write(b''.join(chunks))
+        _sync(f)
+    # The manifest that names this segment must never reach disk before its files
+    _sync_directory(directory)
+
+
+def merge_segments(directory, name, segments, dtype, block_rows):
+    """Stream several segments into one new segment without loading them whole."""
+    base = os.path.join(directory, name)
+    code = DTYPES[dtype][0]
+    dim = segments[0].dim
+    count = sum(len(s) for s in segments)
+
+    with open(base + '.vec', 'wb') as vec, open(base + '.idx', 'wb') as idx, \
+            open(base + '.meta', 'wb') as meta:
+        vec.write(HEADER.pack(MAGIC, FORMAT_VERSION, code, dim, count).ljust(HEADER_SIZE, b'\0'))
+        meta_offset = 0
+        for segment in segments:
+            for start in range(0, len(segment), block_rows):
+                vec.write(np.ascontiguousarray(segment.vectors[start:start + block_rows]).tobytes())
+            table = np.array(segment.table)
+            table['offset'] += meta_offset
+            idx.write(table.tobytes())
+            for start in range(0, len(segment.meta), META_COPY_BYTES):
+                meta.write(bytes(segment.meta[start:start + META_COPY_BYTES]))
+            meta_offset += len(segment.meta)
+        for f in (vec, idx, meta):
+            _sync(f)
+    _sync_directory(directory)
+
+
+class MmapVectorStore:
+    """Append-only on-disk vector store searched directly over mapped pages.
+
+    Items must be JSON-serializable. Pass ``dim`` (and optionally ``dtype``)
+    when creating a new store; an existing store is opened from its manifest.
+    """
+
+    def __init__(self, path, dim=None, dtype='float32', flush_threshold=4096,
+                 compact_threshold=8, block_rows=65536):
+        self.path = path
+        self.flush_threshold = flush_threshold
+        self.compact_threshold = compact_threshold
+        self.block_rows = block_rows
+        self._lock = threading.RLock()
+        self._compaction = None
+        self.compaction_error = None
+        self._pending_vectors = []
+        self._pending_ids = []
+        self._pending_items = []
+
+        manifest_path = os.path.join(path, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if dim is not None and dim != manifest['dim']:
+                raise ValueError(f"Store at {path} has dimension {manifest['dim']}, not {dim}")
+            self.dim = manifest['dim']
+            self.dtype = manifest['dtype']
+            self._next_id = manifest['next_id']
+            self._next_segment = manifest['next_segment']
+            self._segments = [_Segment(path, name) for name in manifest['segments']]
+        else:
+            if dim is None:
+                raise ValueError(f"No vector store at {path}; pass dim to create one")
+            if dtype not in DTYPES:
+                raise ValueError(f"dtype must be one of {sorted(DTYPES)}")
+            os.makedirs(path, exist_ok=True)
+            self.dim = dim
+            self.dtype = dtype
+            self._next_id = 0
+            self._next_segment = 1
+            self._segments = []
+            self._write_manifest()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(s) for s in self._segments) + len(self._pending_ids)
+
+    @property
+    def segment_count(self):
+        return len(self._segments)
+
+    def _write_manifest(self):
+        manifest = {
+            'version': FORMAT_VERSION,
+            'dim': self.dim,
+            'dtype': self.dtype,
+            'next_id': self._next_id,
+            'next_segment': self._next_segment,
+            'segments': [s.name for s in self._segments],
+        }
+        _write_atomic(os.path.join(self.path, MANIFEST), json.dumps(manifest).encode('utf-8'))
+
+    def _new_segment_name(self):
+        name = f"seg-{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def add(self, embeddings, items=None):
+        """Buffer embeddings with JSON-serializable payloads; return their ids."""
+        rows = normalize_rows(embeddings)
+        if rows.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional embeddings, got {rows.shape[1]}")
+        if items is None:
+            items = [None] * len(rows)
+        elif len(items) != len(rows):
+            raise ValueError("Number of items must match number of embeddings")
+
+        with self._lock:
+            ids = list(range(self._next_id, self._next_id + len(rows)))
+            self._next_id += len(rows)
+            self._pending_vectors.append(rows)
+            self._pending_ids.extend(ids)
+            self._pending_items.extend(items)
+            if len(self._pending_ids) >= self.flush_threshold:
+                self.flush()
+        return ids
+
+    def flush(self):
+        """Write buffered embeddings as a new segment and publish it in the manifest."""
+        with self._lock:
+            if not self._pending_ids:
+                return
+            name = self._new_segment_name()
+            write_segment(self.path, name, np.concatenate(self._pending_vectors),
+                          self._pending_ids, self._pending_items, self.dtype)
+            self._segments.append(_Segment(self.path, name))
+            self._write_manifest()
+            self._pending_vectors, self._pending_ids, self._pending_items = [], [], []
+
+            if len(self._segments) >= self.compact_threshold:
+                self.compact(background=True)
+
+    def compact(self, background=False):
+        """Merge all current segments into one; returns the worker thread if backgrounded."""
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return self._compaction
+            if len(self._segments) < 2:
+                return None
+            snapshot = list(self._segments)
+            name = self._new_segment_name()
+            self._write_manifest()
+
+        if not background:
+            self._merge(snapshot, name)
+            return None
+        self._compaction = threading.Thread(target=self._merge_in_background, args=(snapshot, name),
+                                            name='vector-store-compaction', daemon=True)
+        self._compaction.start()
+        return self._compaction
+
+    def _merge(self, snapshot, name):
+        """Write the merged segment, then swap it in for the segments it replaces."""
+        merge_segments(self.path, name, snapshot, self.dtype, self.block_rows)
+        merged = _Segment(self.path, name)
+
+        with self._lock:
+            replaced = {s.name for s in snapshot}
+            remaining = [s for s in self._segments if s.name not in replaced]
+            self._segments = [merged] + remaining
+            self._write_manifest()
+
+        # Searches holding the old mappings keep working until they drop them
+        for segment in snapshot:
+            for path in segment.paths(self.path):
+                os.remove(path)
+
+    def _merge_in_background(self, snapshot, name):
+        try:
+            self._merge(snapshot, name)
+        except Exception as e:
+            # The manifest still lists the old segments, so the store stays usable;
+            # drop the partial merge and report the error from wait_for_compaction
+            for path in _Segment.paths_for(self.path, name):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.compaction_error = e
+
+    def wait_for_compaction(self):
+        """Wait for a background compaction; raise the error if it failed."""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        error, self.compaction_error = self.compaction_error, None
+        if error is not None:
+            raise RuntimeError(f"Background compaction of {self.path} failed: {error!r}") from error
+
+    def close(self):
+        self.flush()
+        self.wait_for_compaction()
+
+    def _sources(self):
+        """Snapshot (vectors, ids) pairs for every segment plus the write buffer."""
+        with self._lock:
+            sources = [(s.vectors, s.table['id']) for s in self._segments]
+            if self._pending_ids:
+                sources.append((np.concatenate(self._pending_vectors),
+                                np.asarray(self._pending_ids, dtype=np.uint64)))
+        return sources
+
+    def search_batch(self, query_embeddings, k=5):
+        """Return (ids, scores) arrays of shape (num_queries, k) over all segments."""
+        queries = normalize_rows(query_embeddings)
+        best_ids = np.empty((len(queries), 0), dtype=np.uint64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+
+        for vectors, ids in self._sources():
+            for start in range(0, len(vectors), self.block_rows):
+                block = np.asarray(vectors[start:start + self.block_rows], dtype=np.float32)
+                rows, scores = top_k(queries @ block.T, k)
+                merged_scores = np.concatenate([best_scores, scores], axis=1)
+                merged_ids = np.concatenate([best_ids, ids[start + rows]], axis=1)
+                keep, best_scores = top_k(merged_scores, k)
+                best_ids = np.take_along_axis(merged_ids, keep, axis=1)
+
+        return best_ids.astype(np.int64), best_scores
+
+    def get(self, memory_id):
+        """Return the payload stored with memory_id."""
+        with self._lock:
+            for segment in self._segments:
+                row = segment.locate(memory_id)
+                if row is not None:
+                    return segment.metadata(row)
+            if memory_id in self._pending_ids:
+                return self._pending_items[self._pending_ids.index(memory_id)]
+        raise KeyError(memory_id)
+
+    def similarity_search(self, query_embedding, k=5):
+        """Return the k most similar stored items as (item, score) pairs, best first."""
+        ids, scores = self.search_batch(query_embedding, k)
+        return [(self.get(int(i)), float(s)) for i, s in zip(ids[0], scores[0])]
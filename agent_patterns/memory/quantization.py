@@ -0,0 +1,252 @@
+"""
+Quantized embedding storage for the Memory Optimization Pattern.
+
+Two compression schemes are provided for normalized embeddings:
+
+- ``ScalarQuantizer`` stores each dimension as one byte (4x smaller than
+  float32), using a per-dimension offset and step learned from a sample.
+- ``ProductQuantizer`` splits each vector into ``m`` sub-vectors and stores
+  the index of the nearest of 256 sub-centroids for each (``m`` bytes per
+  vector, e.g. 48 bytes instead of 1536 for 384 dimensions).
+
+Both score queries asymmetrically: the query stays in full precision and is
+compared against the compressed codes. For product quantization this is a
+``(m, 256)`` lookup table of partial dot products built once per query and
+summed by fancy indexing. ``QuantizedVectorStore`` keeps only codes in memory,
+shortlists ``rerank`` candidates by approximate score and re-ranks them against
+full-precision vectors, which can live in a memory-mapped file on disk.
+"""
+
+import numpy as np
+
+from agent_patterns.memory.vector_store import normalize_rows, top_k
+
+ENCODE_BLOCK_ROWS = 65536
+
+
+class ScalarQuantizer:
+    """8-bit per-dimension scalar quantization."""
+
+    def __init__(self, dim, clip_percentile=0.1):
+        self.dim = dim
+        self.code_size = dim
+        self.clip_percentile = clip_percentile
+        self.offset = None
+        self.step = None
+
+    @property
+    def is_trained(self):
+        return self.offset is not None
+
+    def train(self, sample):
+        low = np.percentile(sample, self.clip_percentile, axis=0)
+        high = np.percentile(sample, 100 - self.clip_percentile, axis=0)
+        self.offset = low.astype(np.float32)
+        self.step = np.maximum((high - low) / 255.0, 1e-12).astype(np.float32)
+
+    def encode(self, vectors):
+        codes = np.rint((vectors - self.offset) / self.step)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def decode(self, codes):
+        return codes.astype(np.float32) * self.step + self.offset
+
+    def scores(self, queries, codes):
+        """Asymmetric dot products between float queries and uint8 codes."""
+        # q . (offset + step * code) == q . offset + (q * step) . code
+        bias = queries @ self.offset
+        return (queries * self.step) @ codes.astype(np.float32).T + bias[:, np.newaxis]
+
+
+class ProductQuantizer:
+    """Product quantization with 256 centroids (one byte) per sub-vector."""
+
+    def __init__(self, dim, m=48, iterations=15, seed=0):
+        if dim % m:
+            raise ValueError(f"dim={dim} must be divisible by m={m}")
+        self.dim = dim
+        self.m = m
+        self.code_size = m
+        self.sub_dim = dim // m
+        self.iterations = iterations
+        self.seed = seed
+        self.codebooks = None
+
+    @property
+    def is_trained(self):
+        return self.codebooks is not None
+
+    def _split(self, vectors):
+        return vectors.reshape(len(vectors), self.m, self.sub_dim)
+
+    def _nearest(self, sub_vectors, codebook):
+        """Index of the closest codebook entry (squared L2) for each sub-vector."""
+        distances = (codebook ** 2).sum(axis=1) - 2 * sub_vectors @ codebook.T
+        return np.argmin(distances, axis=1)
+
+    def train(self, sample):
+        if len(sample) < 256:
+            raise ValueError(f"Need at least 256 training vectors, got {len(sample)}")
+        rng = np.random.default_rng(self.seed)
+        subs = self._split(np.asarray(sample, dtype=np.float32))
+        self.codebooks = np.empty((self.m, 256, self.sub_dim), dtype=np.float32)
+
+        for j in range(self.m):
+            points = subs[:, j, :]
+            codebook = points[rng.choice(len(points), 256, replace=False)].copy()
+            for _ in range(self.iterations):
+                assignment = self._nearest(points, codebook)
+                sums = np.zeros_like(codebook)
+                np.add.at(sums, assignment, points)
+                counts = np.bincount(assignment, minlength=256)
+                filled = counts > 0
+                codebook[filled] = sums[filled] / counts[filled, np.newaxis]
+            self.codebooks[j] = codebook
+
+    def encode(self, vectors):
+        subs = self._split(vectors)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            codes[:, j] = self._nearest(subs[:, j, :], self.codebooks[j])
+        return codes
+
+    def decode(self, codes):
+        parts = self.codebooks[np.arange(self.m), codes]
+        return parts.reshape(len(codes), self.dim)
+
+    def scores(self, queries, codes):
+        """Asymmetric dot products via per-query (m, 256) lookup tables."""
+        # tables[q, j, c] = query q's sub-vector j dotted with centroid c of codebook j
+        tables = np.einsum('qjd,jcd->qjc', self._split(queries), self.codebooks)
+        columns = np.arange(self.m)
+        return np.stack([table[columns, codes].sum(axis=1) for table in tables])
+
+
+class QuantizedVectorStore:
+    """Vector store holding compressed codes in memory with full-precision re-ranking.
+
+    ``quantizer`` is a ScalarQuantizer or ProductQuantizer and must be trained
+    (see ``train``) before vectors are added. Full-precision vectors are kept in
+    RAM, or appended to ``full_precision_path`` and memory-mapped so that only
+    re-ranked candidates are paged in; that file must not exist yet. Set
+    ``rerank=0`` to skip re-ranking.
+    """
+
+    def __init__(self, quantizer, rerank=100, full_precision_path=None, capacity=1024):
+        self.quantizer = quantizer
+        self.dim = quantizer.dim
+        self.rerank = rerank
+        self.full_precision_path = full_precision_path
+        self._codes = np.empty((capacity, quantizer.code_size), dtype=np.uint8)
+        self._size = 0
+        self._items = []
+        self._full = None
+        self._full_mapped = None
+
+        if full_precision_path is not None:
+            # Codes live only in memory, so an existing file cannot be reattached;
+            # refuse rather than silently truncate someone's data
+            try:
+                open(full_precision_path, 'xb').close()
+            except FileExistsError:
+                raise ValueError(f"{full_precision_path} already exists; "
+                                 f"pass a new path for the full-precision vectors") from None
+        else:
+            self._full = np.empty((capacity, self.dim), dtype=np.float32)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def code_bytes(self):
+        """Bytes of compressed codes held in memory for the stored vectors."""
+        return self._size * self.quantizer.code_size
+
+    def train(self, sample):
+        self.quantizer.train(normalize_rows(sample))
+
+    def _grow(self, needed):
+        capacity = len(self._codes)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        codes = np.empty((capacity, self._codes.shape[1]), dtype=np.uint8)
+        codes[:self._size] = self._codes[:self._size]
+        self._codes = codes
+        if self._full is not None:
+            full = np.empty((capacity, self.dim), dtype=np.float32)
+            full[:self._size] = self._full[:self._size]
+            self._full = full
+
+    def add(self, embeddings, items=None):
+        """Encode and append embeddings with optional payloads; return their ids."""
+        if not self.quantizer.is_trained:
+            raise ValueError("Quantizer must be trained before adding vectors")
+        rows = normalize_rows(embeddings)
+        if rows.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional embeddings, got {rows.shape[1]}")
+        if items is None:
+            items = [None] * len(rows)
+        elif len(items) != len(rows):
+            raise ValueError("Number of items must match number of embeddings")
+
+        start = self._size
+        self._grow(start + len(rows))
+        for block in range(0, len(rows), ENCODE_BLOCK_ROWS):
+            chunk = rows[block:block + ENCODE_BLOCK_ROWS]
+            self._codes[start + block:start + block + len(chunk)] = self.quantizer.encode(chunk)
+
+        if self._full is not None:
+            self._full[start:start + len(rows)] = rows
+        else:
+            with open(self.full_precision_path, 'ab') as f:
+                f.write(rows.tobytes())
+            self._full_mapped = None
+
+        self._size += len(rows)
+        self._items.extend(items)
+        return list(range(start, self._size))
+
+    def _full_vectors(self):
+        if self._full is not None:
+            return self._full[:self._size]
+        if self._full_mapped is None or len(self._full_mapped) != self._size:
+            self._full_mapped = np.memmap(self.full_precision_path, dtype=np.float32,
+                                          mode='r', shape=(self._size, self.dim))
+        return self._full_mapped
+
+    def search_batch(self, query_embeddings, k=5):
+        """Return (ids, scores) arrays of shape (num_queries, k)."""
+        queries = normalize_rows(query_embeddings)
+        shortlist = max(k, self.rerank)
+        candidate_ids, candidate_scores = None, None
+
+        for start in range(0, self._size, ENCODE_BLOCK_ROWS):
+            codes = self._codes[start:min(start + ENCODE_BLOCK_ROWS, self._size)]
+            rows, scores = top_k(self.quantizer.scores(queries, codes), shortlist)
+            rows = rows + start
+            if candidate_ids is None:
+                candidate_ids, candidate_scores = rows, scores
+            else:
+                merged_ids = np.concatenate([candidate_ids, rows], axis=1)
+                keep, candidate_scores = top_k(
+                    np.concatenate([candidate_scores, scores], axis=1), shortlist)
+                candidate_ids = np.take_along_axis(merged_ids, keep, axis=1)
+
+        if candidate_ids is None:
+            empty = np.empty((len(queries), 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+        if not self.rerank:
+            return candidate_ids[:, :k], candidate_scores[:, :k]
+
+        full = self._full_vectors()
+        exact = np.stack([full[np.sort(ids)] @ query for ids, query in zip(candidate_ids, queries)])
+        sorted_ids = np.sort(candidate_ids, axis=1)
+        keep, scores = top_k(exact, k)
+        return np.take_along_axis(sorted_ids, keep, axis=1), scores
+
+    def similarity_search(self, query_embedding, k=5):
+        """Return the k most similar stored items as (item, score) pairs, best first."""
+        ids, scores = self.search_batch(query_embedding, k)
+        return [(self._items[i], float(s)) for i, s in zip(ids[0], scores[0])]
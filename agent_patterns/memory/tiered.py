@@ -0,0 +1,402 @@
+"""
+Hierarchical multi-tier memory for the Memory Systems Hierarchy (Chapter 4).
+
+Items live in exactly one of three tiers:
+
+- hot: live Python objects in a bounded in-process map; which item leaves when
+  it is full is decided by a pluggable ``LRUPolicy``, ``LFUPolicy`` or ``ARCPolicy``
+- warm: zlib-compressed pickles in memory, bounded by total compressed bytes,
+  evicted least-recently-used first
+- cold: compressed pickles in an on-disk SQLite table, unbounded
+
+A hit in a lower tier promotes the item back to hot; pressure on a tier
+demotes its victims one level down. Because the hot tier is bounded by item
+count and the warm tier by bytes, resident memory stays flat however long a
+session runs; only the cold tier grows, on disk. Each tier records hits,
+misses, promotions, demotions and lookup latency.
+"""
+
+import time
+import zlib
+import pickle
+import sqlite3
+from collections import OrderedDict, defaultdict
+
+#########################
+# HOT-TIER EVICTION POLICIES
+#########################
+
+
+class LRUPolicy:
+    """Evict the least recently used key."""
+
+    def __init__(self, capacity=None):
+        self._order = OrderedDict()
+
+    def admit(self, key):
+        self._order[key] = None
+
+    def touch(self, key):
+        self._order.move_to_end(key)
+
+    def discard(self, key):
+        self._order.pop(key, None)
+
+    def evict(self):
+        key, _ = self._order.popitem(last=False)
+        return key
+
+
+class LFUPolicy:
+    """Evict the least frequently used key (LRU among ties), in amortized O(1).
+
+    Plain LFU never forgets: items popular long ago keep their counts, and a
+    new item, admitted with a count of one, is evicted before it can build
+    one up. Two changes keep the counts useful. Counts of evicted keys are
+    remembered in a bounded history, so an item that comes back resumes its
+    count. Every ``window`` accesses (the capacity by default) all counts are
+    halved, so frequency reflects recent use.
+    """
+
+    def __init__(self, capacity=None, window=None, history=None):
+        capacity = capacity or 1024
+        self.window = window or capacity
+        self.history_size = history if history is not None else capacity
+        self._freq = {}
+        self._buckets = defaultdict(OrderedDict)
+        self._min_freq = 0
+        self._history = OrderedDict()
+        self._accesses = 0
+
+    def admit(self, key):
+        freq = self._history.pop(key, 0) + 1
+        self._freq[key] = freq
+        self._buckets[freq][key] = None
+        self._min_freq = min(self._min_freq, freq) if self._min_freq else freq
+        self._tick()
+
+    def touch(self, key):
+        freq = self._freq[key]
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets[freq + 1][key] = None
+        self._tick()
+
+    def discard(self, key):
+        freq = self._freq.pop(key, None)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = min(self._buckets, default=0)
+
+    def evict(self):
+        bucket = self._buckets[self._min_freq]
+        key, _ = bucket.popitem(last=False)
+        self._remember(key, self._freq.pop(key))
+        if not bucket:
+            del self._buckets[self._min_freq]
+            self._min_freq = min(self._buckets, default=0)
+        return key
+
+    def _remember(self, key, freq):
+        if self.history_size <= 0:
+            return
+        self._history[key] = freq
+        if len(self._history) > self.history_size:
+            self._history.popitem(last=False)
+
+    def _tick(self):
+        self._accesses += 1
+        if self._accesses < self.window:
+            return
+        self._accesses = 0
+        # Halve every count, keeping LRU order within each new bucket
+        buckets = defaultdict(OrderedDict)
+        for freq in sorted(self._buckets):
+            for key in self._buckets[freq]:
+                aged = max(1, freq // 2)
+                self._freq[key] = aged
+                buckets[aged][key] = None
+        self._buckets = buckets
+        self._min_freq = min(buckets, default=0)
+        self._history = OrderedDict((key, freq // 2) for key, freq in self._history.items() if freq > 1)
+
+
+class ARCPolicy:
+    """Adaptive Replacement Cache: balances recency (T1) and frequency (T2) using ghost lists."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.p = 0.0
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+
+    def admit(self, key):
+        if key in self._b1:
+            # Recently evicted from T1 and wanted again: favour recency
+            self.p = min(self.capacity, self.p + max(len(self._b2) / len(self._b1), 1))
+            del self._b1[key]
+            self._t2[key] = None
+        elif key in self._b2:
+            self.p = max(0.0, self.p - max(len(self._b1) / len(self._b2), 1))
+            del self._b2[key]
+            self._t2[key] = None
+        else:
+            self._t1[key] = None
+        self._trim_ghosts()
+
+    def touch(self, key):
+        if key in self._t1:
+            del self._t1[key]
+            self._t2[key] = None
+        else:
+            self._t2.move_to_end(key)
+
+    def discard(self, key):
+        self._t1.pop(key, None)
+        self._t2.pop(key, None)
+
+    def evict(self):
+        if self._t1 and (len(self._t1) > self.p or not self._t2):
+            key, _ = self._t1.popitem(last=False)
+            self._b1[key] = None
+        else:
+            key, _ = self._t2.popitem(last=False)
+            self._b2[key] = None
+        self._trim_ghosts()
+        return key
+
+    def _trim_ghosts(self):
+        while self._b1 and len(self._t1) + len(self._b1) > self.capacity:
+            self._b1.popitem(last=False)
+        while self._b2 and len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) > 2 * self.capacity:
+            self._b2.popitem(last=False)
+
+
+POLICIES = {'lru': LRUPolicy, 'lfu': LFUPolicy, 'arc': ARCPolicy}
+
+#########################
+# TIERED MEMORY
+#########################
+
+
+class _ColdStore:
+    """Minimal bytes -> bytes mapping over a SQLite table."""
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS cold (key BLOB PRIMARY KEY, value BLOB NOT NULL)')
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM cold').fetchone()[0]
+
+    def __contains__(self, key):
+        return self._db.execute('SELECT 1 FROM cold WHERE key = ?', (key,)).fetchone() is not None
+
+    def __setitem__(self, key, value):
+        self._db.execute('INSERT OR REPLACE INTO cold (key, value) VALUES (?, ?)', (key, value))
+
+    def __delitem__(self, key):
+        self._db.execute('DELETE FROM cold WHERE key = ?', (key,))
+
+    def get(self, key):
+        row = self._db.execute('SELECT value FROM cold WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        self._db.close()
+
+
+class TierStats:
+    """Counters and cumulative lookup latency for one tier."""
+
+    __slots__ = ('hits', 'misses', 'promotions', 'demotions', 'lookup_seconds')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.promotions = 0
+        self.demotions = 0
+        self.lookup_seconds = 0.0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'promotions': self.promotions,
+            'demotions': self.demotions,
+            'mean_lookup_us': self.lookup_seconds / lookups * 1e6 if lookups else 0.0,
+        }
+
+
+class TieredMemory:
+    """Hot / warm / cold memory with promotion on access and demotion under pressure.
+
+    ``policy`` is 'lru', 'lfu', 'arc' or a policy instance for the hot tier.
+    Values must be picklable. ``cold_path`` is the SQLite database file for
+    the cold tier; it is indexed on disk, so a large cold tier costs no RAM.
+    """
+
+    def __init__(self, cold_path, hot_capacity=1024, warm_capacity_bytes=16 * 2**20,
+                 policy='lru', compression_level=6):
+        self.hot_capacity = hot_capacity
+        self.warm_capacity_bytes = warm_capacity_bytes
+        self.compression_level = compression_level
+        self.policy = POLICIES[policy](hot_capacity) if isinstance(policy, str) else policy
+
+        self._hot = {}
+        self._warm = OrderedDict()
+        self._warm_bytes = 0
+        self._cold = _ColdStore(cold_path)
+        self.stats = {'hot': TierStats(), 'warm': TierStats(), 'cold': TierStats()}
+
+    def __len__(self):
+        return len(self._hot) + len(self._warm) + len(self._cold)
+
+    def __contains__(self, key):
+        return key in self._hot or key in self._warm or self._cold_key(key) in self._cold
+
+    @property
+    def warm_bytes(self):
+        return self._warm_bytes
+
+    def tier_of(self, key):
+        """Name of the tier currently holding key, or None."""
+        if key in self._hot:
+            return 'hot'
+        if key in self._warm:
+            return 'warm'
+        if self._cold_key(key) in self._cold:
+            return 'cold'
+        return None
+
+    @staticmethod
+    def _cold_key(key):
+        return key.encode('utf-8') if isinstance(key, str) else pickle.dumps(key)
+
+    def _pack(self, value):
+        return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                             self.compression_level)
+
+    @staticmethod
+    def _unpack(blob):
+        return pickle.loads(zlib.decompress(blob))
+
+    def _remove_everywhere(self, key):
+        if key in self._hot:
+            del self._hot[key]
+            self.policy.discard(key)
+        blob = self._warm.pop(key, None)
+        if blob is not None:
+            self._warm_bytes -= len(blob)
+        cold_key = self._cold_key(key)
+        if cold_key in self._cold:
+            del self._cold[cold_key]
+
+    def _insert_hot(self, key, value):
+        self._hot[key] = value
+        self.policy.admit(key)
+        while len(self._hot) > self.hot_capacity:
+            victim = self.policy.evict()
+            self._demote_to_warm(victim, self._hot.pop(victim))
+
+    def _demote_to_warm(self, key, value):
+        blob = self._pack(value)
+        self._warm[key] = blob
+        self._warm_bytes += len(blob)
+        self.stats['hot'].demotions += 1
+        while self._warm_bytes > self.warm_capacity_bytes and self._warm:
+            victim, victim_blob = self._warm.popitem(last=False)
+            self._warm_bytes -= len(victim_blob)
+            self._cold[self._cold_key(victim)] = victim_blob
+            self.stats['warm'].demotions += 1
+
+    def put(self, key, value):
+        """Store value under key in the hot tier, demoting others if needed."""
+        self._remove_everywhere(key)
+        self._insert_hot(key, value)
+
+    def get(self, key, default=None):
+        """Look key up tier by tier, promoting a warm or cold hit to hot."""
+        start = time.perf_counter()
+        if key in self._hot:
+            self.policy.touch(key)
+            value = self._hot[key]
+            self._record('hot', start, hit=True)
+            return value
+        self._record('hot', start, hit=False)
+
+        start = time.perf_counter()
+        blob = self._warm.pop(key, None)
+        if blob is not None:
+            self._warm_bytes -= len(blob)
+            value = self._unpack(blob)
+            self._record('warm', start, hit=True)
+            self.stats['warm'].promotions += 1
+            self._insert_hot(key, value)
+            return value
+        self._record('warm', start, hit=False)
+
+        start = time.perf_counter()
+        cold_key = self._cold_key(key)
+        blob = self._cold.get(cold_key)
+        if blob is not None:
+            del self._cold[cold_key]
+            value = self._unpack(blob)
+            self._record('cold', start, hit=True)
+            self.stats['cold'].promotions += 1
+            self._insert_hot(key, value)
+            return value
+        self._record('cold', start, hit=False)
+        return default
+
+    def _record(self, tier, start, hit):
+        stats = self.stats[tier]
+        stats.lookup_seconds += time.perf_counter() - start
+        if hit:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+
+    def delete(self, key):
+        self._remove_everywhere(key)
+
+    def metrics(self):
+        """Per-tier hit rate, latency and movement counters, plus tier sizes."""
+        report = {tier: stats.as_dict() for tier, stats in self.stats.items()}
+        report['hot']['items'] = len(self._hot)
+        report['warm']['items'] = len(self._warm)
+        report['warm']['bytes'] = self._warm_bytes
+        report['cold']['items'] = len(self._cold)
+        return report
+
+    def close(self):
+        """Flush hot and warm items to the cold tier and close the database."""
+        for key in list(self._hot):
+            self._cold[self._cold_key(key)] = self._pack(self._hot.pop(key))
+            self.policy.discard(key)
+        while self._warm:
+            key, blob = self._warm.popitem(last=False)
+            self._cold[self._cold_key(key)] = blob
+        self._warm_bytes = 0
+        self._cold.close()
@@ -0,0 +1,130 @@
+"""
+In-memory vector store behind the VectorContextManager from Chapter 4.
+
+Embeddings live in one contiguous float32 matrix whose rows are normalized on
+insert, so cosine similarity is a plain dot product. A batch of queries is
+answered with a single matrix multiply followed by ``argpartition`` top-k.
+Appends write into spare capacity that doubles when exhausted, so growing the
+store costs amortized O(1) copies per vector instead of a reallocation per add.
+"""
+
+import numpy as np
+
+
+def normalize_rows(vectors):
+    """Return float32 row-normalized copies of vectors (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[np.newaxis, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k(scores, k):
+    """Return (indices, scores) of the k highest scores per row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(scores.dtype)
+
+    if k < scores.shape[1]:
+        candidates = np.argpartition(scores, -k, axis=1)[:, -k:]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1)
+    return (np.take_along_axis(candidates, order, axis=1),
+            np.take_along_axis(candidate_scores, order, axis=1))
+
+
+class VectorStore:
+    """Brute-force cosine similarity store over a contiguous float32 matrix."""
+
+    def __init__(self, dim, capacity=1024):
+        self.dim = dim
+        self._matrix = np.empty((max(capacity, 1), dim), dtype=np.float32)
+        self._size = 0
+        self._items = []
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return self._matrix.shape[0]
+
+    @property
+    def vectors(self):
+        """Read-only view of the normalized embeddings currently stored."""
+        view = self._matrix[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def item(self, index):
+        return self._items[index]
+
+    def _reserve(self, needed):
+        """Grow capacity by doubling until it can hold `needed` rows."""
+        if needed <= self.capacity:
+            return
+        new_capacity = self.capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        grown = np.empty((new_capacity, self.dim), dtype=np.float32)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+
+    def add(self, embeddings, items=None):
+        """Append embeddings (one per row) with optional payloads; return their ids."""
+        rows = normalize_rows(embeddings)
+        if rows.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional embeddings, got {rows.shape[1]}")
+        if items is None:
+            items = [None] * len(rows)
+        elif len(items) != len(rows):
+            raise ValueError("Number of items must match number of embeddings")
+
+        start = self._size
+        self._reserve(start + len(rows))
+        self._matrix[start:start + len(rows)] = rows
+        self._size += len(rows)
+        self._items.extend(items)
+        return list(range(start, self._size))
+
+    def search_batch(self, query_embeddings, k=5):
+        """Return (ids, scores) arrays of shape (num_queries, k) for a batch of queries."""
+        queries = normalize_rows(query_embeddings)
+        scores = queries @ self._matrix[:self._size].T
+        return top_k(scores, k)
+
+    def similarity_search(self, query_embedding, k=5):
+        """Return the k most similar stored items as (item, score) pairs, best first."""
+        ids, scores = self.search_batch(query_embedding, k)
+        return [(self._items[i], float(s)) for i, s in zip(ids[0], scores[0])]
+
+
+class VectorContextManager:
+    """Retrieves context relevant to the current query from a vector store."""
+
+    def __init__(self, vector_db, embedding_model):
+        self.vector_db = vector_db
+        self.embedding_model = embedding_model
+
+    def embed_text(self, text):
+        return self.embedding_model.embed(text)
+
+    def store(self, text, metadata=None):
+        """Embed text and add it to the vector store."""
+        item = {'text': text, 'metadata': metadata or {}}
+        return self.vector_db.add(self.embed_text(text), [item])[0]
+
+    def retrieve_relevant_context(self, current_query, k=5):
+        """Retrieve context relevant to the current query."""
+        query_embedding = self.embed_text(current_query)
+        context_items = self.vector_db.similarity_search(query_embedding, k=k)
+        return self.format_context(context_items)
+
+    def format_context(self, context_items):
+        """Render retrieved items as a bullet list for inclusion in a prompt."""
+        return '\n'.join(f"- {item['text']}" for item, _ in context_items)
@@ -0,0 +1,188 @@
+"""
+Working Memory Pattern with vectorized attention (Chapter 4).
+
+Goal and subgoal tracking follows the WorkingMemory class diagram. Intermediate
+results are held column-wise (structure of arrays) rather than as one dict
+per item: creation time, last access time, access count, relevance score and
+an optional embedding are each a NumPy column indexed by row, and only the
+key -> row mapping and the values themselves are Python objects. Attention
+scoring, focused-context selection and eviction therefore run as a handful of
+array operations over all items at once instead of a Python loop.
+
+Attention combines the three mechanisms the chapter lists:
+
+- recency: exponential decay since last access, with half-life ``half_life`` seconds
+- relevance: cosine similarity to the current query (``update_relevance``)
+- explicit focus: a fixed boost for the key set by ``set_attention``
+
+plus a small frequency term, weighted by ``weights``.
+"""
+
+import time
+
+import numpy as np
+
+DEFAULT_WEIGHTS = {'relevance': 1.0, 'recency': 0.5, 'frequency': 0.1, 'focus': 2.0}
+
+
+class WorkingMemory:
+    """Task-focused state with structure-of-arrays storage for intermediate results."""
+
+    def __init__(self, max_items=10000, dim=None, half_life=300.0, weights=None,
+                 evict_fraction=0.1, capacity=256, clock=time.monotonic):
+        self.max_items = max_items
+        self.dim = dim
+        self.half_life = half_life
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.evict_fraction = evict_fraction
+        self.clock = clock
+
+        self.current_goal = None
+        self.subgoals = []
+        self.completion_status = {}
+        self.attention_focus = None
+
+        self._rows = {}
+        self._keys = []
+        self._values = []
+        self._size = 0
+        self._created = np.empty(capacity, dtype=np.float64)
+        self._last_access = np.empty(capacity, dtype=np.float64)
+        self._access_count = np.empty(capacity, dtype=np.int32)
+        self._relevance = np.empty(capacity, dtype=np.float32)
+        self._embeddings = np.empty((capacity, dim), dtype=np.float32) if dim else None
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    # Goal tracking
+
+    def set_goal(self, goal):
+        self.current_goal = goal
+
+    def add_subgoal(self, subgoal):
+        self.subgoals.append(subgoal)
+        self.completion_status[subgoal] = False
+
+    def complete_subgoal(self, subgoal):
+        self.completion_status[subgoal] = True
+
+    def set_attention(self, focus):
+        """Explicitly focus attention on the result stored under key `focus`."""
+        self.attention_focus = focus
+
+    # Intermediate results
+
+    def _columns(self):
+        columns = ['_created', '_last_access', '_access_count', '_relevance']
+        return columns + (['_embeddings'] if self._embeddings is not None else [])
+
+    def _grow(self):
+        capacity = len(self._created) * 2
+        for name in self._columns():
+            old = getattr(self, name)
+            grown = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def store_result(self, key, value, embedding=None, relevance=0.0):
+        """Store or overwrite an intermediate result, evicting low-attention items if full."""
+        now = self.clock()
+        row = self._rows.get(key)
+        if row is None:
+            if self._size >= self.max_items:
+                self.evict(max(1, int(self.max_items * self.evict_fraction)))
+            if self._size == len(self._created):
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[key] = row
+            self._keys.append(key)
+            self._values.append(value)
+            self._created[row] = now
+            self._access_count[row] = 0
+        else:
+            self._values[row] = value
+
+        self._last_access[row] = now
+        self._relevance[row] = relevance
+        if self._embeddings is not None:
+            if embedding is None:
+                self._embeddings[row] = 0.0
+            else:
+                vector = np.asarray(embedding, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                self._embeddings[row] = vector / norm if norm else vector
+
+    def get_result(self, key):
+        """Return a stored value, recording the access for recency and frequency."""
+        row = self._rows[key]
+        self._last_access[row] = self.clock()
+        self._access_count[row] += 1
+        return self._values[row]
+
+    @property
+    def intermediate_results(self):
+        return dict(zip(self._keys, self._values))
+
+    # Attention
+
+    def update_relevance(self, query_embedding):
+        """Score every item's relevance to the query in one matrix-vector product."""
+        if self._embeddings is None:
+            raise ValueError("WorkingMemory was created without dim; relevance needs embeddings")
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        self._relevance[:self._size] = self._embeddings[:self._size] @ query
+
+    def attention_scores(self):
+        """Combined attention score for every item, as one array."""
+        n = self._size
+        now = self.clock()
+        w = self.weights
+        recency = np.exp2(-(now - self._last_access[:n]) / self.half_life)
+        scores = (w['relevance'] * self._relevance[:n]
+                  + w['recency'] * recency
+                  + w['frequency'] * np.log1p(self._access_count[:n]))
+        focus_row = self._rows.get(self.attention_focus)
+        if focus_row is not None:
+            scores[focus_row] += w['focus']
+        return scores
+
+    def get_focused_context(self, max_items=10):
+        """Return the (key, value) pairs with the highest attention scores, best first."""
+        if not self._size:
+            return []
+        scores = self.attention_scores()
+        k = min(max_items, self._size)
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(-scores[top])]
+        return [(self._keys[row], self._values[row]) for row in top]
+
+    def evict(self, count):
+        """Remove the `count` lowest-attention items, compacting the columns in one pass."""
+        count = min(count, self._size)
+        if not count:
+            return []
+        scores = self.attention_scores()
+        victims = np.argpartition(scores, count - 1)[:count]
+        keep = np.ones(self._size, dtype=bool)
+        keep[victims] = False
+        if self.attention_focus in self._rows:
+            keep[self._rows[self.attention_focus]] = True
+        survivors = np.flatnonzero(keep)
+
+        for name in self._columns():
+            column = getattr(self, name)
+            column[:len(survivors)] = column[survivors]
+        evicted = [self._keys[row] for row in np.flatnonzero(~keep)]
+        self._keys = [self._keys[row] for row in survivors]
+        self._values = [self._values[row] for row in survivors]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._size = len(survivors)
+        return evicted
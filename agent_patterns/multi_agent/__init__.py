@@ -0,0 +1,51 @@
+"""Multi-Agent Patterns (Chapter 5)."""
+
+from agent_patterns.multi_agent.orchestrator import Orchestrator, Subtask, SubtaskFailed
+from agent_patterns.multi_agent.aggregation import (
+    aggregate,
+    PartialResult,
+    ConcatStrategy,
+    VoteStrategy,
+    RankFusionStrategy,
+)
+from agent_patterns.multi_agent.peer_network import (
+    MessagingSystem,
+    PeerAgent,
+    PeerNetwork,
+    MajorityVote,
+    WeightedVote,
+    Debate,
+)
+from agent_patterns.multi_agent.protocol import (
+    Frame,
+    MessageType,
+    ProtocolError,
+    InProcessTransport,
+    UnixSocketTransport,
+)
+from agent_patterns.multi_agent.process_pool import AgentProcessPool, SharedArray, WorkerError
+
+__all__ = [
+    'Orchestrator',
+    'Subtask',
+    'SubtaskFailed',
+    'aggregate',
+    'PartialResult',
+    'ConcatStrategy',
+    'VoteStrategy',
+    'RankFusionStrategy',
+    'MessagingSystem',
+    'PeerAgent',
+    'PeerNetwork',
+    'MajorityVote',
+    'WeightedVote',
+    'Debate',
+    'Frame',
+    'MessageType',
+    'ProtocolError',
+    'InProcessTransport',
+    'UnixSocketTransport',
+    'AgentProcessPool',
+    'SharedArray',
+    'WorkerError',
+]
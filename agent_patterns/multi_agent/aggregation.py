@@ -0,0 +1,170 @@
+"""
+Streaming result aggregation for the Orchestrator Pattern (Chapter 5).
+
+The chapter's "Result Aggregation Approaches" merge worker outputs once every
+worker has finished, which makes time-to-first-output equal to the slowest
+worker. ``aggregate`` instead consumes an async iterator of ``(source,
+result)`` pairs, such as ``Orchestrator.stream``, and folds each result
+into a merge strategy as soon as it arrives. After every merge it yields a
+``PartialResult``, so callers can render or act on a progressively refined
+answer (Chapter 6, "Progressive Response Generation") before all workers
+are done.
+
+Merge strategies are small stateful objects with ``add(source, result)`` and
+``value()``:
+
+- ``ConcatStrategy``: joins outputs with a separator
+- ``VoteStrategy``: majority vote over (optionally weighted) answers
+- ``RankFusionStrategy``: reciprocal rank fusion over ranked lists
+
+An optional ``order`` makes the merge follow a fixed source order regardless
+of completion order; early results are held back until the ones before them
+arrive.
+"""
+
+from collections import Counter
+
+
+class PartialResult:
+    """One snapshot of an aggregation in progress."""
+
+    __slots__ = ('value', 'sources', 'pending', 'complete')
+
+    def __init__(self, value, sources, pending, complete):
+        self.value = value
+        self.sources = sources
+        self.pending = pending
+        self.complete = complete
+
+    def __repr__(self):
+        return (f"PartialResult(value={self.value!r}, sources={len(self.sources)}, "
+                f"pending={self.pending}, complete={self.complete})")
+
+
+#########################
+# MERGE STRATEGIES
+#########################
+
+
+class ConcatStrategy:
+    """Join outputs in the order they are merged."""
+
+    def __init__(self, separator='\n\n'):
+        self.separator = separator
+        self._parts = []
+
+    def add(self, source, result):
+        self._parts.append(str(result))
+
+    def value(self):
+        return self.separator.join(self._parts)
+
+
+class VoteStrategy:
+    """Majority vote; ``weights`` maps sources to vote weights (default 1)."""
+
+    def __init__(self, weights=None, key=None):
+        self.weights = weights or {}
+        self.key = key
+        self._tally = Counter()
+        self._first = {}
+
+    def add(self, source, result):
+        answer = self.key(result) if self.key else result
+        self._tally[answer] += self.weights.get(source, 1.0)
+        self._first.setdefault(answer, result)
+
+    def value(self):
+        if not self._tally:
+            return None
+        # Counter.most_common is stable, so ties go to the answer seen first
+        answer, _ = self._tally.most_common(1)[0]
+        return self._first[answer]
+
+    def margin(self):
+        """Lead of the current winner over the runner-up, in vote weight."""
+        top = self._tally.most_common(2)
+        if not top:
+            return 0.0
+        return top[0][1] - (top[1][1] if len(top) > 1 else 0.0)
+
+
+class RankFusionStrategy:
+    """Reciprocal rank fusion: each result is a ranked list of items."""
+
+    def __init__(self, k=60, limit=None):
+        self.k = k
+        self.limit = limit
+        self._scores = Counter()
+
+    def add(self, source, result):
+        for rank, item in enumerate(result):
+            self._scores[item] += 1.0 / (self.k + rank + 1)
+
+    def value(self):
+        return [item for item, _ in self._scores.most_common(self.limit)]
+
+
+STRATEGIES = {'concat': ConcatStrategy, 'vote': VoteStrategy, 'rank-fuse': RankFusionStrategy}
+
+#########################
+# STREAMING AGGREGATION
+#########################
+
+
+async def aggregate(results, strategy='concat', order=None, expected=None):
+    """Merge (source, result) pairs from an async iterator, yielding a PartialResult after each merge.
+
+    ``strategy`` is a name from STRATEGIES or a strategy instance. With
+    ``order``, sources are merged in that order and results arriving early are
+    buffered; sources not listed are merged as they arrive. ``expected`` is the
+    total number of sources, used to report ``pending`` (defaults to len(order)).
+    """
+    if isinstance(strategy, str):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown merge strategy {strategy!r}; expected one of {sorted(STRATEGIES)}")
+        strategy = STRATEGIES[strategy]()
+    if expected is None and order is not None:
+        expected = len(order)
+
+    position = {source: i for i, source in enumerate(order or ())}
+    held = {}
+    next_index = 0
+    merged = []
+
+    def snapshot(complete=False):
+        pending = None if expected is None else max(0, expected - len(merged))
+        return PartialResult(strategy.value(), tuple(merged), pending, complete)
+
+    async for source, result in results:
+        if source not in position:
+            strategy.add(source, result)
+            merged.append(source)
+            yield snapshot()
+            continue
+        held[position[source]] = (source, result)
+        # Release the contiguous run of ordered results that is now unblocked
+        released = False
+        while next_index in held:
+            ready_source, ready_result = held.pop(next_index)
+            strategy.add(ready_source, ready_result)
+            merged.append(ready_source)
+            next_index += 1
+            released = True
+        if released:
+            yield snapshot()
+
+    # Sources named in order that never arrived leave a gap; merge what is held anyway
+    for index in sorted(held):
+        source, result = held[index]
+        strategy.add(source, result)
+        merged.append(source)
+    yield snapshot(complete=True)
+
+
+async def aggregate_all(results, strategy='concat', order=None):
+    """Wait-for-all convenience wrapper: return only the final merged value."""
+    final = None
+    async for partial in aggregate(results, strategy, order=order):
+        final = partial
+    return final.value
@@ -0,0 +1,170 @@
+"""
+Asyncio Orchestrator Pattern with DAG task decomposition (Chapter 5).
+
+The orchestrator receives a request already decomposed into ``Subtask``
+objects whose ``depends_on`` edges form a directed acyclic graph. Every
+subtask whose dependencies have finished is launched immediately, so
+independent branches run concurrently and total wall time is bounded by the
+DAG's critical path rather than the sum of all subtasks. Concurrency is capped
+by a global semaphore and, optionally, by one semaphore per worker type
+(e.g. at most two calls to a rate-limited research agent).
+
+Results are streamed in completion order through ``Orchestrator.stream`` so
+that aggregation can begin before the slowest worker finishes. If any subtask
+fails, every running subtask is cancelled and ``SubtaskFailed`` is raised.
+"""
+
+import asyncio
+from collections import deque
+
+
+class SubtaskFailed(Exception):
+    """A subtask raised; the remaining subtasks were cancelled."""
+
+    def __init__(self, name, error):
+        super().__init__(f"Subtask {name!r} failed: {error!r}")
+        self.name = name
+        self.error = error
+
+
+class Subtask:
+    """One node of the task DAG, handled by the worker registered for worker_type."""
+
+    __slots__ = ('name', 'worker_type', 'payload', 'depends_on')
+
+    def __init__(self, name, worker_type, payload=None, depends_on=()):
+        self.name = name
+        self.worker_type = worker_type
+        self.payload = payload
+        self.depends_on = tuple(depends_on)
+
+    def __repr__(self):
+        return f"Subtask({self.name!r}, {self.worker_type!r}, depends_on={self.depends_on!r})"
+
+
+def validate_dag(subtasks):
+    """Check names are unique, dependencies exist and there are no cycles; return a topological order."""
+    by_name = {}
+    for subtask in subtasks:
+        if subtask.name in by_name:
+            raise ValueError(f"Duplicate subtask name {subtask.name!r}")
+        by_name[subtask.name] = subtask
+
+    indegree = {name: 0 for name in by_name}
+    dependents = {name: [] for name in by_name}
+    for subtask in subtasks:
+        for dependency in subtask.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"Subtask {subtask.name!r} depends on unknown subtask {dependency!r}")
+            indegree[subtask.name] += 1
+            dependents[dependency].append(subtask.name)
+
+    queue = deque(name for name, degree in indegree.items() if degree == 0)
+    order = []
+    while queue:
+        name = queue.popleft()
+        order.append(name)
+        for dependent in dependents[name]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                queue.append(dependent)
+    if len(order) != len(by_name):
+        cyclic = sorted(set(by_name) - set(order))
+        raise ValueError(f"Task graph has a cycle involving {cyclic}")
+    return order
+
+
+class Orchestrator:
+    """Runs a DAG of subtasks on registered async workers with bounded concurrency.
+
+    ``workers`` maps a worker type to ``async def worker(subtask, inputs)``, where
+    ``inputs`` maps each dependency's name to its result. ``per_worker_limits``
+    maps worker types to their own concurrency caps.
+    """
+
+    def __init__(self, workers, max_concurrency=16, per_worker_limits=None):
+        self.workers = dict(workers)
+        self.max_concurrency = max_concurrency
+        self.per_worker_limits = dict(per_worker_limits or {})
+
+    async def _execute(self, subtask, inputs, global_slots, type_slots):
+        worker = self.workers[subtask.worker_type]
+        limit = type_slots.get(subtask.worker_type)
+        if limit is None:
+            async with global_slots:
+                return await worker(subtask, inputs)
+        # Per-type slot first: a subtask waiting on its type's cap must not hold
+        # a global slot that a subtask of another type could be using
+        async with limit:
+            async with global_slots:
+                return await worker(subtask, inputs)
+
+    async def stream(self, subtasks):
+        """Yield (name, result) pairs in completion order as subtasks finish."""
+        subtasks = list(subtasks)
+        validate_dag(subtasks)
+        missing = {s.worker_type for s in subtasks} - set(self.workers)
+        if missing:
+            raise ValueError(f"No worker registered for {sorted(missing)}")
+
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        type_slots = {t: asyncio.Semaphore(n) for t, n in self.per_worker_limits.items()}
+        remaining = {s.name: len(set(s.depends_on)) for s in subtasks}
+        dependents = {s.name: [] for s in subtasks}
+        for s in subtasks:
+            for dependency in set(s.depends_on):
+                dependents[dependency].append(s)
+
+        results = {}
+        running = {}
+
+        def launch(subtask):
+            inputs = {d: results[d] for d in subtask.depends_on}
+            task = asyncio.ensure_future(self._execute(subtask, inputs, global_slots, type_slots))
+            running[task] = subtask
+
+        try:
+            for subtask in subtasks:
+                if remaining[subtask.name] == 0:
+                    launch(subtask)
+
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    subtask = running.pop(task)
+                    if task.exception() is not None:
+                        raise SubtaskFailed(subtask.name, task.exception()) from task.exception()
+                    results[subtask.name] = task.result()
+                    for dependent in dependents[subtask.name]:
+                        remaining[dependent.name] -= 1
+                        if remaining[dependent.name] == 0:
+                            launch(dependent)
+                    yield subtask.name, results[subtask.name]
+        finally:
+            # Propagate failure or an abandoned stream to everything still in flight
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def run(self, subtasks, aggregator=None):
+        """Run all subtasks and return {name: result}.
+
+        If given, ``aggregator(name, result)`` is called as each result arrives.
+        """
+        results = {}
+        async for name, result in self.stream(subtasks):
+            results[name] = result
+            if aggregator is not None:
+                aggregator(name, result)
+        return results
+
+
+def critical_path(subtasks, durations):
+    """Length of the longest dependency chain, given each subtask's duration."""
+    by_name = {s.name: s for s in subtasks}
+    finish = {}
+    for name in validate_dag(subtasks):
+        start = max((finish[d] for d in by_name[name].depends_on), default=0.0)
+        finish[name] = start + durations[name]
+    return max(finish.values(), default=0.0)
@@ -0,0 +1,261 @@
+"""
+Peer Network Pattern with consensus protocols (Chapter 5).
+
+Peers communicate through a shared in-process ``MessagingSystem``: each peer
+owns a bounded ``asyncio.Queue`` as its inbox, so a fast sender blocks
+instead of growing memory without limit when a recipient falls behind. In
+every round a peer sends and drains its inbox concurrently. Because of that,
+queues smaller than the number of peers cannot deadlock.
+
+Consensus protocols follow "Consensus Building Mechanisms":
+
+- ``MajorityVote``: one broadcast round of sharing answers, then a plurality
+  count over the ballots received
+- ``WeightedVote``: the same, with each vote scaled by peer weight and confidence
+- ``Debate``: iterated rounds of belief revision from the Debate System
+  example, stopping early once agreement reaches a threshold or beliefs stop
+  changing
+
+With ``fanout`` set, each peer sends to that many random peers per round
+instead of all of them (gossip), so a round costs O(n * fanout) messages
+rather than O(n^2) and hundreds of peers fit in one process. The bus records
+messages per second and per-message delivery latency, including time spent
+blocked on a full inbox.
+"""
+
+import time
+import random
+import asyncio
+from collections import Counter
+
+import numpy as np
+
+
+class Message:
+    """An envelope on the bus; broadcasts share one instance across recipients."""
+
+    __slots__ = ('sender', 'kind', 'round', 'content', 'sent_at')
+
+    def __init__(self, sender, kind, round_number, content):
+        self.sender = sender
+        self.kind = kind
+        self.round = round_number
+        self.content = content
+        self.sent_at = time.perf_counter()
+
+
+class MessagingSystem:
+    """In-process message bus with one bounded inbox per peer."""
+
+    def __init__(self, queue_size=64):
+        self.queue_size = queue_size
+        self.inboxes = {}
+        self.delivered = 0
+        self.latencies = []
+        self._started = None
+
+    def register(self, peer_id):
+        if peer_id in self.inboxes:
+            raise ValueError(f"Peer {peer_id!r} is already registered")
+        self.inboxes[peer_id] = asyncio.Queue(maxsize=self.queue_size)
+
+    async def deliver_message(self, recipient, message):
+        """Put message in recipient's inbox, waiting while it is full."""
+        if self._started is None:
+            self._started = time.perf_counter()
+        await self.inboxes[recipient].put(message)
+
+    async def broadcast(self, sender, message, recipients=None):
+        """Deliver message to every peer in recipients (default: all except sender)."""
+        if recipients is None:
+            recipients = [peer for peer in self.inboxes if peer != sender]
+        for recipient in recipients:
+            await self.deliver_message(recipient, message)
+
+    async def receive(self, peer_id):
+        message = await self.inboxes[peer_id].get()
+        self.delivered += 1
+        self.latencies.append(time.perf_counter() - message.sent_at)
+        return message
+
+    def metrics(self):
+        """Delivered message count, messages/sec and delivery latency percentiles."""
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        latencies = np.asarray(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            'messages': self.delivered,
+            'messages_per_second': self.delivered / elapsed if elapsed else 0.0,
+            'latency_p50_ms': float(np.percentile(latencies, 50)),
+            'latency_p99_ms': float(np.percentile(latencies, 99)),
+            'latency_max_ms': float(latencies.max()),
+        }
+
+
+class PeerAgent:
+    """A peer holding a belief (answer, confidence) that it shares and revises.
+
+    ``stubbornness`` scales how much a peer's own belief counts against what it
+    hears. ``llm``, if given, is awaited once per round before sharing, to stand
+    in for the model call that produces a real agent's argument.
+    """
+
+    def __init__(self, peer_id, messaging_system, answer, confidence=1.0, weight=1.0,
+                 stubbornness=1.0, llm=None):
+        self.peer_id = peer_id
+        self.messaging_system = messaging_system
+        self.answer = answer
+        self.confidence = confidence
+        self.weight = weight
+        self.stubbornness = stubbornness
+        self.llm = llm
+        self.received = []
+        messaging_system.register(peer_id)
+
+    async def send_message(self, recipient, message):
+        await self.messaging_system.deliver_message(recipient, message)
+
+    async def receive_message(self):
+        message = await self.messaging_system.receive(self.peer_id)
+        self.received.append(message)
+        return message
+
+    async def share_perspective(self, round_number, recipients):
+        if self.llm is not None:
+            await self.llm.complete(f"{self.peer_id} round {round_number} argues {self.answer}")
+        message = Message(self.peer_id, 'belief', round_number, (self.answer, self.confidence, self.weight))
+        await self.messaging_system.broadcast(self.peer_id, message, recipients)
+
+    async def exchange(self, round_number, recipients, expected):
+        """Send to recipients while concurrently collecting `expected` inbound messages."""
+        self.received = []
+
+        async def collect():
+            for _ in range(expected):
+                await self.receive_message()
+
+        await asyncio.gather(self.share_perspective(round_number, recipients), collect())
+        return self.received
+
+    def tally(self, weighted=True, stubborn=True):
+        """Score each answer over own belief plus received beliefs.
+
+        With ``stubborn`` the peer's own belief is scaled by its stubbornness;
+        without it every belief, own included, counts as one plain vote.
+        """
+        scores = Counter()
+        own = self.weight * self.confidence if weighted else 1.0
+        scores[self.answer] += own * self.stubbornness if stubborn else own
+        for message in self.received:
+            answer, confidence, weight = message.content
+            scores[answer] += weight * confidence if weighted else 1.0
+        return scores
+
+    def update_beliefs(self):
+        """Adopt the best-supported answer; return True if the belief changed."""
+        scores = self.tally()
+        answer, score = max(scores.items(), key=lambda item: (item[1], item[0] == self.answer))
+        changed = answer != self.answer
+        self.answer = answer
+        self.confidence = score / sum(scores.values())
+        return changed
+
+
+class ConsensusResult:
+    """Outcome of a consensus protocol run."""
+
+    __slots__ = ('answer', 'agreement', 'rounds', 'converged', 'seconds')
+
+    def __init__(self, answer, agreement, rounds, converged, seconds):
+        self.answer = answer
+        self.agreement = agreement
+        self.rounds = rounds
+        self.converged = converged
+        self.seconds = seconds
+
+    def __repr__(self):
+        return (f"ConsensusResult(answer={self.answer!r}, agreement={self.agreement:.2f}, "
+                f"rounds={self.rounds}, converged={self.converged})")
+
+
+class PeerNetwork:
+    """A set of peers sharing one MessagingSystem, exchanging beliefs in rounds."""
+
+    def __init__(self, messaging_system, peers, fanout=None, seed=0):
+        self.messaging_system = messaging_system
+        self.peers = list(peers)
+        self.fanout = fanout
+        self._rng = random.Random(seed)
+
+    def _recipients(self, broadcast):
+        ids = [peer.peer_id for peer in self.peers]
+        if broadcast or self.fanout is None or self.fanout >= len(ids) - 1:
+            return {peer_id: [other for other in ids if other != peer_id] for peer_id in ids}
+        recipients = {}
+        for i, peer_id in enumerate(ids):
+            # Sample from the other n-1 peers by skipping over our own index
+            picks = self._rng.sample(range(len(ids) - 1), self.fanout)
+            recipients[peer_id] = [ids[j + (j >= i)] for j in picks]
+        return recipients
+
+    async def exchange_round(self, round_number, broadcast=False):
+        """Every peer sends its belief and receives everything addressed to it.
+
+        With ``broadcast`` every peer sends to all others even if ``fanout`` is set.
+        """
+        recipients = self._recipients(broadcast)
+        inbound = Counter(r for targets in recipients.values() for r in targets)
+        await asyncio.gather(*(peer.exchange(round_number, recipients[peer.peer_id], inbound[peer.peer_id])
+                               for peer in self.peers))
+
+    def agreement(self):
+        """Most common answer across peers and the fraction of peers holding it."""
+        answer, count = Counter(peer.answer for peer in self.peers).most_common(1)[0]
+        return answer, count / len(self.peers)
+
+
+#########################
+# CONSENSUS PROTOCOLS
+#########################
+
+
+class MajorityVote:
+    """One broadcast round, then a one-peer-one-vote plurality over the exchanged ballots."""
+
+    weighted = False
+
+    async def run(self, network):
+        start = time.perf_counter()
+        await network.exchange_round(0, broadcast=True)
+        # After a broadcast every peer holds all ballots, so any peer's tally is the
+        # result; its own ballot counts as a plain vote, not scaled by stubbornness
+        scores = network.peers[0].tally(self.weighted, stubborn=False)
+        answer, score = scores.most_common(1)[0]
+        return ConsensusResult(answer, score / sum(scores.values()), 1, True, time.perf_counter() - start)
+
+
+class WeightedVote(MajorityVote):
+    """One broadcast round, then a plurality weighted by peer weight and confidence."""
+
+    weighted = True
+
+
+class Debate:
+    """Iterated belief revision, stopping once `threshold` of peers agree or nothing changes."""
+
+    def __init__(self, max_rounds=10, threshold=0.9):
+        if max_rounds < 1:
+            raise ValueError(f"max_rounds must be at least 1, got {max_rounds}")
+        self.max_rounds = max_rounds
+        self.threshold = threshold
+
+    async def run(self, network):
+        start = time.perf_counter()
+        converged = False
+        for rounds in range(1, self.max_rounds + 1):
+            await network.exchange_round(rounds)
+            changed = sum(peer.update_beliefs() for peer in network.peers)
+            answer, agreement = network.agreement()
+            if agreement >= self.threshold or not changed:
+                converged = agreement >= self.threshold
+                break
+        return ConsensusResult(answer, agreement, rounds, converged, time.perf_counter() - start)
@@ -0,0 +1,222 @@
+"""
+Multi-process agent pool with shared-memory state (Chapter 5).
+
+CPU-bound agent work such as embedding, re-ranking or parsing does not speed
+up with asyncio or threads in one interpreter, because the GIL serializes
+it. ``AgentProcessPool`` runs one agent per worker process. Large read-only
+state, such as embedding matrices or index arrays, is placed once in
+``multiprocessing.shared_memory`` by ``SharedArray``. Every worker maps the
+same pages as a zero-copy NumPy view, so N workers cost one copy of the
+matrix, not N, and nothing is pickled per task.
+
+Tasks go through a ``SimpleQueue`` and results come back over a one-way
+``Pipe`` whose writes are serialized by a lock; both are lighter than
+``multiprocessing.Queue`` because they have no feeder thread. The parent
+waits on the pipe's reader together with the worker sentinels. Items are sent
+in chunks so per-message overhead is amortized over ``chunksize`` calls.
+An agent or factory exception comes back as a ``WorkerError``; a worker
+process that dies mid-map also raises ``WorkerError`` and terminates the
+pool, because the work it held is lost.
+"""
+
+import os
+import threading
+import traceback
+import multiprocessing
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+
+import numpy as np
+
+
+class WorkerError(Exception):
+    """An agent raised inside a worker process; carries the remote traceback."""
+
+
+class SharedArray:
+    """A NumPy array backed by a named shared-memory block."""
+
+    def __init__(self, shm, shape, dtype):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, array):
+        """Copy array into a new shared-memory block (the only copy ever made)."""
+        array = np.ascontiguousarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = cls(shm, array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, spec):
+        """Map an existing block described by `spec` without copying it."""
+        name, shape, dtype = spec
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype)
+
+    @property
+    def spec(self):
+        """Picklable (name, shape, dtype) used by workers to attach."""
+        return self.shm.name, self.shape, self.dtype.str
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _worker_main(agent_factory, specs, tasks, results, results_lock):
+    def put(result):
+        with results_lock:
+            results.send(result)
+
+    shared = {name: SharedArray.attach(spec) for name, spec in specs.items()}
+    for s in shared.values():
+        s.array.flags.writeable = False
+    try:
+        try:
+            agent = agent_factory({name: s.array for name, s in shared.items()})
+            startup_error = None
+        except Exception:
+            agent, startup_error = None, traceback.format_exc()
+        while True:
+            batch = tasks.get()
+            if batch is None:
+                break
+            start, items = batch
+            # A worker whose factory failed keeps answering so map() never waits on it
+            if startup_error is not None:
+                put((start, None, startup_error))
+                continue
+            try:
+                put((start, [agent(item) for item in items], None))
+            except Exception:
+                put((start, None, traceback.format_exc()))
+    finally:
+        agent = None
+        for s in shared.values():
+            s.close()
+
+
+class AgentProcessPool:
+    """Runs `agent_factory(shared_arrays)` in each worker process and maps items over the agents.
+
+    ``shared`` maps names to NumPy arrays that are moved into shared memory
+    once and handed to every worker's factory as read-only views. The factory
+    and items must be picklable; for the 'spawn' start method the factory must
+    be a module-level callable.
+    """
+
+    def __init__(self, agent_factory, shared=None, workers=None, start_method=None):
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context(start_method)
+        self.shared = {name: SharedArray.create(array) for name, array in (shared or {}).items()}
+        for s in self.shared.values():
+            s.array.flags.writeable = False
+        self._tasks = context.SimpleQueue()
+        self._results, results_writer = context.Pipe(duplex=False)
+        # Kept on the pool: under 'spawn' the semaphore must outlive the workers' startup
+        self._results_lock = context.Lock()
+        specs = {name: s.spec for name, s in self.shared.items()}
+        self._processes = [
+            context.Process(target=_worker_main,
+                            args=(agent_factory, specs, self._tasks, results_writer, self._results_lock),
+                            daemon=True)
+            for _ in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+        # Only workers write results; the parent's copy would keep the pipe open after they exit
+        results_writer.close()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def map(self, items, chunksize=None):
+        """Apply the agent to every item across workers; results are in input order."""
+        if self._closed:
+            raise ValueError("AgentProcessPool is closed")
+        items = list(items)
+        if not items:
+            return []
+        if chunksize is None:
+            # About four chunks per worker balances load against per-message overhead
+            chunksize = max(1, len(items) // (self.workers * 4))
+        starts = range(0, len(items), chunksize)
+
+        def feed():
+            for start in starts:
+                self._tasks.put((start, items[start:start + chunksize]))
+
+        # Feeding from a thread keeps the results pipe drained; writing every
+        # task first deadlocks once both pipe buffers are full
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        output = [None] * len(items)
+        error = None
+        for _ in starts:
+            start, values, failure = self._next_result()
+            if failure is not None:
+                error = error or failure
+                continue
+            output[start:start + len(values)] = values
+        feeder.join()
+        if error is not None:
+            raise WorkerError(error)
+        return output
+
+    def _next_result(self):
+        # Wake on a result or on any worker exiting; workers only exit in close(),
+        # so an exit here means one crashed and its chunk will never arrive
+        sentinels = [process.sentinel for process in self._processes]
+        wait([self._results] + sentinels)
+        if self._results.poll():
+            try:
+                return self._results.recv()
+            except EOFError:
+                # Every worker has exited and closed its end of the pipe
+                pass
+        # A ready sentinel can precede the exit status becoming available; join reaps it
+        dead = [process for process in self._processes if process.sentinel in wait(sentinels, 0)]
+        for process in dead:
+            process.join()
+        self.terminate()
+        raise WorkerError(f"{len(dead)} worker process(es) died (exit codes "
+                          f"{', '.join(str(process.exitcode) for process in dead)}); pool terminated")
+
+    def terminate(self):
+        """Kill the workers without waiting for queued work and release the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join()
+        self._results.close()
+        for s in self.shared.values():
+            s.close()
+            s.unlink()
+
+    def close(self):
+        """Stop the workers and release the shared-memory blocks."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join()
+        self._results.close()
+        for s in self.shared.values():
+            s.close()
+            s.unlink()
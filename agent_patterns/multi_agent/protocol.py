@@ -0,0 +1,194 @@
+"""
+Zero-copy binary framing for the Communication Protocol Pattern (Chapter 5).
+
+A ``Frame`` is the chapter's ``MessageProtocol`` reduced to what the transport
+needs: a fixed 24-byte little-endian header followed by an opaque payload.
+
+    offset  size  field
+    0       2     magic b'AP'
+    2       1     protocol version
+    3       1     message type (``MessageType``)
+    4       4     sender id (unsigned agent number)
+    8       8     correlation id, pairing a response with its request
+    16      8     payload length in bytes
+
+Payloads are carried as ``memoryview`` objects and never re-serialized or
+concatenated with the header. ``InProcessTransport`` hands the frame object
+itself to the receiver, so there are no copies at all. ``UnixSocketTransport``
+writes header and payload with one scatter-gather ``sendmsg`` call. It reads
+with ``recv_into`` into a preallocated buffer that grows only when a larger
+frame arrives. A received payload is therefore a view into that buffer and
+is valid only until the next ``recv``. Call ``bytes(frame.payload)`` to keep
+it. A header announcing more than ``max_frame_size`` bytes is rejected with
+``ProtocolError`` before anything is allocated.
+
+Both transports have the same coroutine API, ``await send(frame)`` and
+``await recv()``, so one can replace the other.
+"""
+
+import enum
+import socket
+import struct
+import asyncio
+
+MAGIC = b'AP'
+VERSION = 1
+HEADER = struct.Struct('<2sBBIQQ')
+# Largest payload a receiver will allocate for; the length field is peer-controlled
+MAX_FRAME_SIZE = 64 * 2**20
+
+
+class MessageType(enum.IntEnum):
+    TASK_ASSIGNMENT = 1
+    RESULT_REPORT = 2
+    QUERY = 3
+    ACK = 4
+    ERROR = 5
+
+
+class ProtocolError(Exception):
+    """A frame header was malformed or the peer closed mid-frame."""
+
+
+class Frame:
+    """One message: header fields plus a memoryview payload."""
+
+    __slots__ = ('type', 'sender', 'correlation_id', 'payload')
+
+    def __init__(self, type, sender, correlation_id, payload=b''):
+        self.type = MessageType(type)
+        self.sender = sender
+        self.correlation_id = correlation_id
+        self.payload = payload if isinstance(payload, memoryview) else memoryview(payload)
+
+    def __repr__(self):
+        return (f"Frame({self.type.name}, sender={self.sender}, correlation_id={self.correlation_id}, "
+                f"payload={self.payload.nbytes} bytes)")
+
+    def header(self):
+        return HEADER.pack(MAGIC, VERSION, self.type, self.sender, self.correlation_id, self.payload.nbytes)
+
+
+def unpack_header(buffer):
+    """Return (type, sender, correlation_id, length) from the first HEADER.size bytes of buffer."""
+    magic, version, kind, sender, correlation_id, length = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ProtocolError(f"Bad frame magic {magic!r}")
+    if version != VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    try:
+        kind = MessageType(kind)
+    except ValueError:
+        raise ProtocolError(f"Unknown message type {kind}") from None
+    return kind, sender, correlation_id, length
+
+
+def encode(frame):
+    """Serialize a frame to one bytes object (copies; transports avoid this)."""
+    return frame.header() + frame.payload
+
+
+def decode(buffer):
+    """Parse a frame from a bytes-like object; the payload is a view into buffer, not a copy."""
+    view = memoryview(buffer)
+    kind, sender, correlation_id, length = unpack_header(view)
+    end = HEADER.size + length
+    if len(view) < end:
+        raise ProtocolError(f"Frame truncated: header says {length} payload bytes, got {len(view) - HEADER.size}")
+    return Frame(kind, sender, correlation_id, view[HEADER.size:end])
+
+
+class InProcessTransport:
+    """One direction of an in-process channel; frames are passed by reference."""
+
+    def __init__(self, max_frames=0):
+        self._queue = asyncio.Queue(maxsize=max_frames)
+
+    @classmethod
+    def pair(cls, max_frames=0):
+        """Two transports: (a_to_b, b_to_a)."""
+        return cls(max_frames), cls(max_frames)
+
+    async def send(self, frame):
+        await self._queue.put(frame)
+
+    async def recv(self):
+        return await self._queue.get()
+
+
+class UnixSocketTransport:
+    """Framed transport over a non-blocking Unix-domain stream socket, driven by the running event loop."""
+
+    def __init__(self, sock, buffer_size=1 << 20, max_frame_size=MAX_FRAME_SIZE):
+        sock.setblocking(False)
+        self.sock = sock
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray(max(buffer_size, HEADER.size))
+        self._view = memoryview(self._buffer)
+        self._header = memoryview(bytearray(HEADER.size))
+
+    @classmethod
+    def connect(cls, path, buffer_size=1 << 20, max_frame_size=MAX_FRAME_SIZE):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        return cls(sock, buffer_size, max_frame_size)
+
+    @classmethod
+    def pair(cls, buffer_size=1 << 20, max_frame_size=MAX_FRAME_SIZE):
+        """Two connected transports over socket.socketpair()."""
+        a, b = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        return cls(a, buffer_size, max_frame_size), cls(b, buffer_size, max_frame_size)
+
+    async def _writable(self):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        # The callback can fire again before this task resumes and removes it
+        loop.add_writer(self.sock.fileno(), lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_writer(self.sock.fileno())
+
+    async def send(self, frame):
+        """Write header and payload with sendmsg, resuming after partial writes."""
+        buffers = [memoryview(frame.header()), frame.payload.cast('B')]
+        while buffers:
+            try:
+                sent = self.sock.sendmsg(buffers)
+            except BlockingIOError:
+                await self._writable()
+                continue
+            while sent:
+                if sent >= buffers[0].nbytes:
+                    sent -= buffers[0].nbytes
+                    buffers.pop(0)
+                else:
+                    buffers[0] = buffers[0][sent:]
+                    sent = 0
+            if buffers and not buffers[0].nbytes:
+                buffers.pop(0)
+
+    async def _recv_exactly(self, view):
+        loop = asyncio.get_running_loop()
+        received = 0
+        while received < len(view):
+            count = await loop.sock_recv_into(self.sock, view[received:])
+            if not count:
+                raise ProtocolError('Connection closed mid-frame')
+            received += count
+
+    async def recv(self):
+        """Read one frame; its payload is a view into the receive buffer until the next recv."""
+        await self._recv_exactly(self._header)
+        kind, sender, correlation_id, length = unpack_header(self._header)
+        if length > self.max_frame_size:
+            raise ProtocolError(f"Frame of {length} bytes exceeds max_frame_size {self.max_frame_size}")
+        if length > len(self._buffer):
+            self._buffer = bytearray(length)
+            self._view = memoryview(self._buffer)
+        payload = self._view[:length]
+        await self._recv_exactly(payload)
+        return Frame(kind, sender, correlation_id, payload)
+
+    def close(self):
+        self.sock.close()
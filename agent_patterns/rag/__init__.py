@@ -0,0 +1,21 @@
+"""Retrieval Augmentation Patterns (Chapter 3)."""
+
+from agent_patterns.rag.chunking import Chunk, chunk_markdown, chunk_code
+from agent_patterns.rag.embedding import HashedNgramEmbedder
+from agent_patterns.rag.index import IncrementalIndex, corpus_files
+from agent_patterns.rag.bm25 import BM25Index
+from agent_patterns.rag.hybrid import HybridRetriever, RetrievalResult
+from agent_patterns.rag.hierarchical import HierarchicalIndex
+
+__all__ = [
+    'Chunk',
+    'chunk_markdown',
+    'chunk_code',
+    'HashedNgramEmbedder',
+    'IncrementalIndex',
+    'corpus_files',
+    'BM25Index',
+    'HybridRetriever',
+    'RetrievalResult',
+    'HierarchicalIndex',
+]
@@ -0,0 +1,90 @@
+"""
+Incremental BM25 keyword index over RAG chunks (Chapter 3).
+
+Hashed or learned embeddings blur exact identifiers: ``validate_code_generation``
+or an error code such as ``E1102`` lands near many similar-looking strings.
+A keyword index finds them exactly. ``BM25Index`` keeps an inverted index
+``term -> {chunk_id: term frequency}`` that supports adding and removing
+single chunks, so it can follow ``IncrementalIndex`` updates without being
+rebuilt. Tokenization keeps identifiers whole (``check_imports``) and also
+indexes their snake_case parts (``check``, ``imports``), so both the exact
+name and its words match.
+"""
+
+import re
+import math
+from collections import Counter
+
+from build_search_index import STOPWORDS_SET as STOPWORDS
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9_]+')
+
+
+def tokenize(text):
+    """Lowercase tokens, with snake_case identifiers also split into their parts."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        token = token.strip('_')
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        tokens.append(token)
+        if '_' in token:
+            tokens.extend(part for part in token.split('_') if len(part) > 1 and part not in STOPWORDS)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over documents that can be added and removed one at a time."""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.lengths = {}
+        self._terms = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.lengths
+
+    def add(self, doc_id, text):
+        if doc_id in self.lengths:
+            self.remove(doc_id)
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        self._terms[doc_id] = list(counts)
+        self.lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id):
+        length = self.lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._terms.pop(doc_id):
+            docs = self.postings[term]
+            del docs[doc_id]
+            if not docs:
+                del self.postings[term]
+
+    def search(self, query, k=10):
+        """Return up to k (doc_id, score) pairs with positive BM25 score, best first."""
+        n = len(self.lengths)
+        if not n:
+            return []
+        average = self._total_length / n or 1.0
+        scores = Counter()
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores.most_common(k)
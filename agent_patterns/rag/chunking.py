@@ -0,0 +1,189 @@
+"""
+Markdown-aware chunking for the Retrieval Augmentation Pattern (Chapter 3).
+
+Splitting documents every N characters cuts through code blocks and loses
+the context a heading gives the text below it. ``chunk_markdown`` instead
+reads a document as blocks: paragraphs, list runs, and fenced code blocks,
+which stay whole. It starts a new chunk at every heading, packs consecutive
+blocks into chunks of at most ``max_chars``, and only splits a block that is
+too large on its own, at line boundaries. Each ``Chunk`` records the heading
+path above it, for example ``('Tool Integration Patterns', 'Function Calling
+Pattern')``, as metadata, and a content hash of its headings and text. The
+incremental indexer uses that hash to decide whether a chunk needs
+re-embedding.
+
+``chunk_code`` does the same for source files: blocks are separated by
+blank lines, and the heading is the enclosing top-level ``def`` or
+``class``.
+"""
+
+import re
+import hashlib
+
+from build_search_index import strip_front_matter
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+DEFINITION_PATTERN = re.compile(r'^(?:async\s+def|def|class)\s+(\w+)')
+
+
+class Chunk:
+    """A piece of a document with its heading path and content hash."""
+
+    __slots__ = ('chunk_id', 'source', 'headings', 'text', 'content_hash')
+
+    def __init__(self, chunk_id, source, headings, text, content_hash=None):
+        self.chunk_id = chunk_id
+        self.source = source
+        self.headings = tuple(headings)
+        self.text = text
+        self.content_hash = content_hash or chunk_hash(self.headings, text)
+
+    @property
+    def embedding_text(self):
+        """Text to embed: the heading path followed by the chunk body."""
+        if not self.headings:
+            return self.text
+        return ' > '.join(self.headings) + '\n' + self.text
+
+    def to_dict(self):
+        return {'id': self.chunk_id, 'source': self.source, 'headings': list(self.headings),
+                'text': self.text, 'hash': self.content_hash}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['id'], data['source'], data['headings'], data['text'], data['hash'])
+
+    def __repr__(self):
+        return f"Chunk({self.chunk_id!r}, headings={self.headings!r}, chars={len(self.text)})"
+
+
+def chunk_hash(headings, text):
+    """Stable hex digest of a chunk's heading path and text."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update('\x1f'.join(headings).encode('utf-8'))
+    digest.update(b'\x1e')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def iter_blocks(content):
+    """Yield (heading_level, heading_title) for headings and (None, block_text) for other blocks."""
+    lines = []
+    fence = None
+    for line in content.split('\n'):
+        stripped = line.strip()
+        if fence is not None:
+            lines.append(line)
+            if stripped.startswith(fence):
+                fence = None
+                yield None, '\n'.join(lines)
+                lines = []
+            continue
+        if stripped.startswith('```') or stripped.startswith('~~~'):
+            if lines:
+                yield None, '\n'.join(lines)
+            lines = [line]
+            fence = stripped[:3]
+            continue
+        match = HEADING_PATTERN.match(line)
+        if match:
+            if lines:
+                yield None, '\n'.join(lines)
+                lines = []
+            yield len(match.group(1)), match.group(2)
+        elif not stripped:
+            if lines:
+                yield None, '\n'.join(lines)
+                lines = []
+        else:
+            lines.append(line)
+    if lines:
+        yield None, '\n'.join(lines)
+
+
+def _split_block(block, max_chars):
+    """Split an oversized block at line boundaries (and inside very long lines)."""
+    piece = []
+    size = 0
+    for line in block.split('\n'):
+        while len(line) > max_chars:
+            if piece:
+                yield '\n'.join(piece)
+                piece, size = [], 0
+            yield line[:max_chars]
+            line = line[max_chars:]
+        if piece and size + len(line) + 1 > max_chars:
+            yield '\n'.join(piece)
+            piece, size = [], 0
+        piece.append(line)
+        size += len(line) + 1
+    if piece:
+        yield '\n'.join(piece)
+
+
+def chunk_markdown(content, source, max_chars=1200):
+    """Split a markdown document into Chunks that never cross a heading."""
+    if max_chars <= 0:
+        raise ValueError(f"max_chars must be positive, got {max_chars}")
+    chunks = []
+    headings = []
+    parts = []
+    size = 0
+
+    def flush():
+        nonlocal parts, size
+        if parts:
+            chunks.append(Chunk(f"{source}#{len(chunks)}", source, [title for _, title in headings],
+                                '\n\n'.join(parts)))
+        parts, size = [], 0
+
+    for level, block in iter_blocks(strip_front_matter(content)):
+        if level is not None:
+            flush()
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, block))
+            continue
+        for piece in (_split_block(block, max_chars) if len(block) > max_chars else (block,)):
+            if parts and size + len(piece) + 2 > max_chars:
+                flush()
+            parts.append(piece)
+            size += len(piece) + 2
+    flush()
+    return chunks
+
+
+def chunk_code(content, source, max_chars=1200):
+    """Split source code into Chunks at blank lines, headed by the enclosing top-level def/class."""
+    if max_chars <= 0:
+        raise ValueError(f"max_chars must be positive, got {max_chars}")
+    chunks = []
+    heading = ()
+    parts = []
+    size = 0
+
+    def flush():
+        nonlocal parts, size
+        if parts:
+            chunks.append(Chunk(f"{source}#{len(chunks)}", source, heading, '\n\n'.join(parts)))
+        parts, size = [], 0
+
+    for block in re.split(r'\n\s*\n', content):
+        if not block.strip():
+            continue
+        first = next((line for line in block.split('\n') if not line.startswith('@')), '')
+        match = DEFINITION_PATTERN.match(first)
+        if match:
+            flush()
+            heading = (match.group(1),)
+        elif heading and first[:1] not in ' \t#)]}':
+            # Module-level code after a definition no longer belongs to it
+            flush()
+            heading = ()
+        for piece in (_split_block(block, max_chars) if len(block) > max_chars else (block,)):
+            if parts and size + len(piece) + 2 > max_chars:
+                flush()
+            parts.append(piece)
+            size += len(piece) + 2
+    flush()
+    return chunks
@@ -0,0 +1,66 @@
+"""
+Deterministic hashed n-gram embedder for offline RAG (Chapter 3).
+
+A hosted embedding model needs a network connection and returns slightly
+different vectors across versions, so an index cannot be rebuilt or tested
+reproducibly. ``HashedNgramEmbedder`` is a local stand-in built on the
+hashing trick. Every word unigram, word bigram and character trigram of a
+text is hashed with CRC-32 into one of ``dim`` buckets, with a sign taken
+from a second hash bit. The counts are damped with log1p and the row is
+L2-normalized. The same text always gives the same vector, in any process,
+and texts that share words and word fragments end up close in cosine
+similarity. That is enough for indexing, caching and retrieval experiments.
+``embed_batch`` embeds many texts into one float32 matrix.
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9_]+')
+
+
+class HashedNgramEmbedder:
+    """Signed feature hashing of word 1-2-grams and character trigrams into `dim` buckets."""
+
+    def __init__(self, dim=512, char_ngrams=3, word_bigrams=True):
+        if dim <= 0:
+            raise ValueError(f"dim must be positive, got {dim}")
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.word_bigrams = word_bigrams
+
+    @property
+    def signature(self):
+        """Identifies the embedding function, so stored vectors from another one are not reused."""
+        return f"hashed-ngram:dim={self.dim}:char={self.char_ngrams}:bigrams={int(self.word_bigrams)}"
+
+    def features(self, text):
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        features = list(tokens)
+        if self.word_bigrams:
+            features.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        n = self.char_ngrams
+        if n:
+            for token in tokens:
+                padded = f"<{token}>"
+                features.extend(f"#{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+        return features
+
+    def embed(self, text):
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts):
+        """Embed texts into a (len(texts), dim) float32 matrix of unit rows."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter((zlib.crc32(f.encode('utf-8')) for f in self.features(text)), dtype=np.uint32)
+            if not len(hashes):
+                continue
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+            counts = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+            matrix[row] = np.sign(counts) * np.log1p(np.abs(counts))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
@@ -0,0 +1,106 @@
+"""
+Two-level hierarchical embedding index (Chapter 6, "Performance Optimizations").
+
+The Retrieval-Enhanced Development Assistant searches a whole repository for
+every question. A flat index compares the query with every chunk, so its
+cost grows with the size of the repository. ``HierarchicalIndex`` groups
+the chunks of an ``IncrementalIndex`` into sections: one per file
+(``section_depth=0``), or one per file and leading heading path, such as a
+top-level ``def``/``class`` for code or a chapter section for Markdown.
+Each section gets a summary embedding, the normalized centroid of its chunk
+embeddings. A query:
+
+1. scores the S section summaries and keeps the ``top_sections`` best (M)
+2. scores only the chunks in those M sections and returns the top k
+
+So it reads S + (chunks in M sections) vectors instead of all N, at the cost
+of missing a relevant chunk when its section's centroid ranks below M.
+``sync`` follows the underlying index incrementally. Only sections of files
+whose hash changed are regrouped, and their centroids recomputed from
+embeddings already stored, so nothing is re-embedded.
+"""
+
+import numpy as np
+
+from agent_patterns.memory.vector_store import normalize_rows, top_k
+
+
+class HierarchicalIndex:
+    """Section-centroid search followed by chunk search inside the best sections."""
+
+    def __init__(self, index, section_depth=0, top_sections=8):
+        if top_sections <= 0:
+            raise ValueError(f"top_sections must be positive, got {top_sections}")
+        self.index = index
+        self.section_depth = section_depth
+        self.top_sections = top_sections
+        self.sections = {}
+        self._source_sections = {}
+        self._synced = {}
+        self._summary_cache = None
+        self.last_scanned = 0
+        self.sync()
+
+    def _section_key(self, chunk):
+        path = chunk.headings[:self.section_depth]
+        return chunk.source if not path else chunk.source + '#' + ' > '.join(path)
+
+    def _drop_source(self, source):
+        for key in self._source_sections.pop(source, ()):
+            del self.sections[key]
+        self._synced.pop(source, None)
+
+    def sync(self):
+        """Regroup sections of files that changed in the underlying index; return files updated."""
+        index = self.index
+        changed = 0
+        for source in [s for s in self._synced if s not in index.sources]:
+            self._drop_source(source)
+            changed += 1
+        for source, (file_hash, chunk_ids) in index.sources.items():
+            if self._synced.get(source) == file_hash:
+                continue
+            self._drop_source(source)
+            groups = {}
+            for chunk_id in chunk_ids:
+                groups.setdefault(self._section_key(index.chunks[chunk_id]), []).append(chunk_id)
+            for key, ids in groups.items():
+                matrix = np.stack([index.vectors[index.chunks[i].content_hash] for i in ids])
+                self.sections[key] = (ids, matrix, normalize_rows(matrix.mean(axis=0))[0])
+            self._source_sections[source] = list(groups)
+            self._synced[source] = file_hash
+            changed += 1
+        if changed:
+            self._summary_cache = None
+        return changed
+
+    def _summaries(self):
+        if self._summary_cache is None:
+            keys = list(self.sections)
+            if keys:
+                matrix = np.stack([self.sections[key][2] for key in keys])
+            else:
+                matrix = np.empty((0, self.index.embedder.dim), dtype=np.float32)
+            self._summary_cache = (keys, matrix)
+        return self._summary_cache
+
+    def search(self, query, k=5, top_sections=None):
+        """Return the k best chunks from the most similar sections as (Chunk, score) pairs."""
+        query_vector = self.index.embedder.embed_batch([query])
+        keys, summaries = self._summaries()
+        best_sections, _ = top_k(query_vector @ summaries.T, top_sections or self.top_sections)
+        chunk_ids, scores = [], []
+        for row in best_sections[0]:
+            ids, matrix, _ = self.sections[keys[row]]
+            chunk_ids.extend(ids)
+            scores.append(matrix @ query_vector[0])
+        self.last_scanned = len(keys) + len(chunk_ids)
+        if not scores:
+            return []
+        ids, scores = top_k(np.concatenate(scores)[np.newaxis, :], k)
+        return [(self.index.chunks[chunk_ids[i]], float(s)) for i, s in zip(ids[0], scores[0])]
+
+    @property
+    def nbytes(self):
+        """Bytes held by section chunk matrices and summaries."""
+        return sum(matrix.nbytes + summary.nbytes for _, matrix, summary in self.sections.values())
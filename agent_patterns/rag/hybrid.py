@@ -0,0 +1,165 @@
+"""
+Hybrid keyword + vector retrieval (Chapter 3 RAG best practices, Chapter 6 budget).
+
+"Consider both semantic relevance and potential keyword matches": a vector
+index finds paraphrases but misses exact identifiers, and a keyword index
+does the reverse. ``HybridRetriever`` keeps a ``BM25Index`` over the same
+chunk ids as an ``IncrementalIndex``. ``sync`` re-indexes only chunks that
+were added, changed or removed. For each query the retriever:
+
+1. runs the keyword and vector searches concurrently in an executor, each
+   returning ``candidates`` ranked chunk ids
+2. fuses the two rankings, by reciprocal-rank fusion (``'rrf'``, which uses
+   ranks only) or by a weighted sum of min-max normalized scores
+   (``'weighted'``)
+3. returns the top k as a ``RetrievalResult`` with per-stage latencies
+
+The whole retrieval is bounded by ``budget`` seconds, 2 s by default as in
+the Chapter 6 assistant's response-time target, or by less if a
+``agent_patterns.tools.policies.deadline`` scope is active. A stage that
+misses the budget is dropped and the result is marked ``degraded``, instead
+of the whole query failing. ``metrics`` reports p50/p99 per stage.
+"""
+
+import time
+import asyncio
+from collections import deque
+
+import numpy as np
+
+from agent_patterns.rag.bm25 import BM25Index
+from agent_patterns.tools.policies import remaining
+
+FUSIONS = ('rrf', 'weighted')
+STAGES = ('keyword', 'vector', 'fusion', 'total')
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """Fuse ranked [(id, score)] lists by summing 1 / (k + rank); best first."""
+    scores = {}
+    for ranking in rankings:
+        for rank, (doc_id, _) in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+def weighted_fusion(rankings, weights):
+    """Fuse ranked [(id, score)] lists by a weighted sum of per-list min-max normalized scores."""
+    scores = {}
+    for ranking, weight in zip(rankings, weights):
+        if not ranking:
+            continue
+        values = [score for _, score in ranking]
+        low, span = min(values), (max(values) - min(values)) or 1.0
+        for doc_id, score in ranking:
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * (score - low) / span
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+class RetrievalResult:
+    """Fused hits as (Chunk, score) pairs, per-stage seconds, and stages dropped for time."""
+
+    __slots__ = ('hits', 'latency', 'degraded')
+
+    def __init__(self, hits, latency, degraded=()):
+        self.hits = hits
+        self.latency = latency
+        self.degraded = tuple(degraded)
+
+    def __repr__(self):
+        return (f"RetrievalResult(hits={len(self.hits)}, total={self.latency['total'] * 1000:.1f} ms, "
+                f"degraded={self.degraded})")
+
+
+class HybridRetriever:
+    """BM25 and vector search over one IncrementalIndex, fused and bounded by a latency budget."""
+
+    def __init__(self, index, fusion='rrf', rrf_k=60, vector_weight=0.5, candidates=50, budget=2.0, executor=None):
+        if fusion not in FUSIONS:
+            raise ValueError(f"Unknown fusion {fusion!r}; expected one of {FUSIONS}")
+        self.index = index
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        self.vector_weight = vector_weight
+        self.candidates = candidates
+        self.budget = budget
+        self.executor = executor
+        self.bm25 = BM25Index()
+        self.latency = {stage: deque(maxlen=1024) for stage in STAGES}
+        self.degraded = 0
+        self._indexed = {}
+        self.sync()
+
+    def sync(self):
+        """Bring the keyword index in line with the vector index; return chunks re-indexed."""
+        chunks = self.index.chunks
+        for chunk_id in [i for i in self._indexed if i not in chunks]:
+            self.bm25.remove(chunk_id)
+            del self._indexed[chunk_id]
+        changed = 0
+        for chunk_id, chunk in chunks.items():
+            if self._indexed.get(chunk_id) != chunk.content_hash:
+                self.bm25.add(chunk_id, chunk.embedding_text)
+                self._indexed[chunk_id] = chunk.content_hash
+                changed += 1
+        return changed
+
+    def keyword_search(self, query, k):
+        return self.bm25.search(query, k)
+
+    def vector_search(self, query, k):
+        return [(chunk.chunk_id, score) for chunk, score in self.index.search(query, k)]
+
+    def _fuse(self, rankings):
+        if self.fusion == 'rrf':
+            return reciprocal_rank_fusion(rankings, self.rrf_k)
+        return weighted_fusion(rankings, (1.0 - self.vector_weight, self.vector_weight))
+
+    async def search(self, query, k=5):
+        """Retrieve the k best chunks for a query within the latency budget."""
+        start = time.perf_counter()
+        budget = self.budget
+        left = remaining()
+        if left is not None:
+            budget = left if budget is None else min(budget, left)
+        loop = asyncio.get_running_loop()
+        latency = {}
+
+        def timed(stage, search):
+            stage_start = time.perf_counter()
+            ranking = search(query, self.candidates)
+            latency[stage] = time.perf_counter() - stage_start
+            return ranking
+
+        stages = {
+            'keyword': loop.run_in_executor(self.executor, timed, 'keyword', self.keyword_search),
+            'vector': loop.run_in_executor(self.executor, timed, 'vector', self.vector_search),
+        }
+        done, pending = await asyncio.wait(stages.values(), timeout=budget)
+        for future in pending:
+            future.cancel()
+        degraded = [stage for stage, future in stages.items() if future not in done]
+        if len(degraded) == len(stages):
+            raise asyncio.TimeoutError(f"Retrieval exceeded its {budget:.3f} s budget")
+
+        latency = dict(latency)
+        fusion_start = time.perf_counter()
+        rankings = [stages[stage].result() if stage not in degraded else [] for stage in ('keyword', 'vector')]
+        fused = self._fuse(rankings)[:k]
+        latency['fusion'] = time.perf_counter() - fusion_start
+        latency['total'] = time.perf_counter() - start
+
+        for stage, seconds in latency.items():
+            self.latency[stage].append(seconds)
+        if degraded:
+            self.degraded += 1
+        return RetrievalResult([(self.index.chunks[chunk_id], score) for chunk_id, score in fused],
+                               latency, degraded)
+
+    def metrics(self):
+        """p50/p99 milliseconds per stage over recent queries."""
+        metrics = {}
+        for stage, samples in self.latency.items():
+            p50, p99 = np.quantile(samples, [0.5, 0.99]) * 1000 if samples else (0.0, 0.0)
+            metrics[stage] = {'p50_ms': float(p50), 'p99_ms': float(p99)}
+        return metrics
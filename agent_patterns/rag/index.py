@@ -0,0 +1,212 @@
+"""
+Incremental document index for the Retrieval Augmentation Pattern (Chapter 3).
+
+"Preprocess and index documents effectively" usually means re-chunking and
+re-embedding the whole corpus whenever anything changes. Embedding dominates
+that cost, and a typical edit touches one section of one file.
+``IncrementalIndex.update`` runs a streaming pipeline over the corpus
+(``chapters/*.md``, ``specs/*.md`` and ``GLOSSARY.md`` by default):
+
+1. read each file and compare its hash with the last run, skipping
+   unchanged files without parsing them
+2. re-chunk changed files with ``chunk_markdown`` (headings kept as metadata),
+   or another chunker such as ``chunk_code`` for source trees
+3. send only chunks whose content hash has no stored embedding to the
+   embedder, ``batch_size`` at a time, as soon as a batch fills
+4. replace a file's indexed chunks only once all of them have vectors, so
+   an embedder failure leaves that file's previous version in place
+
+Embeddings are keyed by chunk content hash, not by position. Editing one
+paragraph re-embeds that paragraph's chunk. Inserting a section shifts chunk
+ids but reuses every other vector, and a chunk moved between files is not
+re-embedded either. Files that disappeared are dropped, and vectors no
+longer referenced are released. ``save`` and ``load`` persist the index as
+JSON metadata plus a NumPy matrix, so the next process starts incremental.
+"""
+
+import os
+import glob
+import json
+import time
+import hashlib
+from itertools import islice
+
+import numpy as np
+
+from agent_patterns.memory.vector_store import top_k
+from agent_patterns.rag.chunking import Chunk, chunk_markdown
+from agent_patterns.rag.embedding import HashedNgramEmbedder
+
+CORPUS_PATTERNS = ('chapters/*.md', 'specs/*.md', 'GLOSSARY.md')
+
+
+def corpus_files(root='.', patterns=CORPUS_PATTERNS):
+    """Sorted paths, relative to root, of the files matching the glob patterns."""
+    found = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern), recursive=True):
+            if os.path.isfile(path):
+                found.add(os.path.relpath(path, root).replace(os.sep, '/'))
+    return sorted(found)
+
+
+def batched(iterable, size):
+    """Yield lists of up to `size` consecutive items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class IncrementalIndex:
+    """Chunked, embedded corpus that re-embeds only new or changed chunks on update."""
+
+    def __init__(self, embedder=None, batch_size=64, max_chars=1200, chunker=chunk_markdown):
+        self.embedder = embedder or HashedNgramEmbedder()
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self.chunker = chunker
+        self.chunks = {}
+        self.sources = {}
+        self.vectors = {}
+        self._search_cache = None
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def _replace_source(self, source, file_hash, chunks):
+        self._remove_source(source)
+        self.sources[source] = (file_hash, [chunk.chunk_id for chunk in chunks])
+        for chunk in chunks:
+            self.chunks[chunk.chunk_id] = chunk
+
+    def _remove_source(self, source):
+        _, chunk_ids = self.sources.pop(source, (None, ()))
+        for chunk_id in chunk_ids:
+            del self.chunks[chunk_id]
+
+    def update(self, root='.', patterns=CORPUS_PATTERNS):
+        """Bring the index up to date with the files under root; return timing and counts."""
+        start = time.perf_counter()
+        stats = {'files': 0, 'changed_files': 0, 'removed_files': 0,
+                 'chunks': 0, 'embedded': 0, 'reused': 0}
+        seen = set()
+
+        def changed_documents():
+            for source in corpus_files(root, patterns):
+                seen.add(source)
+                stats['files'] += 1
+                with open(os.path.join(root, source), 'rb') as f:
+                    data = f.read()
+                file_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+                if source in self.sources and self.sources[source][0] == file_hash:
+                    continue
+                stats['changed_files'] += 1
+                yield source, file_hash, self.chunker(data.decode('utf-8', errors='replace'), source, self.max_chars)
+
+        # A changed file is staged until every chunk it needs has a vector, and
+        # only then replaces the indexed version. If the embedder fails, files
+        # not yet committed keep their old hash and chunks and are retried.
+        staged = {}
+
+        def chunks_to_embed():
+            queued = set()
+            for source, file_hash, chunks in changed_documents():
+                stats['chunks'] += len(chunks)
+                new, missing = [], set()
+                for chunk in chunks:
+                    if chunk.content_hash in self.vectors or chunk.content_hash in missing:
+                        stats['reused'] += 1
+                    elif chunk.content_hash in queued:
+                        stats['reused'] += 1
+                        missing.add(chunk.content_hash)
+                    else:
+                        queued.add(chunk.content_hash)
+                        missing.add(chunk.content_hash)
+                        new.append(chunk)
+                staged[source] = (file_hash, chunks, missing)
+                yield from new
+
+        def commit(embedded):
+            for source in list(staged):
+                file_hash, chunks, missing = staged[source]
+                missing -= embedded
+                if not missing:
+                    del staged[source]
+                    self._replace_source(source, file_hash, chunks)
+                    self._search_cache = None
+
+        for batch in batched(chunks_to_embed(), self.batch_size):
+            embeddings = self.embedder.embed_batch([chunk.embedding_text for chunk in batch])
+            for chunk, vector in zip(batch, embeddings):
+                self.vectors[chunk.content_hash] = vector
+            stats['embedded'] += len(batch)
+            commit({chunk.content_hash for chunk in batch})
+        commit(set())
+
+        for source in set(self.sources) - seen:
+            self._remove_source(source)
+            stats['removed_files'] += 1
+        if stats['changed_files'] or stats['removed_files']:
+            live = {chunk.content_hash for chunk in self.chunks.values()}
+            for content_hash in set(self.vectors) - live:
+                del self.vectors[content_hash]
+            self._search_cache = None
+
+        stats['seconds'] = time.perf_counter() - start
+        stats['chunks_per_second'] = stats['chunks'] / stats['seconds'] if stats['seconds'] else 0.0
+        return stats
+
+    def _matrix(self):
+        if self._search_cache is None:
+            chunk_ids = list(self.chunks)
+            if chunk_ids:
+                matrix = np.stack([self.vectors[self.chunks[i].content_hash] for i in chunk_ids])
+            else:
+                matrix = np.empty((0, self.embedder.dim), dtype=np.float32)
+            self._search_cache = (chunk_ids, matrix)
+        return self._search_cache
+
+    def search(self, query, k=5):
+        """Return the k chunks most similar to the query text as (Chunk, score) pairs, best first."""
+        chunk_ids, matrix = self._matrix()
+        scores = self.embedder.embed_batch([query]) @ matrix.T
+        ids, best = top_k(scores, k)
+        return [(self.chunks[chunk_ids[i]], float(s)) for i, s in zip(ids[0], best[0])]
+
+    def save(self, path):
+        """Write index.json and vectors.npy into the directory `path`."""
+        os.makedirs(path, exist_ok=True)
+        hashes = list(self.vectors)
+        matrix = np.stack([self.vectors[h] for h in hashes]) if hashes else np.empty((0, self.embedder.dim))
+        np.save(os.path.join(path, 'vectors.npy'), matrix.astype(np.float32))
+        metadata = {
+            'embedder': self.embedder.signature,
+            'max_chars': self.max_chars,
+            'chunker': self.chunker.__name__,
+            'hashes': hashes,
+            'sources': {source: [file_hash, ids] for source, (file_hash, ids) in self.sources.items()},
+            'chunks': [chunk.to_dict() for chunk in self.chunks.values()],
+        }
+        with open(os.path.join(path, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, embedder=None, batch_size=64, max_chars=1200, chunker=chunk_markdown):
+        """Load a saved index; one built with another embedder, chunker or chunk size starts empty."""
+        index = cls(embedder, batch_size, max_chars, chunker)
+        metadata_path = os.path.join(path, 'index.json')
+        if not os.path.exists(metadata_path):
+            return index
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        if (metadata['embedder'], metadata['max_chars'], metadata.get('chunker')) != \
+                (index.embedder.signature, max_chars, chunker.__name__):
+            return index
+        matrix = np.load(os.path.join(path, 'vectors.npy'))
+        index.vectors = dict(zip(metadata['hashes'], matrix))
+        index.sources = {source: (file_hash, ids) for source, (file_hash, ids) in metadata['sources'].items()}
+        index.chunks = {data['id']: Chunk.from_dict(data) for data in metadata['chunks']}
+        return index
@@ -0,0 +1,43 @@
+"""
+Deterministic local stand-in for an LLM, for tests and benchmarks.
+
+``StubLLM`` never calls a network service. Its outputs are pure functions of
+its inputs, and its response time is ``latency`` seconds plus an optional
+seeded jitter, so experiments that depend on LLM round-trips are repeatable.
+"""
+
+import asyncio
+import hashlib
+import random
+
+
+class StubLLM:
+    """Fake LLM with configurable latency and deterministic outputs."""
+
+    def __init__(self, latency=0.0, jitter=0.0, seed=0, max_summary_words=60):
+        self.latency = latency
+        self.jitter = jitter
+        self.max_summary_words = max_summary_words
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    async def _wait(self):
+        self.calls += 1
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def complete(self, prompt):
+        """Return a short response derived from a hash of the prompt."""
+        await self._wait()
+        digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+        return f"stub response {digest}"
+
+    async def summarize(self, previous_summary, messages):
+        """Extractive summary: the previous summary plus the opening words of each message."""
+        await self._wait()
+        words = previous_summary.split()
+        for message in messages:
+            words.append(f"{message['role']}:")
+            words.extend(message['content'].split()[:8])
+        return ' '.join(words[-self.max_summary_words:])
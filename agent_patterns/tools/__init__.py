@@ -0,0 +1,41 @@
+"""Tool Integration Patterns (Chapter 3)."""
+
+from agent_patterns.tools.registry import Tool, ToolRegistry, ToolValidationError
+from agent_patterns.tools.cache import ToolResultCache
+from agent_patterns.tools.batching import MicroBatcher, BatchingDispatcher
+from agent_patterns.tools.workflow import Workflow, WorkflowStep, WorkflowEngine, ToolResult, StepFailed
+from agent_patterns.tools.policies import (
+    PolicyExecutor,
+    RetryPolicy,
+    HedgePolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    deadline,
+)
+from agent_patterns.tools.jsonrpc import JsonRpcClient, JsonRpcError, ToolServerPool, CapabilityCache
+
+__all__ = [
+    'Tool',
+    'ToolRegistry',
+    'ToolValidationError',
+    'ToolResultCache',
+    'MicroBatcher',
+    'BatchingDispatcher',
+    'Workflow',
+    'WorkflowStep',
+    'WorkflowEngine',
+    'ToolResult',
+    'StepFailed',
+    'PolicyExecutor',
+    'RetryPolicy',
+    'HedgePolicy',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'DeadlineExceeded',
+    'deadline',
+    'JsonRpcClient',
+    'JsonRpcError',
+    'ToolServerPool',
+    'CapabilityCache',
+]
@@ -0,0 +1,129 @@
+"""
+Request batching for tool dispatch (Chapter 3, "Performance Considerations").
+
+Tools such as embedding or bulk lookup APIs accept many inputs per call, and
+their cost is dominated by per-call overhead. Callers, though, naturally make
+one call per item; RAG indexing asks for one embedding per chunk. A
+``MicroBatcher`` collects individual submissions for at most ``window``
+seconds, or until ``max_batch_size`` are waiting, makes one bulk call, and
+scatters the results back to each waiting caller.
+
+``BatchingDispatcher`` applies this to a ``ToolRegistry``: tools configured
+with a bulk function are batched transparently, and all others are
+dispatched as usual. Arguments are validated per call with the tool's
+compiled validator before they join a batch, so one bad call cannot fail the
+whole batch. A bulk function may also return an exception instance in place
+of one result, and only that caller sees it.
+"""
+
+import asyncio
+import inspect
+
+
+class MicroBatcher:
+    """Coalesces single submissions into calls of `bulk_function(items) -> results`."""
+
+    def __init__(self, bulk_function, window=0.005, max_batch_size=64, max_concurrent_batches=None):
+        self.bulk_function = bulk_function
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._is_async = inspect.iscoroutinefunction(bulk_function)
+        self._slots = asyncio.Semaphore(max_concurrent_batches) if max_concurrent_batches else None
+        self._pending = []
+        self._timer = None
+        self._running = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item):
+        """Queue one item and wait for its result from the next bulk call."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        if self._slots is not None:
+            async with self._slots:
+                await self._call(batch)
+        else:
+            await self._call(batch)
+
+    async def _call(self, batch):
+        items = [item for item, _ in batch]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = self.bulk_function(items)
+            if self._is_async:
+                results = await results
+            results = list(results)
+            if len(results) != len(items):
+                raise ValueError(f"Bulk function returned {len(results)} results for {len(items)} items")
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # The caller was cancelled while waiting
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def drain(self):
+        """Flush anything pending and wait for in-flight batches."""
+        self._flush()
+        if self._running:
+            await asyncio.gather(*self._running)
+
+    def metrics(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+        }
+
+
+class BatchingDispatcher:
+    """Dispatches registry tools, batching calls to tools that have a bulk implementation."""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.batchers = {}
+
+    def configure(self, tool_name, bulk_function, window=0.005, max_batch_size=64, max_concurrent_batches=None):
+        """Batch calls to tool_name through bulk_function(list of argument dicts) -> list of results."""
+        if tool_name not in self.registry:
+            raise ValueError(f"Unknown tool {tool_name!r}")
+        self.batchers[tool_name] = MicroBatcher(bulk_function, window, max_batch_size, max_concurrent_batches)
+
+    async def invoke(self, name, arguments):
+        batcher = self.batchers.get(name)
+        if batcher is None:
+            return await self.registry.invoke(name, arguments)
+        return await batcher.submit(self.registry.get(name).validate(arguments))
+
+    async def drain(self):
+        await asyncio.gather(*(batcher.drain() for batcher in self.batchers.values()))
+
+    def metrics(self):
+        return {name: batcher.metrics() for name, batcher in self.batchers.items()}
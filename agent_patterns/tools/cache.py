@@ -0,0 +1,182 @@
+"""
+Result cache for idempotent tools (Chapter 3, "Performance Considerations").
+
+``ToolResultCache`` sits in front of a ``ToolRegistry``. Only tools explicitly
+configured as cacheable are cached, since caching a tool with side effects
+would be a bug. Entries are keyed by tool name plus the canonical JSON of the
+validated arguments, so argument order and omitted defaults do not split the
+cache. Each tool has its own TTL (Chapter 6's time-based invalidation for
+documentation lookups), and the cache as a whole is a size-bounded LRU.
+
+Two techniques keep slow tools off the request path:
+
+- singleflight: concurrent identical calls while one is in flight share its
+  result instead of each executing the tool
+- stale-while-revalidate: for ``stale_ttl`` seconds after expiry the old value
+  is returned immediately while a single background refresh fetches a new one
+
+Hits record the latency they saved, measured from the original execution.
+"""
+
+import json
+import time
+import asyncio
+from collections import OrderedDict
+
+
+class CacheEntry:
+    __slots__ = ('value', 'expires_at', 'stale_until', 'cost')
+
+    def __init__(self, value, expires_at, stale_until, cost):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.cost = cost
+
+
+class CachePolicy:
+    """How long one tool's results stay fresh, and then servable while stale."""
+
+    __slots__ = ('ttl', 'stale_ttl')
+
+    def __init__(self, ttl, stale_ttl=0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+
+def canonical_arguments(arguments):
+    """Order-independent, hashable encoding of tool arguments."""
+    return json.dumps(arguments, sort_keys=True, separators=(',', ':'), default=repr)
+
+
+class ToolResultCache:
+    """Caching, coalescing front end for a ToolRegistry."""
+
+    def __init__(self, registry, max_entries=4096, clock=time.monotonic):
+        self.registry = registry
+        self.max_entries = max_entries
+        self.clock = clock
+        self.policies = {}
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._refreshing = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.saved_seconds = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def configure(self, tool_name, ttl, stale_ttl=0.0):
+        """Mark a tool as idempotent and cacheable for ttl seconds (plus stale_ttl stale)."""
+        if tool_name not in self.registry:
+            raise ValueError(f"Unknown tool {tool_name!r}")
+        self.policies[tool_name] = CachePolicy(ttl, stale_ttl)
+
+    def invalidate(self, tool_name=None):
+        """Drop cached results for one tool, or for all tools."""
+        if tool_name is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == tool_name]:
+            del self._entries[key]
+
+    async def _execute(self, tool, arguments):
+        start = time.perf_counter()
+        result = tool.function(**arguments)
+        if tool.is_async:
+            result = await result
+        return result, time.perf_counter() - start
+
+    def _store(self, key, policy, value, cost):
+        now = self.clock()
+        self._entries[key] = CacheEntry(value, now + policy.ttl, now + policy.ttl + policy.stale_ttl, cost)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _run(self, key, tool, arguments, policy):
+        try:
+            value, cost = await self._execute(tool, arguments)
+            self._store(key, policy, value, cost)
+            return value
+        finally:
+            del self._in_flight[key]
+
+    async def _fetch(self, key, tool, arguments, policy):
+        """Execute once per key at a time; concurrent callers await the same task."""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # The cache owns the execution, so cancelling any one caller (the
+            # first included) leaves it running for the others
+            task = asyncio.ensure_future(self._run(key, tool, arguments, policy))
+            # Mark retrieved so a failure with no waiters left is not reported as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    async def _refresh(self, key, tool, arguments, policy):
+        try:
+            await self._fetch(key, tool, arguments, policy)
+            self.refreshes += 1
+        except Exception:
+            # Keep serving the stale value; the next miss will surface the error
+            pass
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def invoke(self, name, arguments):
+        """Validated tool call served from cache when possible."""
+        tool = self.registry.get(name)
+        arguments = tool.validate(arguments)
+        policy = self.policies.get(name)
+        if policy is None:
+            return (await self._execute(tool, arguments))[0]
+
+        key = (name, canonical_arguments(arguments))
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = self.clock()
+            if now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += entry.cost
+                return entry.value
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self.saved_seconds += entry.cost
+                if key not in self._refreshing and key not in self._in_flight:
+                    self._refreshing[key] = asyncio.ensure_future(self._refresh(key, tool, arguments, policy))
+                return entry.value
+            del self._entries[key]
+
+        if key not in self._in_flight:
+            self.misses += 1
+        return await self._fetch(key, tool, arguments, policy)
+
+    async def wait_for_refreshes(self):
+        """Wait until background revalidations have finished."""
+        if self._refreshing:
+            await asyncio.gather(*self._refreshing.values())
+
+    def metrics(self):
+        """Hit rates, coalesced calls and the tool latency saved by the cache."""
+        served = self.hits + self.stale_hits
+        lookups = served + self.misses + self.coalesced
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'refreshes': self.refreshes,
+            'hit_rate': served / lookups if lookups else 0.0,
+            'executions_avoided': served + self.coalesced,
+            'saved_seconds': self.saved_seconds,
+        }
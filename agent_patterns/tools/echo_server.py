@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Local JSON-RPC 2.0 echo tool server, for tests and benchmarks.
+
+Speaks newline-delimited JSON-RPC over stdio (default) or a Unix socket, and
+implements the small protocol ``JsonRpcClient`` expects:
+
+- ``initialize`` -> {"name", "version", "capabilities"}
+- ``tools/list`` -> {"tools": [...]}, the tool descriptions
+- ``tools/call`` {"name", "arguments"} -> {"content": ...}
+- ``ping`` -> {}
+
+Tools: ``echo`` returns its text, ``reverse`` reverses it, and ``sleep``
+waits ``seconds`` before answering. Requests are handled concurrently, so
+responses can arrive out of order.
+
+    python -m agent_patterns.tools.echo_server
+    python -m agent_patterns.tools.echo_server --socket /tmp/echo.sock
+"""
+
+import sys
+import json
+import asyncio
+import argparse
+
+SERVER_NAME = 'echo-server'
+SERVER_VERSION = '1.0.0'
+
+TOOLS = [
+    {'name': 'echo', 'description': 'Return the input text unchanged',
+     'parameters': {'type': 'object', 'properties': {'text': {'type': 'string'}}, 'required': ['text']}},
+    {'name': 'reverse', 'description': 'Return the input text reversed',
+     'parameters': {'type': 'object', 'properties': {'text': {'type': 'string'}}, 'required': ['text']}},
+    {'name': 'sleep', 'description': 'Wait for the given number of seconds',
+     'parameters': {'type': 'object', 'properties': {'seconds': {'type': 'number', 'minimum': 0}},
+                    'required': ['seconds']}},
+]
+
+
+async def call_tool(name, arguments):
+    if name == 'echo':
+        return arguments['text']
+    if name == 'reverse':
+        return arguments['text'][::-1]
+    if name == 'sleep':
+        await asyncio.sleep(arguments['seconds'])
+        return arguments['seconds']
+    raise KeyError(name)
+
+
+async def handle(message):
+    """Return the response dict for one request."""
+    method, params, request_id = message.get('method'), message.get('params') or {}, message.get('id')
+    try:
+        if method == 'initialize':
+            result = {'name': SERVER_NAME, 'version': SERVER_VERSION, 'capabilities': {'tools': True}}
+        elif method == 'tools/list':
+            result = {'tools': TOOLS}
+        elif method == 'tools/call':
+            result = {'content': await call_tool(params['name'], params.get('arguments') or {})}
+        elif method == 'ping':
+            result = {}
+        else:
+            return {'jsonrpc': '2.0', 'id': request_id,
+                    'error': {'code': -32601, 'message': f"Method not found: {method}"}}
+    except (KeyError, TypeError) as error:
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32602, 'message': f"Invalid params: {error}"}}
+    return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+
+async def serve(reader, writer):
+    """Serve one connection until EOF, handling requests concurrently."""
+    pending = set()
+
+    async def respond(message):
+        response = await handle(message)
+        if response is not None and 'id' in message:
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        try:
+            message = json.loads(line)
+        except ValueError:
+            writer.write(b'{"jsonrpc": "2.0", "id": null, "error": {"code": -32700, "message": "Parse error"}}\n')
+            continue
+        task = asyncio.ensure_future(respond(message))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+    writer.close()
+
+
+async def serve_stdio():
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=2**24)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    await serve(reader, writer)
+
+
+async def serve_unix(path):
+    server = await asyncio.start_unix_server(serve, path=path, limit=2**24)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local JSON-RPC echo tool server')
+    parser.add_argument('--socket', help='Listen on this Unix socket path instead of stdio')
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_unix(args.socket) if args.socket else serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    main()
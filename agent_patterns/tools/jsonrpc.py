@@ -0,0 +1,310 @@
+"""
+Pooled JSON-RPC client for the Protocol-Based Tool Integration Pattern (Chapter 3).
+
+Tool servers that speak a standard protocol (JSON-RPC 2.0, newline-delimited,
+over a subprocess's stdio or a Unix socket) are cheap to call but expensive
+to start. Spawning a process, or even opening a connection, per call
+dominates latency for small tools. This module keeps servers alive:
+
+- ``JsonRpcClient`` is one long-lived connection. Each request gets an id
+  and a future, and a single reader task resolves futures as responses
+  arrive in any order, so many requests share the connection concurrently.
+  A malformed response line fails only the request whose id it carries
+  when that id is unambiguous. Otherwise the connection is dropped, failing
+  every request on it, and the pool replaces it.
+- ``ToolServerPool`` holds ``size`` clients created by a factory such as
+  ``stdio_factory(command)`` or ``unix_factory(path)``. It sends each call
+  to the least-loaded live client, replaces clients whose server died, and
+  pings clients that have been idle longer than ``health_interval`` in the
+  background.
+- ``CapabilityCache`` stores ``tools/list`` results keyed by server name and
+  version from ``initialize``. A restarted or additional server of the same
+  version does not repeat discovery, and the cache can persist to a JSON
+  file between runs.
+
+``agent_patterns.tools.echo_server`` is a local server for trying this out.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import itertools
+
+# A response's id can only be trusted if it comes before anything nested, that is
+# as the first member or right after "jsonrpc"; an "id" found later may belong to the result
+RESPONSE_ID = re.compile(rb'^\s*\{\s*(?:"jsonrpc"\s*:\s*"2\.0"\s*,\s*)?"id"\s*:\s*(\d+)\s*[,}]')
+
+
+class JsonRpcError(Exception):
+    """The server answered with a JSON-RPC error object."""
+
+    def __init__(self, code, message, data=None):
+        super().__init__(f"JSON-RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class ConnectionLost(ConnectionError):
+    """The server closed the connection or exited with requests outstanding."""
+
+
+class JsonRpcClient:
+    """One multiplexed JSON-RPC connection; `process` is the server subprocess, if any."""
+
+    def __init__(self, reader, writer, process=None):
+        self.reader = reader
+        self.writer = writer
+        self.process = process
+        self.server_info = None
+        self.last_used = time.monotonic()
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._closed = False
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    @property
+    def alive(self):
+        return not self._closed
+
+    @property
+    def in_flight(self):
+        return len(self._pending)
+
+    async def _read_loop(self):
+        error = ConnectionLost('Server closed the connection')
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    if not self._fail_malformed(line):
+                        raise ConnectionLost('Malformed response with no attributable id') from None
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                future = self._pending.pop(message.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    e = message['error']
+                    future.set_exception(JsonRpcError(e.get('code'), e.get('message'), e.get('data')))
+                else:
+                    future.set_result(message.get('result'))
+        except Exception as exc:
+            error = ConnectionLost(f"Connection failed: {exc!r}")
+        finally:
+            self._closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    def _fail_malformed(self, line):
+        """Fail the one request a malformed response line belongs to; False if that is unknown."""
+        match = RESPONSE_ID.match(line)
+        if match is None:
+            return False
+        future = self._pending.pop(int(match.group(1)), None)
+        if future is not None and not future.done():
+            future.set_exception(JsonRpcError(-32700, 'Malformed response from server',
+                                              line[:200].decode('utf-8', errors='replace')))
+        return True
+
+    async def request(self, method, params=None, timeout=None):
+        """Send one request and wait for its response."""
+        if self._closed:
+            raise ConnectionLost('Connection is closed')
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.last_used = time.monotonic()
+        message = {'jsonrpc': '2.0', 'id': request_id, 'method': method}
+        if params is not None:
+            message['params'] = params
+
+        async def send_and_wait():
+            # Waiting for the write buffer to drain lets a slow server apply backpressure
+            try:
+                await self.writer.drain()
+            except ConnectionError as exc:
+                raise ConnectionLost(f"Connection failed: {exc!r}") from exc
+            return await future
+
+        try:
+            self.writer.write(json.dumps(message).encode('utf-8') + b'\n')
+            if timeout is None:
+                return await send_and_wait()
+            return await asyncio.wait_for(send_and_wait(), timeout)
+        finally:
+            self._pending.pop(request_id, None)
+            self.last_used = time.monotonic()
+
+    async def initialize(self):
+        self.server_info = await self.request('initialize', {'client': 'agent_patterns'})
+        return self.server_info
+
+    async def close(self):
+        self._closed = True
+        if not self.writer.is_closing():
+            self.writer.close()
+        if self.process is not None:
+            try:
+                await asyncio.wait_for(self.process.wait(), 1.0)
+            except asyncio.TimeoutError:
+                try:
+                    self.process.kill()
+                except ProcessLookupError:
+                    # It exited between the timeout and the kill
+                    pass
+                await self.process.wait()
+        self._reader_task.cancel()
+        await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+def stdio_factory(command, limit=2**24):
+    """Factory starting `command` (a list) as a subprocess and talking JSON-RPC over its stdio."""
+    async def connect():
+        process = await asyncio.create_subprocess_exec(
+            *command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=limit)
+        return JsonRpcClient(process.stdout, process.stdin, process)
+    return connect
+
+
+def unix_factory(path, limit=2**24):
+    """Factory opening a connection to a JSON-RPC server listening on a Unix socket."""
+    async def connect():
+        reader, writer = await asyncio.open_unix_connection(path, limit=limit)
+        return JsonRpcClient(reader, writer)
+    return connect
+
+
+def echo_server_command():
+    """Command line for the bundled local echo server."""
+    return [sys.executable, '-m', 'agent_patterns.tools.echo_server']
+
+
+class CapabilityCache:
+    """tools/list results keyed by (server name, version), optionally persisted to JSON."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def _key(server_info):
+        return f"{server_info.get('name')}@{server_info.get('version')}"
+
+    async def tools(self, client):
+        """Capabilities for the client's server version, discovering them only on first sight."""
+        key = self._key(client.server_info or await client.initialize())
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        tools = (await client.request('tools/list'))['tools']
+        self._entries[key] = tools
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+        return tools
+
+
+class ToolServerPool:
+    """A pool of long-lived tool-server connections with health checks."""
+
+    def __init__(self, factory, size=4, health_interval=30.0, ping_timeout=2.0, capability_cache=None):
+        self.factory = factory
+        self.size = size
+        self.health_interval = health_interval
+        self.ping_timeout = ping_timeout
+        self.capabilities = capability_cache or CapabilityCache()
+        self.clients = []
+        self.replaced = 0
+        self.health_error = None
+        self._health_task = None
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _spawn(self):
+        client = await self.factory()
+        await client.initialize()
+        return client
+
+    async def start(self):
+        spawned = await asyncio.gather(*(self._spawn() for _ in range(self.size)), return_exceptions=True)
+        errors = [c for c in spawned if isinstance(c, BaseException)]
+        if errors:
+            # Don't leak the servers that did start
+            await asyncio.gather(*(c.close() for c in spawned if not isinstance(c, BaseException)))
+            raise errors[0]
+        self.clients = spawned
+        if self.health_interval:
+            self._health_task = asyncio.ensure_future(self._health_loop())
+
+    async def _replace(self, client):
+        async with self._lock:
+            if client not in self.clients:
+                return
+            await client.close()
+            self.clients[self.clients.index(client)] = await self._spawn()
+            self.replaced += 1
+
+    async def _acquire(self):
+        for client in [c for c in self.clients if not c.alive]:
+            await self._replace(client)
+        return min(self.clients, key=lambda c: c.in_flight)
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            now = time.monotonic()
+            for client in list(self.clients):
+                try:
+                    if not client.alive:
+                        await self._replace(client)
+                    elif client.in_flight == 0 and now - client.last_used >= self.health_interval:
+                        try:
+                            await client.request('ping', timeout=self.ping_timeout)
+                        except Exception:
+                            await self._replace(client)
+                except Exception as e:
+                    # A failed respawn must not end health checking; the dead
+                    # client stays in place and is retried next round or on use
+                    self.health_error = e
+
+    async def list_tools(self):
+        return await self.capabilities.tools(await self._acquire())
+
+    async def call(self, name, arguments, timeout=None):
+        """Call a tool on the least-loaded server and return its content."""
+        client = await self._acquire()
+        result = await client.request('tools/call', {'name': name, 'arguments': arguments}, timeout=timeout)
+        return result['content']
+
+    async def close(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+        await asyncio.gather(*(client.close() for client in self.clients))
+        self.clients = []
@@ -0,0 +1,286 @@
+"""
+Per-tool execution policies (Chapter 3, "Timeout management"; Chapter 6 reliability).
+
+A slow or failing tool should cost an agent turn a bounded amount of time,
+not set its tail latency. ``PolicyExecutor`` wraps a ``ToolRegistry`` and
+applies, per tool, any combination of:
+
+- deadline propagation: ``deadline(seconds)`` opens a scope in a context
+  variable; every call inside it, including nested tool calls, gets at most
+  the time remaining, on top of the tool's own ``timeout``
+- retries with exponential backoff and full jitter, never sleeping past the
+  deadline
+- hedged requests: if an attempt has not finished after the tool's observed
+  p95 latency, a second identical attempt is started and the first to
+  succeed wins (only for idempotent tools)
+- a circuit breaker that opens after consecutive failures, fails fast with
+  ``CircuitOpenError`` while open, and lets a trial call through after
+  ``reset_timeout`` seconds (half-open)
+
+Attempts are ordered as: breaker check, then retry loop, then each attempt
+hedged and bounded by min(timeout, remaining deadline).
+"""
+
+import time
+import random
+import asyncio
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+_deadline = contextvars.ContextVar('tool_deadline', default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The propagated deadline passed before the tool call completed."""
+
+
+class CircuitOpenError(Exception):
+    """The tool's circuit breaker is open; the call was not attempted."""
+
+
+@contextmanager
+def deadline(seconds):
+    """Limit every policy-wrapped call in this scope to finish within `seconds` from now."""
+    absolute = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(absolute if current is None else min(current, absolute))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Seconds left before the innermost deadline, or None if there is none."""
+    absolute = _deadline.get()
+    return None if absolute is None else absolute - time.monotonic()
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: sleep uniform(0, min(max_delay, base * 2**attempt))."""
+
+    def __init__(self, max_attempts=3, base_delay=0.05, max_delay=1.0, retry_on=(Exception,), seed=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self._rng = random.Random(seed)
+
+    def delay(self, attempt):
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class LatencyTracker:
+    """Sliding window of recent attempt latencies with a cached quantile."""
+
+    def __init__(self, window=512, refresh_every=32):
+        self.samples = deque(maxlen=window)
+        self.refresh_every = refresh_every
+        self._since_refresh = 0
+        self._cache = {}
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self._since_refresh += 1
+        if self._since_refresh >= self.refresh_every:
+            self._cache.clear()
+            self._since_refresh = 0
+
+    def quantile(self, q):
+        if q not in self._cache:
+            self._cache[q] = float(np.quantile(self.samples, q)) if self.samples else None
+        return self._cache[q]
+
+
+class HedgePolicy:
+    """Start a backup attempt once the primary exceeds the `quantile` latency."""
+
+    def __init__(self, quantile=0.95, min_samples=20, max_hedges=1, min_delay=0.0):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.min_delay = min_delay
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures -> half-open after `reset_timeout`."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=5.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def allow(self):
+        """Whether a call may proceed now; transitions open -> half-open when due."""
+        if self.state == 'closed':
+            return True
+        if self.state == 'open' and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = 'half_open'
+            self._trial_in_flight = False
+        if self.state == 'half_open' and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.state = 'closed'
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            self.state = 'open'
+            self.opened_at = self.clock()
+            self._trial_in_flight = False
+
+    def release(self):
+        """Give back a half-open trial whose call was abandoned without an outcome."""
+        self._trial_in_flight = False
+
+
+class ExecutionPolicy:
+    """Timeout, retry, hedging and circuit-breaker settings for one tool; any may be None."""
+
+    def __init__(self, timeout=None, retry=None, hedge=None, breaker=None):
+        self.timeout = timeout
+        self.retry = retry
+        self.hedge = hedge
+        self.breaker = breaker
+        self.latency = LatencyTracker()
+
+
+class PolicyExecutor:
+    """Applies per-tool ExecutionPolicy objects to ToolRegistry calls."""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.policies = {}
+        self.hedges_started = 0
+        self.hedges_won = 0
+
+    def configure(self, tool_name, timeout=None, retry=None, hedge=None, breaker=None):
+        if tool_name not in self.registry:
+            raise ValueError(f"Unknown tool {tool_name!r}")
+        policy = ExecutionPolicy(timeout, retry, hedge, breaker)
+        self.policies[tool_name] = policy
+        return policy
+
+    @staticmethod
+    def _budget(policy):
+        left = remaining()
+        if left is not None and left <= 0:
+            raise DeadlineExceeded('Deadline passed before the call started')
+        if policy.timeout is None:
+            return left
+        return policy.timeout if left is None else min(policy.timeout, left)
+
+    async def _attempt(self, tool, arguments, policy):
+        start = time.monotonic()
+        try:
+            result = tool.function(**arguments)
+            if tool.is_async:
+                result = await result
+        except asyncio.CancelledError:
+            # A timed-out or losing attempt took at least this long; dropping it
+            # would bias the hedge quantile towards the fast calls
+            policy.latency.record(time.monotonic() - start)
+            raise
+        policy.latency.record(time.monotonic() - start)
+        return result
+
+    async def _hedged(self, tool, arguments, policy):
+        hedge = policy.hedge
+        delay = None
+        if hedge is not None and len(policy.latency.samples) >= hedge.min_samples:
+            delay = max(hedge.min_delay, policy.latency.quantile(hedge.quantile))
+        if delay is None:
+            return await self._attempt(tool, arguments, policy)
+
+        primary = asyncio.ensure_future(self._attempt(tool, arguments, policy))
+        attempts = [primary]
+        hedges = 0
+        try:
+            while True:
+                done, _ = await asyncio.wait(attempts, timeout=delay if hedges < hedge.max_hedges else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedges_won += 1
+                        return task.result()
+                    attempts.remove(task)
+                    if not attempts:
+                        raise task.exception()
+                if not done:
+                    hedges += 1
+                    self.hedges_started += 1
+                    attempts.append(asyncio.ensure_future(self._attempt(tool, arguments, policy)))
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def _bounded(self, tool, arguments, policy):
+        budget = self._budget(policy)
+        if budget is None:
+            return await self._hedged(tool, arguments, policy)
+        try:
+            return await asyncio.wait_for(self._hedged(tool, arguments, policy), budget)
+        except asyncio.TimeoutError:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(f"Tool {tool.name!r} exceeded the propagated deadline") from None
+            raise
+
+    async def invoke(self, name, arguments):
+        """Validated tool call under the tool's execution policy."""
+        tool = self.registry.get(name)
+        arguments = tool.validate(arguments)
+        policy = self.policies.get(name)
+        if policy is None:
+            # Arguments are already validated; registry.invoke would check them again
+            result = tool.function(**arguments)
+            if tool.is_async:
+                result = await result
+            return result
+
+        breaker, retry = policy.breaker, policy.retry
+        attempts = retry.max_attempts if retry else 1
+        for attempt in range(attempts):
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError(f"Circuit for tool {name!r} is open")
+            try:
+                result = await self._bounded(tool, arguments, policy)
+            except DeadlineExceeded:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except Exception as error:
+                if breaker is not None:
+                    breaker.record_failure()
+                if retry is None or attempt == attempts - 1 or not isinstance(error, retry.retry_on):
+                    raise
+                pause = retry.delay(attempt)
+                left = remaining()
+                if left is not None and pause >= left:
+                    raise
+                await asyncio.sleep(pause)
+            except BaseException:
+                # Cancelled by the caller: no verdict on the tool, but a half-open
+                # trial must not stay claimed or the breaker rejects every call
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return result
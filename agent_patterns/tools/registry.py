@@ -0,0 +1,326 @@
+"""
+Function Calling Pattern with precompiled parameter validation (Chapter 3).
+
+Tools are registered with a JSON-schema style parameter spec, the same shape
+function-calling LLM APIs use:
+
+    registry.register('get_weather', get_weather, {
+        'type': 'object',
+        'properties': {
+            'location': {'type': 'string', 'minLength': 1},
+            'units': {'enum': ['metric', 'imperial'], 'default': 'metric'},
+        },
+        'required': ['location'],
+        'additionalProperties': False,
+    })
+
+Interpreting such a spec on every call means walking nested dicts and
+branching on keywords. It is a visible share of per-call overhead for cheap
+tools. ``ToolRegistry.register`` instead compiles the spec once into the
+source of a straight-line Python function that checks exactly what the spec
+requires and nothing else. Constants such as enum sets and compiled regexes
+are bound as globals. Dispatch is a dict lookup, that validator and the call
+itself, with no per-call reflection.
+
+Supported keywords: type (string, integer, number, boolean, array, object,
+null, or a list of these), enum, const, minimum, maximum, exclusiveMinimum,
+exclusiveMaximum, minLength, maxLength, pattern, items, minItems, maxItems,
+properties, required and additionalProperties (boolean or a schema).
+Top-level ``default`` values are filled in for missing arguments.
+"""
+
+import re
+import math
+import inspect
+
+ANNOTATION_KEYWORDS = {'description', 'title', 'examples', 'default', '$comment'}
+
+TYPE_CHECKS = {
+    'string': 'isinstance({v}, str)',
+    'integer': '(isinstance({v}, int) and {v}.__class__ is not bool)',
+    'number': '(isinstance({v}, (int, float)) and {v}.__class__ is not bool)',
+    'boolean': '{v}.__class__ is bool',
+    'array': 'isinstance({v}, (list, tuple))',
+    'object': 'isinstance({v}, dict)',
+    'null': '{v} is None',
+}
+
+SUPPORTED_KEYWORDS = ANNOTATION_KEYWORDS | {
+    'type', 'enum', 'const', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum',
+    'minLength', 'maxLength', 'pattern', 'items', 'minItems', 'maxItems',
+    'properties', 'required', 'additionalProperties',
+}
+
+
+class ToolValidationError(ValueError):
+    """Arguments did not match a tool's parameter spec."""
+
+    def __init__(self, tool, path, message):
+        super().__init__(f"Invalid arguments for tool {tool!r} at {path}: {message}")
+        self.tool = tool
+        self.path = path
+        self.message = message
+
+
+class _ValidatorCompiler:
+    """Emits Python source for one parameter spec."""
+
+    def __init__(self, tool_name):
+        self.tool_name = tool_name
+        self.lines = []
+        self.constants = {}
+        self._names = 0
+
+    def name(self, prefix):
+        self._names += 1
+        return f"{prefix}{self._names}"
+
+    def constant(self, value):
+        name = self.name('_c')
+        self.constants[name] = value
+        return name
+
+    def emit(self, indent, line):
+        self.lines.append('    ' * indent + line)
+
+    def fail(self, indent, path, message):
+        # `path` is a Python expression, only evaluated when validation fails
+        self.emit(indent, f"raise _error({path}, {message!r})")
+
+    def count(self, schema, keyword):
+        """A length or item-count bound, checked before it is written into the source."""
+        value = schema[keyword]
+        if value.__class__ is not int or value < 0:
+            raise ValueError(f"Tool {self.tool_name!r}: {keyword} must be a non-negative integer, got {value!r}")
+        return value
+
+    def bound(self, schema, keyword):
+        """A numeric bound, checked so a schema that could fail at call time is rejected now."""
+        value = schema[keyword]
+        if value.__class__ not in (int, float) or not math.isfinite(value):
+            raise ValueError(f"Tool {self.tool_name!r}: {keyword} must be a finite number, got {value!r}")
+        return value
+
+    def node(self, schema, var, path, indent):
+        unknown = set(schema) - SUPPORTED_KEYWORDS
+        if unknown:
+            raise ValueError(f"Tool {self.tool_name!r}: unsupported schema keywords {sorted(unknown)}")
+
+        types = schema.get('type')
+        if types is not None:
+            types = [types] if isinstance(types, str) else list(types)
+            for t in types:
+                if t not in TYPE_CHECKS:
+                    raise ValueError(f"Tool {self.tool_name!r}: unknown type {t!r}")
+            check = ' or '.join(TYPE_CHECKS[t].format(v=var) for t in types)
+            self.emit(indent, f"if not ({check}):")
+            self.fail(indent + 1, path, f"expected {' or '.join(types)}")
+
+        if 'const' in schema:
+            self.emit(indent, f"if {var} != {self.constant(schema['const'])}:")
+            self.fail(indent + 1, path, f"expected {schema['const']!r}")
+        if 'enum' in schema:
+            values = list(schema['enum'])
+            try:
+                allowed = self.constant(frozenset(values))
+            except TypeError:
+                self.emit(indent, f"if {var} not in {self.constant(tuple(values))}:")
+            else:
+                # A list or dict argument cannot be looked up in a frozenset
+                found = self.name('found')
+                self.emit(indent, 'try:')
+                self.emit(indent + 1, f"{found} = {var} in {allowed}")
+                self.emit(indent, 'except TypeError:')
+                self.emit(indent + 1, f"{found} = False")
+                self.emit(indent, f"if not {found}:")
+            self.fail(indent + 1, path, f"expected one of {values!r}")
+
+        numeric = '(isinstance({v}, (int, float)) and {v}.__class__ is not bool)'.format(v=var)
+        for keyword, op in (('minimum', '<'), ('maximum', '>'),
+                            ('exclusiveMinimum', '<='), ('exclusiveMaximum', '>=')):
+            if keyword in schema:
+                bound = self.bound(schema, keyword)
+                guard = '' if types == ['integer'] or types == ['number'] else f"{numeric} and "
+                self.emit(indent, f"if {guard}{var} {op} {self.constant(bound)}:")
+                self.fail(indent + 1, path, f"{keyword} is {bound!r}")
+
+        string = f"isinstance({var}, str) and " if types != ['string'] else ''
+        if 'minLength' in schema:
+            limit = self.count(schema, 'minLength')
+            self.emit(indent, f"if {string}len({var}) < {limit!r}:")
+            self.fail(indent + 1, path, f"shorter than {limit} characters")
+        if 'maxLength' in schema:
+            limit = self.count(schema, 'maxLength')
+            self.emit(indent, f"if {string}len({var}) > {limit!r}:")
+            self.fail(indent + 1, path, f"longer than {limit} characters")
+        if 'pattern' in schema:
+            regex = self.constant(re.compile(schema['pattern']))
+            self.emit(indent, f"if {string}{regex}.search({var}) is None:")
+            self.fail(indent + 1, path, f"does not match {schema['pattern']!r}")
+
+        if {'items', 'minItems', 'maxItems'} & set(schema):
+            self.array(schema, var, path, indent, guard=types != ['array'])
+        if {'properties', 'required', 'additionalProperties'} & set(schema):
+            self.object(schema, var, path, indent, guard=types != ['object'])
+
+    def array(self, schema, var, path, indent, guard):
+        if guard:
+            self.emit(indent, f"if isinstance({var}, (list, tuple)):")
+            indent += 1
+        if 'minItems' in schema:
+            limit = self.count(schema, 'minItems')
+            self.emit(indent, f"if len({var}) < {limit!r}:")
+            self.fail(indent + 1, path, f"fewer than {limit} items")
+        if 'maxItems' in schema:
+            limit = self.count(schema, 'maxItems')
+            self.emit(indent, f"if len({var}) > {limit!r}:")
+            self.fail(indent + 1, path, f"more than {limit} items")
+        if 'items' in schema:
+            index, item = self.name('i'), self.name('item')
+            self.emit(indent, f"for {index}, {item} in enumerate({var}):")
+            self.node(schema['items'], item, f"{path} + '[' + str({index}) + ']'", indent + 1)
+            if self.lines[-1].endswith(':'):
+                self.emit(indent + 1, 'pass')
+        if guard and self.lines[-1].endswith(':'):
+            self.emit(indent, 'pass')
+
+    def object(self, schema, var, path, indent, guard):
+        if guard:
+            self.emit(indent, f"if isinstance({var}, dict):")
+            indent += 1
+        properties = schema.get('properties', {})
+        for key in schema.get('required', ()):
+            self.emit(indent, f"if {key!r} not in {var}:")
+            self.fail(indent + 1, path, f"missing required property {key!r}")
+
+        extra = schema.get('additionalProperties', True)
+        if extra is not True:
+            known = self.constant(frozenset(properties))
+            if extra is False:
+                self.emit(indent, f"if not {known}.issuperset({var}):")
+                self.fail(indent + 1, path,
+                          f"unexpected properties; allowed are {sorted(properties)}")
+            else:
+                key, value = self.name('k'), self.name('v')
+                self.emit(indent, f"for {key}, {value} in {var}.items():")
+                self.emit(indent + 1, f"if {key} not in {known}:")
+                self.node(extra, value, f"{path} + '.' + str({key})", indent + 2)
+                if self.lines[-1].endswith(':'):
+                    self.emit(indent + 2, 'pass')
+
+        for key, subschema in properties.items():
+            value = self.name('v')
+            start = len(self.lines)
+            self.emit(indent, f"if {key!r} in {var}:")
+            self.emit(indent + 1, f"{value} = {var}[{key!r}]")
+            self.node(subschema, value, f"{path} + {'.' + key!r}", indent + 1)
+            if len(self.lines) == start + 2:
+                # Property with no constraints: drop the lookup entirely
+                del self.lines[start:]
+        if guard and self.lines[-1].endswith(':'):
+            self.emit(indent, 'pass')
+
+    def compile(self, schema):
+        if schema.get('type', 'object') != 'object':
+            raise ValueError(f"Tool {self.tool_name!r}: parameters must be an object schema")
+        defaults = {key: sub['default'] for key, sub in schema.get('properties', {}).items()
+                    if 'default' in sub}
+
+        self.emit(0, 'def validate(args):')
+        self.emit(1, 'if not isinstance(args, dict):')
+        self.fail(2, "'$'", 'arguments must be an object')
+        if defaults:
+            # Copy so the caller's dict is never mutated, then fill in missing defaults
+            self.emit(1, f"args = {{**{self.constant(defaults)}, **args}}")
+        self.object(dict(schema, type='object'), 'args', "'$'", 1, guard=False)
+        self.emit(1, 'return args')
+
+        source = '\n'.join(self.lines)
+        tool = self.tool_name
+
+        def error(path, message):
+            return ToolValidationError(tool, path, message)
+
+        namespace = dict(self.constants, _error=error)
+        exec(compile(source, f"<validator {tool}>", 'exec'), namespace)
+        return namespace['validate'], source
+
+
+def compile_validator(tool_name, parameters):
+    """Compile a parameter spec into (validate(args) -> args, generated source)."""
+    return _ValidatorCompiler(tool_name).compile(parameters)
+
+
+class Tool:
+    """A registered tool: the callable, its description and its compiled validator."""
+
+    __slots__ = ('name', 'function', 'description', 'parameters', 'validate', 'validator_source', 'is_async')
+
+    def __init__(self, name, function, parameters=None, description=''):
+        self.name = name
+        self.function = function
+        self.description = description or (inspect.getdoc(function) or '').split('\n')[0]
+        self.parameters = parameters or {'type': 'object', 'properties': {}}
+        self.validate, self.validator_source = compile_validator(name, self.parameters)
+        self.is_async = inspect.iscoroutinefunction(function)
+
+    def describe(self):
+        """Tool description in the shape function-calling APIs expect."""
+        return {'name': self.name, 'description': self.description, 'parameters': self.parameters}
+
+
+class ToolRegistry:
+    """Registry of tools with O(1) lookup and validated dispatch."""
+
+    def __init__(self):
+        self._tools = {}
+
+    def __len__(self):
+        return len(self._tools)
+
+    def __contains__(self, name):
+        return name in self._tools
+
+    def register(self, name, function, parameters=None, description=''):
+        """Register a tool, compiling its parameter spec; returns the Tool."""
+        if name in self._tools:
+            raise ValueError(f"Tool {name!r} is already registered")
+        tool = Tool(name, function, parameters, description)
+        self._tools[name] = tool
+        return tool
+
+    def tool(self, name=None, parameters=None, description=''):
+        """Decorator form of register()."""
+        def decorator(function):
+            self.register(name or function.__name__, function, parameters, description)
+            return function
+        return decorator
+
+    def unregister(self, name):
+        del self._tools[name]
+
+    def get(self, name):
+        try:
+            return self._tools[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool {name!r}") from None
+
+    def describe(self):
+        """Descriptions of all tools, for inclusion in a function-calling prompt."""
+        return [tool.describe() for tool in self._tools.values()]
+
+    def call(self, name, arguments):
+        """Validate arguments and call the tool; async tools return an awaitable."""
+        try:
+            tool = self._tools[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool {name!r}") from None
+        return tool.function(**tool.validate(arguments))
+
+    async def invoke(self, name, arguments):
+        """Validate arguments and call the tool, awaiting it if it is async."""
+        tool = self.get(name)
+        result = tool.function(**tool.validate(arguments))
+        if tool.is_async:
+            result = await result
+        return result
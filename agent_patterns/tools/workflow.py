@@ -0,0 +1,200 @@
+"""
+Tool Composition Pattern with streaming steps (Chapter 3).
+
+A ``Workflow`` is an ordered list of ``WorkflowStep`` objects, each feeding
+its output to the next, such as extract text, then summarize, then translate.
+Passing whole results between steps means every intermediate is held in
+memory in full and step 2 cannot start until step 1 is done. In this
+``WorkflowEngine`` a step may instead consume and produce async iterators of
+chunks:
+
+- a streaming step is an async generator function ``f(chunks)`` that reads an
+  async iterator and yields output chunks as soon as it has them
+- a batch step is a plain (async) function ``f(list_of_chunks)`` that returns
+  a single result; in a streaming run it collects its input first
+
+In ``stream`` mode each step runs as its own task, connected to the next by a
+bounded ``asyncio.Queue`` of ``buffer_size`` chunks. Steps therefore work on
+different chunks at the same time (pipeline parallelism), and a fast
+producer blocks when its consumer falls behind (backpressure), which bounds
+memory to roughly ``buffer_size`` chunks per step. ``batch`` mode runs the
+steps one after another on fully materialized lists, as the chapter's engine
+does. If a step fails, every other step is cancelled and the ``ToolResult``
+reports which step failed.
+"""
+
+import time
+import asyncio
+import inspect
+
+_END = object()
+
+
+class ToolResult:
+    """Outcome of a tool or workflow run."""
+
+    __slots__ = ('success', 'data', 'error', 'metadata')
+
+    def __init__(self, success, data=None, error=None, metadata=None):
+        self.success = success
+        self.data = data
+        self.error = error
+        self.metadata = metadata or {}
+
+    def __repr__(self):
+        if self.success:
+            return f"ToolResult(success=True, metadata={self.metadata!r})"
+        return f"ToolResult(success=False, error={self.error!r})"
+
+
+class StepFailed(Exception):
+    """A workflow step raised; carries the step name."""
+
+    def __init__(self, step, error):
+        super().__init__(f"Step {step!r} failed: {error!r}")
+        self.step = step
+        self.error = error
+
+
+class _Failure:
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class WorkflowStep:
+    """One step: an async generator over chunks (streaming) or a function of all chunks (batch)."""
+
+    def __init__(self, name, function):
+        self.name = name
+        self.function = function
+        self.streaming = inspect.isasyncgenfunction(function)
+
+    @classmethod
+    def map(cls, name, function):
+        """Streaming step applying `function(chunk)` (sync or async) to each chunk in order."""
+        is_async = inspect.iscoroutinefunction(function)
+
+        async def mapped(chunks):
+            async for chunk in chunks:
+                result = function(chunk)
+                yield (await result) if is_async else result
+
+        return cls(name, mapped)
+
+    async def _call_batch(self, chunks):
+        result = self.function(chunks)
+        return (await result) if inspect.isawaitable(result) else result
+
+    async def process(self, chunks):
+        """Async iterator of this step's output for an async iterator of input chunks."""
+        if self.streaming:
+            async for chunk in self.function(chunks):
+                yield chunk
+        else:
+            yield await self._call_batch([chunk async for chunk in chunks])
+
+
+class Workflow:
+    """A named linear sequence of steps."""
+
+    def __init__(self, name, steps):
+        if not steps:
+            raise ValueError(f"Workflow {name!r} has no steps")
+        self.name = name
+        self.steps = list(steps)
+
+
+async def _iterate(source):
+    if hasattr(source, '__aiter__'):
+        async for chunk in source:
+            yield chunk
+    else:
+        for chunk in source:
+            yield chunk
+
+
+async def _drain(queue):
+    while True:
+        item = await queue.get()
+        if item is _END:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+class WorkflowEngine:
+    """Runs workflows either as a streaming pipeline or step by step in batch."""
+
+    def __init__(self, buffer_size=4):
+        self.buffer_size = buffer_size
+
+    async def _pump(self, name, chunks, outbox):
+        try:
+            async for chunk in chunks:
+                await outbox.put(chunk)
+        except StepFailed as error:
+            await outbox.put(_Failure(error))
+        except Exception as error:
+            await outbox.put(_Failure(StepFailed(name, error)))
+        else:
+            await outbox.put(_END)
+
+    async def stream(self, workflow, source):
+        """Yield the last step's output chunks as they are produced; raises StepFailed."""
+        queues = [asyncio.Queue(maxsize=self.buffer_size) for _ in range(len(workflow.steps) + 1)]
+        tasks = [asyncio.ensure_future(self._pump('source', _iterate(source), queues[0]))]
+        for i, step in enumerate(workflow.steps):
+            tasks.append(asyncio.ensure_future(self._pump(step.name, step.process(_drain(queues[i])),
+                                                          queues[i + 1])))
+        try:
+            async for chunk in _drain(queues[-1]):
+                yield chunk
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _batch(self, workflow, source):
+        data = [chunk async for chunk in _iterate(source)]
+        for step in workflow.steps:
+            try:
+                if step.streaming:
+                    data = [chunk async for chunk in step.function(_iterate(data))]
+                else:
+                    data = [await step._call_batch(data)]
+            except Exception as error:
+                raise StepFailed(step.name, error) from error
+        for chunk in data:
+            yield chunk
+
+    async def run(self, workflow, source, mode='stream', on_output=None):
+        """Run a workflow to completion and return a ToolResult with the output chunks.
+
+        ``on_output(chunk)`` is called for each output chunk as it becomes
+        available. Metadata records total and time-to-first-output seconds.
+        """
+        if mode not in ('stream', 'batch'):
+            raise ValueError(f"Unknown workflow mode {mode!r}; expected 'stream' or 'batch'")
+        chunks = self.stream(workflow, source) if mode == 'stream' else self._batch(workflow, source)
+        start = time.perf_counter()
+        first_output = None
+        output = []
+        try:
+            async for chunk in chunks:
+                if first_output is None:
+                    first_output = time.perf_counter() - start
+                output.append(chunk)
+                if on_output is not None:
+                    on_output(chunk)
+        except StepFailed as error:
+            return ToolResult(False, output, error=str(error),
+                              metadata={'workflow': workflow.name, 'failed_step': error.step})
+        return ToolResult(True, output, metadata={
+            'workflow': workflow.name,
+            'mode': mode,
+            'seconds': time.perf_counter() - start,
+            'first_output_seconds': first_output,
+        })
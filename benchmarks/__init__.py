@@ -0,0 +1 @@
+"""Benchmarks for the agent_patterns reference implementations."""
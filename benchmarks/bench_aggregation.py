@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare streaming aggregation with wait-for-all aggregation.
+
+A flat fan-out of stub workers with long-tailed latency is run through the
+Orchestrator. For each merge strategy the benchmark reports when the first
+partial result was available, when the partial value first matched the
+final answer (it stays stable from then on for vote and often for rank
+fusion), and when the final result was ready. Wait-for-all aggregation
+cannot produce anything before the slowest worker finishes.
+
+    python -m benchmarks.bench_aggregation --workers 16 --tail 0.5
+"""
+
+import time
+import random
+import asyncio
+import argparse
+
+from agent_patterns.multi_agent import Orchestrator, Subtask, aggregate
+
+ANSWERS = ['A', 'B', 'C', 'D']
+
+
+def make_worker(args):
+    rng = random.Random(args.seed)
+    delays = {}
+
+    async def worker(subtask, inputs):
+        # Pareto-tailed latency: most workers are quick, a few are very slow
+        delay = delays.setdefault(subtask.name, args.latency * rng.paretovariate(1.0 / args.tail))
+        await asyncio.sleep(delay)
+        index = int(subtask.name.split('-')[1])
+        if args.strategy == 'vote':
+            # Most workers agree on 'A', the rest are spread over other answers
+            return 'A' if rng.random() < args.agreement else rng.choice(ANSWERS[1:])
+        items = [f"doc-{(index + j) % 20}" for j in range(5)]
+        return sorted(items, key=lambda item: rng.random() + int(item.split('-')[1]) * 0.05)
+
+    return worker
+
+
+async def run_streaming(args):
+    orchestrator = Orchestrator({'agent': make_worker(args)}, max_concurrency=args.workers)
+    subtasks = [Subtask(f"worker-{i}", 'agent') for i in range(args.workers)]
+    start = time.perf_counter()
+    timeline = []
+    async for partial in aggregate(orchestrator.stream(subtasks), args.strategy, expected=args.workers):
+        timeline.append((time.perf_counter() - start, partial.value))
+    final = timeline[-1][1]
+    # Earliest time after which every partial value already equals the final one
+    stable = timeline[-1][0]
+    for elapsed, value in reversed(timeline):
+        if value != final:
+            break
+        stable = elapsed
+    return timeline[0][0], stable, timeline[-1][0], final
+
+
+async def run_wait_all(args):
+    orchestrator = Orchestrator({'agent': make_worker(args)}, max_concurrency=args.workers)
+    subtasks = [Subtask(f"worker-{i}", 'agent') for i in range(args.workers)]
+    start = time.perf_counter()
+    results = await orchestrator.run(subtasks)
+
+    async def replay():
+        for item in results.items():
+            yield item
+
+    async for partial in aggregate(replay(), args.strategy):
+        final = partial.value
+    return time.perf_counter() - start, final
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming versus wait-for-all aggregation')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.05, help='Minimum worker latency in seconds')
+    parser.add_argument('--tail', type=float, default=0.5, help='Pareto tail index inverse; larger is heavier')
+    parser.add_argument('--agreement', type=float, default=0.7, help='Fraction of voters answering A')
+    parser.add_argument('--strategies', nargs='+', default=['concat', 'vote', 'rank-fuse'])
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    print(f"{args.workers} workers, min latency {args.latency * 1000:.0f} ms")
+    for strategy in args.strategies:
+        args.strategy = strategy
+        first, stable, last, _ = asyncio.run(run_streaming(args))
+        wait_all, _ = asyncio.run(run_wait_all(args))
+        print(f"{strategy:<10} streaming: first output {first * 1000:7.1f} ms  final value reached "
+              f"{stable * 1000:7.1f} ms  done {last * 1000:7.1f} ms | wait-for-all first output "
+              f"{wait_all * 1000:7.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
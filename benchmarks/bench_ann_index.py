@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the IVF approximate index against exact brute-force search.
+
+Embeddings are drawn from a Gaussian mixture so that, like real text
+embeddings, they have cluster structure. For each ``n_probe`` setting the
+benchmark reports recall@k against exact search and mean per-query latency.
+
+    python -m benchmarks.bench_ann_index --size 1000000 --n-lists 1024
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from agent_patterns.memory import VectorStore, IVFIndex
+
+
+def clustered_embeddings(rng, size, dim, n_topics, spread):
+    """Sample embeddings around n_topics random topic directions."""
+    topics = rng.standard_normal((n_topics, dim), dtype=np.float32)
+    labels = rng.integers(0, n_topics, size)
+    return topics[labels] + spread * rng.standard_normal((size, dim), dtype=np.float32)
+
+
+def recall_at_k(approximate, exact):
+    hits = sum(len(set(a) & set(e)) for a, e in zip(approximate, exact))
+    return hits / exact.size
+
+
+def per_query_ms(search, queries):
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark IVF recall/latency against exact search')
+    parser.add_argument('--size', type=int, default=200_000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--n-lists', type=int, default=512)
+    parser.add_argument('--n-probe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--topics', type=int, default=2000, help='Mixture components in the synthetic data')
+    parser.add_argument('--spread', type=float, default=1.0, help='Noise scale around each topic direction')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--chunk', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    exact = VectorStore(args.dim, capacity=args.size)
+    index = IVFIndex(args.dim, n_lists=args.n_lists, seed=args.seed)
+    data = clustered_embeddings(rng, args.size + args.queries, args.dim, args.topics, args.spread)
+    corpus, queries = data[:args.size], data[args.size:]
+
+    start = time.perf_counter()
+    for offset in range(0, args.size, args.chunk):
+        index.add(corpus[offset:offset + args.chunk])
+    print(f"IVF build: {args.size:,} x {args.dim}, {args.n_lists} lists, "
+          f"{time.perf_counter() - start:.1f} s (training on {index.train_size:,} vectors)")
+    exact.add(corpus)
+
+    truth, _ = exact.search_batch(queries, args.k)
+    exact_ms = per_query_ms(lambda q: exact.search_batch(q, args.k), queries)
+    print(f"exact      recall@{args.k} 1.000  {exact_ms:8.2f} ms/query")
+
+    for n_probe in args.n_probe:
+        found, _ = index.search_batch(queries, args.k, n_probe=n_probe)
+        ivf_ms = per_query_ms(lambda q: index.search_batch(q, args.k, n_probe=n_probe), queries)
+        print(f"n_probe={n_probe:<3} recall@{args.k} {recall_at_k(found, truth):.3f}  "
+              f"{ivf_ms:8.2f} ms/query  ({exact_ms / ivf_ms:5.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Compare per-turn cost of incremental token accounting with naive re-tokenization.
+
+The naive memory re-counts the tokens of the whole retained history on every
+turn, as a straightforward reading of "Check token count" would; the
+ConversationMemory counts each message once. Both summarize at the same
+threshold with the same summarizer.
+
+    python -m benchmarks.bench_conversation_memory --turns 20000 --max-tokens 32000
+"""
+
+import re
+import time
+import random
+import argparse
+
+from agent_patterns.memory.conversation import ConversationMemory
+
+WORD = re.compile(r'\w+|[^\w\s]')
+
+
+def word_token_count(text):
+    """Regex word tokenizer standing in for a real BPE tokenizer's per-call cost."""
+    return len(WORD.findall(text))
+
+
+def keep_last_summarizer(previous_summary, messages):
+    return f"{len(messages)} earlier messages; last said: {messages[-1]['content'][:80]}"
+
+
+class NaiveConversationMemory:
+    """Re-tokenizes the entire history on every turn."""
+
+    def __init__(self, max_tokens, keep_recent_tokens):
+        self.max_tokens = max_tokens
+        self.keep_recent_tokens = keep_recent_tokens
+        self.summary = ''
+        self.messages = []
+
+    def add_message(self, role, content):
+        self.messages.append({'role': role, 'content': content})
+        counts = [word_token_count(m['content']) for m in self.messages]
+        if sum(counts) + word_token_count(self.summary) > self.max_tokens:
+            kept, cut = 0, len(self.messages)
+            while cut > 0 and kept + counts[cut - 1] <= self.keep_recent_tokens:
+                cut -= 1
+                kept += counts[cut]
+            self.summary = keep_last_summarizer(self.summary, self.messages[:cut])
+            self.messages = self.messages[cut:]
+
+    def get_context(self):
+        return [{'role': 'system', 'content': self.summary}] + list(self.messages)
+
+
+def random_message(rng):
+    words = ['agent', 'memory', 'token', 'context', 'summary', 'tool', 'query', 'result']
+    return ' '.join(rng.choice(words) for _ in range(rng.randint(20, 200)))
+
+
+def run(memory, messages):
+    start = time.perf_counter()
+    for i, content in enumerate(messages):
+        memory.add_message('user' if i % 2 == 0 else 'assistant', content)
+        memory.get_context()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark incremental token accounting')
+    parser.add_argument('--turns', type=int, default=5000)
+    parser.add_argument('--max-tokens', type=int, default=32000)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    messages = [random_message(rng) for _ in range(args.turns)]
+
+    incremental = ConversationMemory(max_tokens=args.max_tokens, summarizer=keep_last_summarizer,
+                                     token_counter=word_token_count)
+    naive = NaiveConversationMemory(args.max_tokens, args.max_tokens // 2)
+
+    incremental_seconds = run(incremental, messages)
+    naive_seconds = run(naive, messages)
+    print(f"{args.turns:,} turns, {args.max_tokens:,}-token budget")
+    print(f"naive re-tokenization   {naive_seconds * 1e6 / args.turns:10.1f} us/turn")
+    print(f"incremental accounting  {incremental_seconds * 1e6 / args.turns:10.1f} us/turn  "
+          f"({naive_seconds / incremental_seconds:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Hierarchical (section -> chunk) versus flat embedding search on a source tree.
+
+By default the tree is the local Python standard library (site-packages
+excluded), chunked with ``chunk_code`` and embedded with the hashed n-gram
+embedder. Queries are lines sampled from indexed chunks, in the style of "where
+is this code?" lookups. Each query is answered by exact flat search over
+every chunk and by the two-level index for several values of M (sections
+scanned). The report gives latency, vectors compared per query, index
+memory, recall@k against the flat result, and how often the chunk a query
+line was taken from is in the top k ("source hit"). The tree is indexed from a
+temporary copy, so the benchmark can also edit one file and time the
+incremental update.
+
+    python -m benchmarks.bench_hierarchical_index --root /path/to/repo --queries 300 --k 10
+"""
+
+import os
+import time
+import random
+import shutil
+import sysconfig
+import argparse
+import tempfile
+
+import numpy as np
+
+from agent_patterns.rag import HashedNgramEmbedder, HierarchicalIndex, IncrementalIndex
+from agent_patterns.rag.chunking import chunk_code
+
+
+def source_patterns(root):
+    """Every .py file under root, skipping installed third-party packages."""
+    patterns = ['*.py']
+    for name in sorted(os.listdir(root)):
+        if os.path.isdir(os.path.join(root, name)) and name not in ('site-packages', '__pycache__'):
+            patterns.append(f"{name}/**/*.py")
+    return tuple(patterns)
+
+
+def sample_queries(index, count, seed):
+    rng = random.Random(seed)
+    chunks = list(index.chunks.values())
+    queries, origins = [], []
+    while len(queries) < count:
+        chunk = rng.choice(chunks)
+        lines = [line.strip() for line in chunk.text.split('\n') if len(line.strip()) > 30]
+        if lines:
+            queries.append(rng.choice(lines))
+            origins.append(chunk.chunk_id)
+    return queries, origins
+
+
+def timed_search(search, queries, k):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append({chunk.chunk_id for chunk, _ in search(query, k)})
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hierarchical vs flat embedding search')
+    parser.add_argument('--root', default=sysconfig.get_paths()['stdlib'], help='Source tree to index')
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--dim', type=int, default=256)
+    parser.add_argument('--section-depth', type=int, default=0, help='0: one section per file')
+    parser.add_argument('--top-sections', default='4,16,64', help='Comma-separated values of M')
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    workdir = tempfile.mkdtemp()
+    try:
+        tree = os.path.join(workdir, 'tree')
+        shutil.copytree(args.root, tree, ignore=shutil.ignore_patterns('site-packages', '__pycache__'))
+        run(args, tree)
+    finally:
+        shutil.rmtree(workdir)
+    return 0
+
+
+def run(args, tree):
+    patterns = source_patterns(tree)
+    index = IncrementalIndex(HashedNgramEmbedder(args.dim), batch_size=256, chunker=chunk_code)
+    stats = index.update(tree, patterns)
+    initial_seconds = stats['seconds']
+    print(f"{args.root}: {stats['files']:,} files, {len(index):,} chunks, "
+          f"embedded in {stats['seconds']:.1f} s ({stats['chunks_per_second']:,.0f} chunks/s)")
+
+    start = time.perf_counter()
+    hierarchical = HierarchicalIndex(index, section_depth=args.section_depth)
+    build_seconds = time.perf_counter() - start
+    _, flat_matrix = index._matrix()
+    print(f"{len(hierarchical.sections):,} sections built in {build_seconds:.2f} s; memory: flat "
+          f"{flat_matrix.nbytes / 2**20:.1f} MiB, hierarchical {hierarchical.nbytes / 2**20:.1f} MiB "
+          f"(+{(hierarchical.nbytes - flat_matrix.nbytes) / 2**10:.0f} KiB summaries)")
+
+    queries, origins = sample_queries(index, args.queries, args.seed)
+    exact, latencies = timed_search(index.search, queries, args.k)
+    print(f"{'method':<18} {'p50 ms':>8} {'p99 ms':>8} {'vectors/query':>14} {'recall@' + str(args.k):>10} "
+          f"{'source hit':>11}")
+    print(f"{'flat':<18} {np.percentile(latencies, 50):8.2f} {np.percentile(latencies, 99):8.2f} "
+          f"{len(index):>14,} {1.0:>10.3f} {np.mean([o in e for o, e in zip(origins, exact)]):>11.3f}")
+    for m in (int(value) for value in args.top_sections.split(',')):
+        scanned = []
+
+        def search(query, k):
+            hits = hierarchical.search(query, k, top_sections=m)
+            scanned.append(hierarchical.last_scanned)
+            return hits
+
+        found, latencies = timed_search(search, queries, args.k)
+        recall = np.mean([len(f & e) / len(e) for f, e in zip(found, exact)])
+        hit = np.mean([o in f for o, f in zip(origins, found)])
+        print(f"{'hierarchical M=' + str(m):<18} {np.percentile(latencies, 50):8.2f} "
+              f"{np.percentile(latencies, 99):8.2f} {np.mean(scanned):>14,.0f} {recall:>10.3f} {hit:>11.3f}")
+
+    # A repository change: append a function to the largest file and bring both levels up to date
+    source = max(index.sources, key=lambda s: len(index.sources[s][1]))
+    with open(os.path.join(tree, source), 'a', encoding='utf-8') as f:
+        f.write('\n\ndef added_by_benchmark():\n    return "incremental update"\n')
+    start = time.perf_counter()
+    stats = index.update(tree, patterns)
+    files = hierarchical.sync()
+    print(f"incremental update after editing {source}: {stats['embedded']} chunk(s) re-embedded, "
+          f"{files} file regrouped in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"(initial index took {initial_seconds:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
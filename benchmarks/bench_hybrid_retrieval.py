@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compare keyword, vector and hybrid retrieval over the book corpus.
+
+Two query sets are generated from the corpus itself:
+
+- identifier queries: each function or class name defined in a code block
+  (``def name`` / ``class Name``), with the chunks that contain it counted as
+  relevant. This is the exact-match case, where vector search is weakest.
+- heading queries: each section heading, with the chunks under it counted as
+  relevant. This is the topical case that paraphrase-tolerant vectors handle.
+
+Recall@k is reported for BM25 only, vectors only, and both fusion methods,
+along with per-stage p50/p99 latency against the 2 s Chapter 6 budget.
+``--copies`` replicates the corpus to measure latency on a larger index.
+
+    python -m benchmarks.bench_hybrid_retrieval --root . --k 5 --copies 20
+"""
+
+import os
+import re
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+
+from agent_patterns.rag import IncrementalIndex, HybridRetriever, corpus_files
+from agent_patterns.rag.index import CORPUS_PATTERNS
+
+DEFINITION_PATTERN = re.compile(r'^\s*(?:async\s+)?(?:def|class)\s+([A-Za-z_][A-Za-z0-9_]{5,})', re.MULTILINE)
+
+
+def build_queries(index):
+    """(kind, query, relevant chunk ids) triples derived from the indexed chunks."""
+    chunks = list(index.chunks.values())
+    queries = []
+    names = sorted({name for chunk in chunks for name in DEFINITION_PATTERN.findall(chunk.text)})
+    for name in names:
+        relevant = {c.chunk_id for c in chunks if name in c.text}
+        queries.append(('identifier', name, relevant))
+    headings = sorted({chunk.headings[-1] for chunk in chunks if chunk.headings})
+    for heading in headings:
+        relevant = {c.chunk_id for c in chunks if c.headings and c.headings[-1] == heading}
+        queries.append(('heading', heading, relevant))
+    return queries
+
+
+def recall(ranked_ids, relevant, k):
+    return float(any(chunk_id in relevant for chunk_id in ranked_ids[:k]))
+
+
+async def evaluate(retriever, queries, k):
+    by_method = {}
+    for kind, query, relevant in queries:
+        rankings = {
+            'bm25': [i for i, _ in retriever.keyword_search(query, k)],
+            'vector': [i for i, _ in retriever.vector_search(query, k)],
+        }
+        for fusion in ('rrf', 'weighted'):
+            retriever.fusion = fusion
+            result = await retriever.search(query, k)
+            rankings[f"hybrid-{fusion}"] = [chunk.chunk_id for chunk, _ in result.hits]
+        for method, ranked in rankings.items():
+            by_method.setdefault(method, {}).setdefault(kind, []).append(recall(ranked, relevant, k))
+    return by_method
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hybrid BM25 + vector retrieval')
+    parser.add_argument('--root', default='.', help='Repository root containing chapters/, specs/ and GLOSSARY.md')
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--candidates', type=int, default=50)
+    parser.add_argument('--copies', type=int, default=1, help='Replicate the corpus this many times')
+    parser.add_argument('--budget', type=float, default=2.0)
+
+    args = parser.parse_args()
+    workdir = tempfile.mkdtemp()
+    try:
+        for copy in range(args.copies):
+            for source in corpus_files(args.root):
+                target = os.path.join(workdir, f"copy{copy}", source)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(os.path.join(args.root, source), target)
+
+        index = IncrementalIndex()
+        index.update(workdir, tuple(f"copy*/{p}" for p in CORPUS_PATTERNS))
+        queries = build_queries(index)
+
+        start = time.perf_counter()
+        retriever = HybridRetriever(index, candidates=args.candidates, budget=args.budget)
+        counts = {kind: sum(1 for q in queries if q[0] == kind) for kind in ('identifier', 'heading')}
+        print(f"{len(index):,} chunks; BM25 index built in {(time.perf_counter() - start) * 1000:.0f} ms; "
+              f"{counts['identifier']} identifier and {counts['heading']} heading queries, recall@{args.k}")
+
+        results = asyncio.run(evaluate(retriever, queries, args.k))
+        kinds = ('identifier', 'heading')
+        print(f"{'method':<16}" + ''.join(f"{kind:>12}" for kind in kinds))
+        for method, per_kind in results.items():
+            print(f"{method:<16}" + ''.join(f"{sum(per_kind[kind]) / len(per_kind[kind]):>12.2f}" for kind in kinds))
+
+        print(f"per-stage latency over {len(queries) * 2} hybrid queries (budget {args.budget:.1f} s, "
+              f"{retriever.degraded} degraded):")
+        for stage, m in retriever.metrics().items():
+            print(f"  {stage:<8} p50 {m['p50_ms']:7.2f} ms  p99 {m['p99_ms']:7.2f} ms")
+        assert retriever.metrics()['total']['p99_ms'] < args.budget * 1000
+    finally:
+        shutil.rmtree(workdir)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Call a local JSON-RPC tool server per call, per connection, and through a pool.
+
+All four modes call the `echo` tool on `agent_patterns.tools.echo_server`:
+
+- spawn per call: start a server subprocess, initialize, call, exit
+- connect per call: one long-lived Unix-socket server, new connection per call
+- pooled stdio: a ToolServerPool of long-lived subprocesses, requests
+  multiplexed by id over their stdin/stdout
+- pooled unix: a ToolServerPool of persistent Unix-socket connections
+
+The pooled runs also exercise capability caching (one `tools/list` per server
+version) and recovery after a pooled server is killed.
+
+    python -m benchmarks.bench_jsonrpc_pool --calls 5000 --concurrency 64 --pool-size 4
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+
+import numpy as np
+
+from agent_patterns.tools.jsonrpc import (
+    CapabilityCache,
+    ToolServerPool,
+    echo_server_command,
+    stdio_factory,
+    unix_factory,
+)
+
+
+async def measure(call, calls, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with slots:
+            start = time.perf_counter()
+            result = await call(f"message {i}")
+            latencies.append(time.perf_counter() - start)
+            assert result == f"message {i}"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def report(label, calls, seconds, latencies):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{label:<18} {calls:>6,} calls  {seconds:7.2f} s  {calls / seconds:>9,.0f} calls/s  "
+          f"p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+    return calls / seconds
+
+
+async def run(args):
+    command = echo_server_command()
+    socket_path = os.path.join(tempfile.mkdtemp(), 'echo.sock')
+    server = await asyncio.create_subprocess_exec(*command, '--socket', socket_path)
+    while not os.path.exists(socket_path):
+        await asyncio.sleep(0.01)
+
+    print(f"concurrency {args.concurrency}, pool size {args.pool_size}")
+    try:
+        async def spawn_per_call(text):
+            client = await stdio_factory(command)()
+            try:
+                await client.initialize()
+                return (await client.request('tools/call', {'name': 'echo', 'arguments': {'text': text}}))['content']
+            finally:
+                await client.close()
+
+        seconds, latencies = await measure(spawn_per_call, args.spawn_calls, args.concurrency)
+        baseline = report('spawn per call', args.spawn_calls, seconds, latencies)
+
+        connect = unix_factory(socket_path)
+
+        async def connect_per_call(text):
+            client = await connect()
+            try:
+                return (await client.request('tools/call', {'name': 'echo', 'arguments': {'text': text}}))['content']
+            finally:
+                await client.close()
+
+        seconds, latencies = await measure(connect_per_call, args.calls, args.concurrency)
+        report('connect per call', args.calls, seconds, latencies)
+
+        cache = CapabilityCache()
+        for label, factory in (('pooled stdio', stdio_factory(command)), ('pooled unix', connect)):
+            async with ToolServerPool(factory, size=args.pool_size, health_interval=0.2,
+                                      capability_cache=cache) as pool:
+                tools = await pool.list_tools()
+                seconds, latencies = await measure(lambda text: pool.call('echo', {'text': text}),
+                                                   args.calls, args.concurrency)
+                rate = report(label, args.calls, seconds, latencies)
+                print(f"{'':<18} {rate / baseline:.0f}x the calls/s of spawn per call")
+
+                if label == 'pooled stdio':
+                    pool.clients[0].process.kill()
+                    await asyncio.sleep(0.5)
+                    assert await pool.call('echo', {'text': 'after kill'}) == 'after kill'
+                    print(f"{'':<18} killed one server: replaced {pool.replaced}, calls still succeed")
+        print(f"capability discovery: {len(tools)} tools, {cache.misses} tools/list call(s), "
+              f"{cache.hits} served from the version cache")
+    finally:
+        server.terminate()
+        await server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pooled JSON-RPC tool-server calls')
+    parser.add_argument('--calls', type=int, default=5_000)
+    parser.add_argument('--spawn-calls', type=int, default=40, help='Calls for the spawn-per-call baseline')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--pool-size', type=int, default=4)
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    main()
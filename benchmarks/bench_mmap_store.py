@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark opening and searching the memory-mapped vector store.
+
+Builds a store on disk, reopens it and reports open time, resident memory
+after opening, and cold/warm query latency, showing that start-up cost does
+not grow with the number of stored memories.
+
+    python -m benchmarks.bench_mmap_store --sizes 100000 1000000 --dtype float16
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+from agent_patterns.memory import MmapVectorStore
+
+
+def resident_mib():
+    """Current resident set size in MiB (Linux only; 0 elsewhere)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return 0.0
+
+
+def run(size, dim, dtype, k, chunk, rng):
+    directory = tempfile.mkdtemp(prefix='mmap-store-')
+    try:
+        store = MmapVectorStore(directory, dim=dim, dtype=dtype, flush_threshold=chunk)
+        start = time.perf_counter()
+        for offset in range(0, size, chunk):
+            n = min(chunk, size - offset)
+            store.add(rng.standard_normal((n, dim), dtype=np.float32),
+                      [{'memory': offset + i} for i in range(n)])
+        store.close()
+        build_seconds = time.perf_counter() - start
+        disk_mib = sum(os.path.getsize(os.path.join(directory, f))
+                       for f in os.listdir(directory)) / 2**20
+        del store
+
+        rss_before = resident_mib()
+        start = time.perf_counter()
+        store = MmapVectorStore(directory)
+        open_ms = (time.perf_counter() - start) * 1000
+        rss_after_open = resident_mib() - rss_before
+
+        query = rng.standard_normal(dim, dtype=np.float32)
+        start = time.perf_counter()
+        store.similarity_search(query, k)
+        cold_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        store.similarity_search(query, k)
+        warm_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{size:>9,} x {dim} {dtype}  build {build_seconds:6.1f} s  disk {disk_mib:8,.0f} MiB  "
+              f"open {open_ms:6.2f} ms (+{rss_after_open:5.1f} MiB RSS)  "
+              f"first query {cold_ms:8.1f} ms  warm query {warm_ms:8.1f} ms  "
+              f"segments {store.segment_count}")
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the memory-mapped vector store')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--dtype', choices=['float32', 'float16'], default='float16')
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--chunk', type=int, default=50_000, help='Vectors per flushed segment')
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    for size in args.sizes:
+        run(size, args.dim, args.dtype, args.k, args.chunk, rng)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Run a layered random task DAG through the asyncio Orchestrator.
+
+Each worker type is a stub agent backed by ``StubLLM`` with its own latency
+and jitter. The benchmark records how long every subtask actually took, then
+compares the orchestrator's wall time with the DAG's critical path (the best
+any scheduler could do) and with the sum of all subtask durations (what a
+sequential orchestrator would pay).
+
+    python -m benchmarks.bench_orchestrator --layers 6 --width 12 --max-concurrency 32
+"""
+
+import time
+import random
+import asyncio
+import argparse
+
+from agent_patterns.stub_llm import StubLLM
+from agent_patterns.multi_agent import Orchestrator, Subtask
+from agent_patterns.multi_agent.orchestrator import critical_path
+
+WORKER_TYPES = {
+    # worker type: (latency seconds, jitter seconds)
+    'research': (0.08, 0.04),
+    'analysis': (0.05, 0.03),
+    'writing': (0.12, 0.05),
+}
+
+
+def build_dag(layers, width, fan_in, seed):
+    """Layered DAG: every subtask depends on up to fan_in subtasks from the previous layer."""
+    rng = random.Random(seed)
+    subtasks = []
+    previous = []
+    for layer in range(layers):
+        current = []
+        for i in range(rng.randint(max(1, width // 2), width)):
+            name = f"L{layer}-{i}"
+            depends_on = rng.sample(previous, min(fan_in, len(previous))) if previous else []
+            subtasks.append(Subtask(name, rng.choice(sorted(WORKER_TYPES)), payload=name,
+                                    depends_on=depends_on))
+            current.append(name)
+        previous = current
+    return subtasks
+
+
+def make_workers(durations, seed):
+    workers = {}
+    for offset, (worker_type, (latency, jitter)) in enumerate(sorted(WORKER_TYPES.items())):
+        llm = StubLLM(latency=latency, jitter=jitter, seed=seed + offset)
+
+        async def worker(subtask, inputs, llm=llm):
+            start = time.perf_counter()
+            response = await llm.complete(f"{subtask.payload} given {sorted(inputs)}")
+            durations[subtask.name] = time.perf_counter() - start
+            return response
+
+        workers[worker_type] = worker
+    return workers
+
+
+async def run(args):
+    subtasks = build_dag(args.layers, args.width, args.fan_in, args.seed)
+    durations = {}
+    orchestrator = Orchestrator(make_workers(durations, args.seed), max_concurrency=args.max_concurrency,
+                                per_worker_limits={'research': args.research_limit})
+    first_result = []
+
+    def aggregator(name, result):
+        if not first_result:
+            first_result.append(time.perf_counter())
+
+    start = time.perf_counter()
+    results = await orchestrator.run(subtasks, aggregator=aggregator)
+    wall = time.perf_counter() - start
+
+    longest = critical_path(subtasks, durations)
+    total = sum(durations.values())
+    print(f"{len(results)} subtasks in {args.layers} layers, max concurrency {args.max_concurrency}, "
+          f"research limit {args.research_limit}")
+    print(f"first partial result  {(first_result[0] - start) * 1000:8.1f} ms")
+    print(f"wall time             {wall * 1000:8.1f} ms")
+    print(f"critical path         {longest * 1000:8.1f} ms  (wall / critical path {wall / longest:.2f}x)")
+    print(f"sum of subtasks       {total * 1000:8.1f} ms  (speedup over sequential {total / wall:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the asyncio DAG orchestrator')
+    parser.add_argument('--layers', type=int, default=6)
+    parser.add_argument('--width', type=int, default=12, help='Maximum subtasks per layer')
+    parser.add_argument('--fan-in', type=int, default=2, help='Dependencies per subtask')
+    parser.add_argument('--max-concurrency', type=int, default=32)
+    parser.add_argument('--research-limit', type=int, default=8,
+                        help='Concurrency cap for the research worker type')
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Run each consensus protocol on peer networks of increasing size.
+
+Peers start with answers drawn from a skewed distribution and random
+weights and confidences. For every network size and protocol the benchmark
+reports the consensus reached, rounds to consensus, bus throughput in
+messages per second and delivery latency percentiles. Debate rounds use
+gossip fan-out so large networks stay cheap per round.
+
+    python -m benchmarks.bench_peer_network --peers 10 100 500 --queue-size 32 --fanout 16
+"""
+
+import time
+import random
+import asyncio
+import argparse
+
+from agent_patterns.stub_llm import StubLLM
+from agent_patterns.multi_agent import (
+    MessagingSystem,
+    PeerAgent,
+    PeerNetwork,
+    MajorityVote,
+    WeightedVote,
+    Debate,
+)
+
+ANSWERS = ['A', 'B', 'C', 'D']
+ANSWER_SHARES = [0.4, 0.3, 0.2, 0.1]
+
+
+def build_network(n_peers, args, fanout):
+    rng = random.Random(args.seed)
+    bus = MessagingSystem(queue_size=args.queue_size)
+    llm = StubLLM(latency=args.llm_latency, jitter=args.llm_latency, seed=args.seed) if args.llm_latency else None
+    peers = [PeerAgent(f"peer-{i}", bus, rng.choices(ANSWERS, ANSWER_SHARES)[0],
+                       confidence=rng.uniform(0.5, 1.0), weight=rng.uniform(0.5, 2.0),
+                       stubbornness=args.stubbornness, llm=llm)
+             for i in range(n_peers)]
+    return bus, PeerNetwork(bus, peers, fanout=fanout, seed=args.seed)
+
+
+async def run_protocol(name, protocol, n_peers, args, fanout=None):
+    bus, network = build_network(n_peers, args, fanout)
+    start = time.perf_counter()
+    result = await protocol.run(network)
+    elapsed = time.perf_counter() - start
+    m = bus.metrics()
+    print(f"  {name:<9} answer {result.answer} agreement {result.agreement:5.1%}  rounds {result.rounds:>2}  "
+          f"{elapsed * 1000:8.1f} ms  {m['messages']:>8,} msgs  {m['messages_per_second']:>9,.0f} msg/s  "
+          f"latency p50 {m['latency_p50_ms']:6.2f} ms  p99 {m['latency_p99_ms']:6.2f} ms")
+
+
+async def run(args):
+    for n_peers in args.peers:
+        print(f"\n{n_peers} peers, queue size {args.queue_size}, debate fan-out {args.fanout}")
+        await run_protocol('majority', MajorityVote(), n_peers, args)
+        await run_protocol('weighted', WeightedVote(), n_peers, args)
+        await run_protocol('debate', Debate(max_rounds=args.max_rounds, threshold=args.threshold),
+                           n_peers, args, fanout=args.fanout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark peer network consensus protocols')
+    parser.add_argument('--peers', type=int, nargs='+', default=[10, 100, 300])
+    parser.add_argument('--queue-size', type=int, default=32)
+    parser.add_argument('--fanout', type=int, default=16, help='Gossip fan-out for debate rounds')
+    parser.add_argument('--max-rounds', type=int, default=20)
+    parser.add_argument('--threshold', type=float, default=0.95)
+    parser.add_argument('--stubbornness', type=float, default=1.0)
+    parser.add_argument('--llm-latency', type=float, default=0.0,
+                        help='Seconds of StubLLM latency per peer per round')
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Compare binary framing with JSON messages for small and multi-megabyte payloads.
+
+Two paths are measured for each payload size:
+
+- in-process: build a message, pass it over an asyncio channel and read the
+  content back; JSON serializes and parses every hop, the binary transport
+  passes the frame by reference
+- Unix socket: a sender thread streams messages to a receiver over a
+  socketpair; JSON uses a length prefix plus sendall/recv, the binary
+  transport uses non-blocking sendmsg and recv_into a preallocated buffer
+
+    python -m benchmarks.bench_protocol --sizes 256 4194304 --seconds 1
+"""
+
+import json
+import time
+import struct
+import socket
+import asyncio
+import argparse
+import threading
+
+from agent_patterns.multi_agent.protocol import (
+    Frame,
+    MessageType,
+    InProcessTransport,
+    UnixSocketTransport,
+)
+
+LENGTH = struct.Struct('<Q')
+
+
+def json_message(i, content):
+    return {'message_type': 'result_report', 'sender_id': 7, 'correlation_id': i, 'content': content}
+
+
+def count_for(size, seconds):
+    # Roughly `seconds` of work at ~1 GB/s, but at least a few messages
+    return max(5, min(200_000, int(seconds * 1e9 / max(size, 1) / 4)))
+
+
+async def in_process(content, count):
+    channel = InProcessTransport()
+    start = time.perf_counter()
+    for i in range(count):
+        await channel.send(json.dumps(json_message(i, content)).encode('utf-8'))
+        received = json.loads(await channel.recv())
+        assert len(received['content']) == len(content)
+    json_seconds = time.perf_counter() - start
+
+    payload = content.encode('utf-8')
+    start = time.perf_counter()
+    for i in range(count):
+        await channel.send(Frame(MessageType.RESULT_REPORT, 7, i, payload))
+        frame = await channel.recv()
+        assert frame.payload.nbytes == len(payload)
+    binary_seconds = time.perf_counter() - start
+    return json_seconds, binary_seconds
+
+
+def socket_json(content, count):
+    a, b = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def sender():
+        for i in range(count):
+            data = json.dumps(json_message(i, content)).encode('utf-8')
+            a.sendall(LENGTH.pack(len(data)) + data)
+
+    def recv_exactly(n):
+        chunks = []
+        while n:
+            chunk = b.recv(min(n, 1 << 20))
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b''.join(chunks)
+
+    start = time.perf_counter()
+    thread = threading.Thread(target=sender)
+    thread.start()
+    for _ in range(count):
+        (length,) = LENGTH.unpack(recv_exactly(LENGTH.size))
+        message = json.loads(recv_exactly(length))
+        assert len(message['content']) == len(content)
+    thread.join()
+    elapsed = time.perf_counter() - start
+    a.close()
+    b.close()
+    return elapsed
+
+
+def socket_binary(content, count):
+    a, b = UnixSocketTransport.pair()
+    payload = content.encode('utf-8')
+
+    async def sender():
+        for i in range(count):
+            await a.send(Frame(MessageType.RESULT_REPORT, 7, i, payload))
+
+    async def receiver():
+        for _ in range(count):
+            frame = await b.recv()
+            assert frame.payload.nbytes == len(payload)
+
+    # Each side runs its own event loop in its own thread, like the JSON path
+    start = time.perf_counter()
+    thread = threading.Thread(target=asyncio.run, args=(sender(),))
+    thread.start()
+    asyncio.run(receiver())
+    thread.join()
+    elapsed = time.perf_counter() - start
+    a.close()
+    b.close()
+    return elapsed
+
+
+def report(label, size, count, json_seconds, binary_seconds):
+    def rate(seconds):
+        return f"{count / seconds:>10,.0f} msg/s {size * count / seconds / 2**20:>9,.1f} MiB/s"
+    print(f"  {label:<11} json {rate(json_seconds)} | binary {rate(binary_seconds)} | "
+          f"{json_seconds / binary_seconds:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark binary framing against JSON messages')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[256, 4 * 2**20], help='Payload bytes')
+    parser.add_argument('--seconds', type=float, default=0.5, help='Approximate work per measurement')
+
+    args = parser.parse_args()
+    for size in args.sizes:
+        # Text with characters JSON must escape, as in real model output
+        content = ('line "quoted"\n' * (size // 14 + 1))[:size]
+        count = count_for(size, args.seconds)
+        print(f"\npayload {size:,} bytes, {count:,} messages")
+        report('in-process', size, count, *asyncio.run(in_process(content, count)))
+        report('unix socket', size, count, socket_json(content, count), socket_binary(content, count))
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compare float32, int8 scalar and product-quantized embedding storage.
+
+For each variant the benchmark reports in-memory bytes per vector, the
+projected footprint for a target collection size (4M vectors by default),
+mean query latency and recall@k against exact float32 search, both with and
+without full-precision re-ranking.
+
+    python -m benchmarks.bench_quantization --size 200000 --pq-m 48
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from agent_patterns.memory import (
+    VectorStore,
+    ScalarQuantizer,
+    ProductQuantizer,
+    QuantizedVectorStore,
+)
+from benchmarks.bench_ann_index import clustered_embeddings, recall_at_k
+
+
+def per_query_ms(store, queries, k):
+    start = time.perf_counter()
+    for query in queries:
+        store.search_batch(query, k)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def report(name, bytes_per_vector, projected, latency_ms, recall, k):
+    print(f"{name:<20} {bytes_per_vector:>6.0f} B/vector  "
+          f"{bytes_per_vector * projected / 2**30:7.2f} GiB @ {projected:,}  "
+          f"{latency_ms:8.2f} ms/query  recall@{k} {recall:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark quantized embedding storage')
+    parser.add_argument('--size', type=int, default=200_000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--pq-m', type=int, default=48, help='Sub-vectors per product-quantized code')
+    parser.add_argument('--rerank', type=int, default=100, help='Candidates re-ranked in full precision')
+    parser.add_argument('--train-size', type=int, default=20_000)
+    parser.add_argument('--project-to', type=int, default=4_000_000, help='Collection size for projected memory')
+    parser.add_argument('--topics', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    data = clustered_embeddings(rng, args.size + args.queries, args.dim, args.topics, 1.0)
+    corpus, queries = data[:args.size], data[args.size:]
+    sample = corpus[rng.choice(args.size, min(args.train_size, args.size), replace=False)]
+
+    exact = VectorStore(args.dim, capacity=args.size)
+    exact.add(corpus)
+    truth, _ = exact.search_batch(queries, args.k)
+    report('float32', args.dim * 4, args.project_to,
+           per_query_ms(exact, queries, args.k), 1.0, args.k)
+
+    variants = [
+        ('int8 scalar', lambda: ScalarQuantizer(args.dim)),
+        (f"PQ m={args.pq_m}", lambda: ProductQuantizer(args.dim, m=args.pq_m, seed=args.seed)),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        for number, (name, make_quantizer) in enumerate(variants):
+            start = time.perf_counter()
+            store = QuantizedVectorStore(make_quantizer(), rerank=args.rerank,
+                                         full_precision_path=os.path.join(directory, f"full-{number}.f32"))
+            store.train(sample)
+            store.add(corpus)
+            build_seconds = time.perf_counter() - start
+            bytes_per_vector = store.code_bytes / len(store)
+
+            for rerank in (0, args.rerank):
+                store.rerank = rerank
+                found, _ = store.search_batch(queries, args.k)
+                label = f"{name} + rerank" if rerank else name
+                report(label, bytes_per_vector, args.project_to,
+                       per_query_ms(store, queries, args.k), recall_at_k(found, truth), args.k)
+            print(f"{'':<20} (train + encode {build_seconds:.1f} s; full-precision vectors on disk)")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Simulate a long agent session against TieredMemory with each hot-tier policy.
+
+New memories keep arriving while older ones are re-read with a Zipf-like
+skew towards recent and popular items. For each policy the benchmark reports
+per-tier hit rates and mean lookup latency, and samples resident memory
+during the run to show that it stays flat as the cold tier grows.
+
+    python -m benchmarks.bench_tiered_memory --operations 500000 --policies lru lfu arc
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from agent_patterns.memory import TieredMemory
+from benchmarks.bench_mmap_store import resident_mib
+
+
+def simulate(policy, args, directory):
+    rng = np.random.default_rng(args.seed)
+    memory = TieredMemory(os.path.join(directory, f"cold-{policy}"), hot_capacity=args.hot_capacity,
+                          warm_capacity_bytes=args.warm_mib * 2**20, policy=policy)
+    stored = 0
+    rss_samples = []
+
+    start = time.perf_counter()
+    for op in range(args.operations):
+        if stored == 0 or rng.random() < args.write_ratio:
+            # Random hex so values compress about 2x, like real text rather than padding
+            memory.put(f"memory-{stored}", {'id': stored, 'text': os.urandom(args.value_bytes // 2).hex()})
+            stored += 1
+        else:
+            # Zipf over recency rank: most reads hit recent memories, with a long tail
+            age = min(int(rng.zipf(args.zipf)) - 1, stored - 1)
+            memory.get(f"memory-{stored - 1 - age}")
+        if op % (args.operations // 10 or 1) == 0:
+            rss_samples.append(resident_mib())
+    elapsed = time.perf_counter() - start
+
+    metrics = memory.metrics()
+    memory.close()
+    print(f"\npolicy={policy}: {args.operations:,} ops in {elapsed:.1f} s, {stored:,} memories stored")
+    for tier in ('hot', 'warm', 'cold'):
+        m = metrics[tier]
+        print(f"  {tier:<5} items {m['items']:>9,}  hit rate {m['hit_rate']:6.1%}  "
+              f"mean lookup {m['mean_lookup_us']:8.1f} us  promotions {m['promotions']:>8,}  "
+              f"demotions {m['demotions']:>8,}")
+    print(f"  resident memory samples (MiB): {' '.join(f'{r:.0f}' for r in rss_samples)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hierarchical tiered memory')
+    parser.add_argument('--operations', type=int, default=200_000)
+    parser.add_argument('--policies', nargs='+', default=['lru', 'lfu', 'arc'], choices=['lru', 'lfu', 'arc'])
+    parser.add_argument('--hot-capacity', type=int, default=2_000)
+    parser.add_argument('--warm-mib', type=int, default=8)
+    parser.add_argument('--value-bytes', type=int, default=1_000)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--zipf', type=float, default=1.3)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        for policy in args.policies:
+            simulate(policy, args, directory)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
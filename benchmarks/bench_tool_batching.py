@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Embed every chunk of a simulated RAG index with and without micro-batching.
+
+The stub embedding service charges a fixed per-request overhead plus a small
+per-item cost and allows a limited number of concurrent requests, like a
+hosted embeddings API. The indexer calls the `embed_text` tool once per
+chunk. Without batching every chunk is one request; with the
+BatchingDispatcher calls are merged into bulk requests transparently.
+
+    python -m benchmarks.bench_tool_batching --chunks 5000 --window 0.002 --max-batch 128
+"""
+
+import time
+import zlib
+import asyncio
+import argparse
+
+from agent_patterns.tools import ToolRegistry
+from agent_patterns.tools.batching import BatchingDispatcher
+
+
+class StubEmbeddingService:
+    """Per-request overhead + per-item cost, with a cap on concurrent requests."""
+
+    def __init__(self, overhead, per_item, max_concurrent):
+        self.overhead = overhead
+        self.per_item = per_item
+        self.slots = asyncio.Semaphore(max_concurrent)
+        self.requests = 0
+
+    async def embed(self, texts):
+        async with self.slots:
+            self.requests += 1
+            await asyncio.sleep(self.overhead + self.per_item * len(texts))
+        return [[zlib.crc32(text.encode('utf-8')) % 997 / 997.0] for text in texts]
+
+
+def build(args):
+    service = StubEmbeddingService(args.overhead, args.per_item, args.max_concurrent)
+    registry = ToolRegistry()
+
+    async def embed_text(text):
+        return (await service.embed([text]))[0]
+
+    async def embed_texts(batch):
+        return await service.embed([arguments['text'] for arguments in batch])
+
+    registry.register('embed_text', embed_text, {
+        'type': 'object',
+        'properties': {'text': {'type': 'string'}},
+        'required': ['text'],
+        'additionalProperties': False,
+    })
+    return service, registry, embed_texts
+
+
+async def index(invoke, chunks):
+    start = time.perf_counter()
+    vectors = await asyncio.gather(*(invoke('embed_text', {'text': chunk}) for chunk in chunks))
+    return time.perf_counter() - start, vectors
+
+
+async def run(args):
+    chunks = [f"chunk {i} of the book about agent design patterns" for i in range(args.chunks)]
+
+    service, registry, _ = build(args)
+    plain_seconds, plain = await index(registry.invoke, chunks)
+    plain_requests = service.requests
+
+    service, registry, embed_texts = build(args)
+    dispatcher = BatchingDispatcher(registry)
+    dispatcher.configure('embed_text', embed_texts, window=args.window, max_batch_size=args.max_batch)
+    batched_seconds, batched = await index(dispatcher.invoke, chunks)
+    assert batched == plain
+    m = dispatcher.metrics()['embed_text']
+
+    print(f"{args.chunks:,} chunks, {args.overhead * 1000:.0f} ms per request + "
+          f"{args.per_item * 1e6:.0f} us per item, {args.max_concurrent} concurrent requests")
+    print(f"one call per chunk  {plain_requests:>6,} requests  {plain_seconds:7.2f} s  "
+          f"{args.chunks / plain_seconds:>9,.0f} chunks/s")
+    print(f"micro-batched       {service.requests:>6,} requests  {batched_seconds:7.2f} s  "
+          f"{args.chunks / batched_seconds:>9,.0f} chunks/s  mean batch {m['mean_batch_size']:.1f}  "
+          f"({plain_seconds / batched_seconds:.1f}x faster)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark micro-batched tool dispatch')
+    parser.add_argument('--chunks', type=int, default=5_000)
+    parser.add_argument('--overhead', type=float, default=0.005, help='Seconds per request')
+    parser.add_argument('--per-item', type=float, default=0.00002, help='Seconds per embedded item')
+    parser.add_argument('--max-concurrent', type=int, default=8)
+    parser.add_argument('--window', type=float, default=0.002)
+    parser.add_argument('--max-batch', type=int, default=128)
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Replay a skewed stream of documentation lookups with and without ToolResultCache.
+
+Concurrent callers issue lookups whose queries follow a Zipf distribution,
+so popular queries repeat and are often requested while an identical call
+is still in flight. The benchmark reports wall time, tool executions, hit
+rate, coalesced calls and total tool latency saved, and p50/p99 call
+latency for each configuration.
+
+    python -m benchmarks.bench_tool_cache --requests 5000 --concurrency 64 --ttl 0.05 --stale-ttl 0.2
+"""
+
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+from agent_patterns.tools import ToolRegistry
+from agent_patterns.tools.cache import ToolResultCache
+
+LOOKUP_PARAMETERS = {
+    'type': 'object',
+    'properties': {
+        'query': {'type': 'string', 'minLength': 1},
+        'version': {'type': 'string', 'default': 'latest'},
+    },
+    'required': ['query'],
+    'additionalProperties': False,
+}
+
+
+def build_registry(latency, executions):
+    registry = ToolRegistry()
+
+    async def lookup_docs(query, version='latest'):
+        executions.append(query)
+        await asyncio.sleep(latency)
+        return f"docs for {query} ({version})"
+
+    registry.register('lookup_docs', lookup_docs, LOOKUP_PARAMETERS)
+    return registry
+
+
+async def replay(invoke, queries, concurrency):
+    latencies = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with slots:
+            start = time.perf_counter()
+            await invoke('lookup_docs', {'query': query})
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(query) for query in queries))
+    return time.perf_counter() - start, np.asarray(latencies) * 1000
+
+
+async def run(args):
+    rng = np.random.default_rng(args.seed)
+    ranks = np.minimum(rng.zipf(args.zipf, size=args.requests), args.distinct) - 1
+    queries = [f"topic-{rank}" for rank in ranks]
+
+    executions = []
+    registry = build_registry(args.latency, executions)
+    wall, latencies = await replay(registry.invoke, queries, args.concurrency)
+    print(f"{args.requests:,} lookups over {len(set(queries))} distinct queries, "
+          f"tool latency {args.latency * 1000:.0f} ms, concurrency {args.concurrency}")
+    print(f"uncached  wall {wall:6.2f} s  executions {len(executions):>6,}  "
+          f"p50 {np.percentile(latencies, 50):6.1f} ms  p99 {np.percentile(latencies, 99):6.1f} ms")
+
+    executions = []
+    registry = build_registry(args.latency, executions)
+    cache = ToolResultCache(registry, max_entries=args.max_entries)
+    cache.configure('lookup_docs', ttl=args.ttl, stale_ttl=args.stale_ttl)
+    wall, latencies = await replay(cache.invoke, queries, args.concurrency)
+    await cache.wait_for_refreshes()
+    m = cache.metrics()
+    print(f"cached    wall {wall:6.2f} s  executions {len(executions):>6,}  "
+          f"p50 {np.percentile(latencies, 50):6.1f} ms  p99 {np.percentile(latencies, 99):6.1f} ms")
+    print(f"  hit rate {m['hit_rate']:.1%} ({m['hits']:,} fresh, {m['stale_hits']:,} stale), "
+          f"{m['coalesced']:,} coalesced, {m['refreshes']:,} background refreshes, "
+          f"tool time saved {m['saved_seconds']:.1f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the tool result cache')
+    parser.add_argument('--requests', type=int, default=5_000)
+    parser.add_argument('--distinct', type=int, default=500, help='Cap on distinct queries')
+    parser.add_argument('--zipf', type=float, default=1.2)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.02, help='Tool latency in seconds')
+    parser.add_argument('--ttl', type=float, default=0.05)
+    parser.add_argument('--stale-ttl', type=float, default=0.2)
+    parser.add_argument('--max-entries', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Measure tool-call tail latency with and without execution policies.
+
+A fault-injecting stub tool server answers most calls in about 10 ms but
+injects slow responses, errors and a mid-run outage during which calls hang.
+The same request stream is replayed with no policy, with timeout and retries,
+with hedging added, and with a circuit breaker added. For each run the
+benchmark reports success rate and p50/p99/max latency of the agent-visible
+call, including calls that ended in an error, and the p99 of calls that
+did not overlap the outage.
+
+    python -m benchmarks.bench_tool_policies --requests 3000 --slow-rate 0.03 --error-rate 0.02
+"""
+
+import time
+import random
+import asyncio
+import argparse
+
+import numpy as np
+
+from agent_patterns.tools import ToolRegistry
+from agent_patterns.tools.policies import (
+    PolicyExecutor,
+    RetryPolicy,
+    HedgePolicy,
+    CircuitBreaker,
+    deadline,
+)
+
+
+class FaultInjectingToolServer:
+    """Stub tool backend with lognormal latency, slow calls, errors and an outage window."""
+
+    def __init__(self, args, start):
+        self.args = args
+        self.start = start
+        self.rng = random.Random(args.seed)
+        self.calls = 0
+
+    def in_outage(self):
+        elapsed = time.monotonic() - self.start
+        return self.args.outage_start <= elapsed < self.args.outage_start + self.args.outage_seconds
+
+    async def search(self, query):
+        self.calls += 1
+        if self.in_outage():
+            await asyncio.sleep(self.args.hang)
+            raise ConnectionError('service unavailable')
+        roll = self.rng.random()
+        if roll < self.args.error_rate:
+            await asyncio.sleep(0.002)
+            raise ConnectionError('injected error')
+        if roll < self.args.error_rate + self.args.slow_rate:
+            await asyncio.sleep(self.args.slow_latency)
+        else:
+            await asyncio.sleep(self.rng.lognormvariate(np.log(self.args.latency), 0.25))
+        return f"results for {query}"
+
+
+def build(args, configure):
+    server = FaultInjectingToolServer(args, time.monotonic())
+    registry = ToolRegistry()
+    registry.register('search', server.search, {
+        'type': 'object',
+        'properties': {'query': {'type': 'string'}},
+        'required': ['query'],
+    })
+    executor = PolicyExecutor(registry)
+    if configure is not None:
+        configure(executor)
+    return server, executor
+
+
+async def replay(args, configure):
+    server, executor = build(args, configure)
+    slots = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    healthy = []
+    successes = 0
+
+    async def one(i):
+        nonlocal successes
+        # Spread arrivals so the outage window covers part of the run
+        await asyncio.sleep(i * args.interval)
+        async with slots:
+            start = time.monotonic()
+            touched_outage = server.in_outage()
+            try:
+                with deadline(args.deadline):
+                    await executor.invoke('search', {'query': f"q{i}"})
+                successes += 1
+            except Exception:
+                pass
+            latencies.append(time.monotonic() - start)
+            if not (touched_outage or server.in_outage()
+                    or start - server.start < args.outage_start <= time.monotonic() - server.start):
+                healthy.append(latencies[-1])
+
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    latencies = np.asarray(latencies) * 1000
+    return successes / args.requests, latencies, np.asarray(healthy) * 1000, server.calls, executor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tool execution policies under injected faults')
+    parser.add_argument('--requests', type=int, default=3_000)
+    parser.add_argument('--interval', type=float, default=0.001, help='Seconds between request arrivals')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.01, help='Median healthy latency in seconds')
+    parser.add_argument('--slow-rate', type=float, default=0.03)
+    parser.add_argument('--slow-latency', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--outage-start', type=float, default=1.0)
+    parser.add_argument('--outage-seconds', type=float, default=0.5)
+    parser.add_argument('--hang', type=float, default=1.0, help='How long calls hang during the outage')
+    parser.add_argument('--deadline', type=float, default=2.0, help='Per-request deadline in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+
+    def retries(executor):
+        executor.configure('search', timeout=0.1, retry=RetryPolicy(3, base_delay=0.01, seed=args.seed))
+
+    def hedged(executor):
+        executor.configure('search', timeout=0.1, retry=RetryPolicy(3, base_delay=0.01, seed=args.seed),
+                           hedge=HedgePolicy(quantile=0.95))
+
+    def breaker(executor):
+        executor.configure('search', timeout=0.1, retry=RetryPolicy(3, base_delay=0.01, seed=args.seed),
+                           hedge=HedgePolicy(quantile=0.95),
+                           breaker=CircuitBreaker(failure_threshold=10, reset_timeout=0.1))
+
+    print(f"{args.requests:,} requests, {args.slow_rate:.0%} slow ({args.slow_latency * 1000:.0f} ms), "
+          f"{args.error_rate:.0%} errors, {args.outage_seconds:.1f} s outage")
+    for label, configure in (('no policy', None), ('timeout + retry', retries),
+                             ('+ hedging', hedged), ('+ circuit breaker', breaker)):
+        success, latencies, healthy, calls, executor = asyncio.run(replay(args, configure))
+        extra = ''
+        if configure is not None and executor.policies['search'].hedge is not None:
+            extra = f"  hedges {executor.hedges_started:,} (won {executor.hedges_won:,})"
+        if configure is breaker:
+            extra += f"  fast-failed {executor.policies['search'].breaker.rejected:,}"
+        print(f"{label:<18} success {success:6.1%}  p50 {np.percentile(latencies, 50):7.1f} ms  "
+              f"p99 {np.percentile(latencies, 99):7.1f} ms  (outside outage {np.percentile(healthy, 99):6.1f} ms)  "
+              f"backend calls {calls:>6,}{extra}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
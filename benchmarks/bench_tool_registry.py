@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Compare validated tool dispatch with compiled and interpreted validators.
+
+The baseline registry walks each tool's JSON-schema style spec on every call,
+which is how validation is usually written. ToolRegistry compiles the spec
+into a Python function once, at registration. Both registries dispatch the
+same mix of calls to cheap tools, so the difference is validation and
+dispatch overhead.
+
+    python -m benchmarks.bench_tool_registry --calls 200000
+"""
+
+import re
+import time
+import random
+import argparse
+
+from agent_patterns.tools import ToolRegistry
+
+TYPES = {
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'array': lambda v: isinstance(v, (list, tuple)),
+    'object': lambda v: isinstance(v, dict),
+    'null': lambda v: v is None,
+}
+
+
+def naive_validate(schema, value, path='$'):
+    """Interpretive validator: walks the spec dict on every call."""
+    if 'type' in schema:
+        types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+        if not any(TYPES[t](value) for t in types):
+            raise ValueError(f"{path}: expected {' or '.join(types)}")
+    if 'enum' in schema and value not in schema['enum']:
+        raise ValueError(f"{path}: expected one of {schema['enum']}")
+    if 'minimum' in schema and value < schema['minimum']:
+        raise ValueError(f"{path}: below minimum")
+    if 'maximum' in schema and value > schema['maximum']:
+        raise ValueError(f"{path}: above maximum")
+    if 'minLength' in schema and len(value) < schema['minLength']:
+        raise ValueError(f"{path}: too short")
+    if 'maxLength' in schema and len(value) > schema['maxLength']:
+        raise ValueError(f"{path}: too long")
+    if 'pattern' in schema and not re.search(schema['pattern'], value):
+        raise ValueError(f"{path}: pattern mismatch")
+    if 'maxItems' in schema and len(value) > schema['maxItems']:
+        raise ValueError(f"{path}: too many items")
+    if 'items' in schema:
+        for i, item in enumerate(value):
+            naive_validate(schema['items'], item, f"{path}[{i}]")
+    if isinstance(value, dict):
+        properties = schema.get('properties', {})
+        for key in schema.get('required', []):
+            if key not in value:
+                raise ValueError(f"{path}: missing {key}")
+        if schema.get('additionalProperties', True) is False:
+            for key in value:
+                if key not in properties:
+                    raise ValueError(f"{path}: unexpected {key}")
+        for key, subschema in properties.items():
+            if key in value:
+                naive_validate(subschema, value[key], f"{path}.{key}")
+    return value
+
+
+class NaiveRegistry:
+    """Baseline: dict of (function, spec), validated by walking the spec."""
+
+    def __init__(self):
+        self.tools = {}
+
+    def register(self, name, function, parameters):
+        self.tools[name] = (function, parameters)
+
+    def call(self, name, arguments):
+        function, parameters = self.tools[name]
+        arguments = dict(arguments)
+        for key, subschema in parameters.get('properties', {}).items():
+            if key not in arguments and 'default' in subschema:
+                arguments[key] = subschema['default']
+        return function(**naive_validate(parameters, arguments))
+
+
+def get_weather(location, date='today', units='metric'):
+    return len(location)
+
+
+def search_documents(query, limit=10, filters=None):
+    return limit
+
+
+def create_event(title, start, duration_minutes, attendees=()):
+    return len(attendees)
+
+
+TOOLS = [
+    ('get_weather', get_weather, {
+        'type': 'object',
+        'properties': {
+            'location': {'type': 'string', 'minLength': 1, 'maxLength': 100},
+            'date': {'type': 'string', 'pattern': r'^(today|tomorrow|\d{4}-\d{2}-\d{2})$', 'default': 'today'},
+            'units': {'enum': ['metric', 'imperial'], 'default': 'metric'},
+        },
+        'required': ['location'],
+        'additionalProperties': False,
+    }),
+    ('search_documents', search_documents, {
+        'type': 'object',
+        'properties': {
+            'query': {'type': 'string', 'minLength': 1},
+            'limit': {'type': 'integer', 'minimum': 1, 'maximum': 100, 'default': 10},
+            'filters': {
+                'type': 'object',
+                'properties': {
+                    'tags': {'type': 'array', 'items': {'type': 'string'}, 'maxItems': 10},
+                    'year': {'type': ['integer', 'null']},
+                },
+                'additionalProperties': False,
+            },
+        },
+        'required': ['query'],
+        'additionalProperties': False,
+    }),
+    ('create_event', create_event, {
+        'type': 'object',
+        'properties': {
+            'title': {'type': 'string', 'minLength': 1},
+            'start': {'type': 'string'},
+            'duration_minutes': {'type': 'integer', 'minimum': 1, 'maximum': 1440},
+            'attendees': {'type': 'array', 'items': {'type': 'string', 'pattern': '@'}},
+        },
+        'required': ['title', 'start', 'duration_minutes'],
+        'additionalProperties': False,
+    }),
+]
+
+CALLS = [
+    ('get_weather', {'location': 'Paris', 'date': 'tomorrow'}),
+    ('get_weather', {'location': 'Tokyo', 'units': 'imperial'}),
+    ('search_documents', {'query': 'agent memory', 'limit': 5, 'filters': {'tags': ['rag', 'memory'], 'year': 2024}}),
+    ('search_documents', {'query': 'orchestrator'}),
+    ('create_event', {'title': 'Review', 'start': '2025-01-01T10:00', 'duration_minutes': 30,
+                      'attendees': ['a@example.com', 'b@example.com']}),
+]
+
+
+def measure(call, workload):
+    start = time.perf_counter()
+    for name, arguments in workload:
+        call(name, arguments)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark compiled versus interpreted tool validation')
+    parser.add_argument('--calls', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    workload = [rng.choice(CALLS) for _ in range(args.calls)]
+
+    compiled = ToolRegistry()
+    naive = NaiveRegistry()
+    for name, function, parameters in TOOLS:
+        compiled.register(name, function, parameters)
+        naive.register(name, function, parameters)
+
+    def direct(name, arguments):
+        return compiled.get(name).function(**arguments)
+
+    # Both registries must agree before timing
+    for name, arguments in CALLS:
+        assert compiled.call(name, arguments) == naive.call(name, arguments)
+
+    direct_seconds = measure(direct, workload)
+    naive_seconds = measure(naive.call, workload)
+    compiled_seconds = measure(compiled.call, workload)
+    print(f"{args.calls:,} validated dispatches over {len(TOOLS)} tools")
+    print(f"no validation       {args.calls / direct_seconds:>12,.0f} calls/s")
+    print(f"dict-walking        {args.calls / naive_seconds:>12,.0f} calls/s  "
+          f"overhead {(naive_seconds - direct_seconds) / args.calls * 1e6:5.2f} us/call")
+    print(f"compiled validators {args.calls / compiled_seconds:>12,.0f} calls/s  "
+          f"overhead {(compiled_seconds - direct_seconds) / args.calls * 1e6:5.2f} us/call  "
+          f"({naive_seconds / compiled_seconds:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
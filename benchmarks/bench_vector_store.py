@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the NumPy VectorStore on CPU for 10^5 to 10^6 vectors.
+
+Reports append throughput (starting from a small capacity so the doubling
+path is exercised), single-query latency and batched-query throughput.
+
+    python -m benchmarks.bench_vector_store --sizes 100000 1000000 --dim 384
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from agent_patterns.memory import VectorStore
+
+
+def timed(fn, repeats):
+    """Return the median wall time of fn() over repeats runs, in seconds."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+def run(size, dim, batch, k, chunk, repeats, rng):
+    store = VectorStore(dim, capacity=1024)
+
+    start = time.perf_counter()
+    for offset in range(0, size, chunk):
+        n = min(chunk, size - offset)
+        store.add(rng.standard_normal((n, dim), dtype=np.float32))
+    add_seconds = time.perf_counter() - start
+
+    single = rng.standard_normal(dim, dtype=np.float32)
+    queries = rng.standard_normal((batch, dim), dtype=np.float32)
+
+    single_seconds = timed(lambda: store.search_batch(single, k), repeats)
+    batch_seconds = timed(lambda: store.search_batch(queries, k), repeats)
+
+    print(f"{size:>9,} x {dim}  "
+          f"add {size / add_seconds:>12,.0f} vec/s  "
+          f"single query {single_seconds * 1000:>8.2f} ms  "
+          f"batch of {batch} {batch_seconds * 1000:>8.2f} ms "
+          f"({batch / batch_seconds:>8,.0f} q/s)  "
+          f"matrix {store.vectors.nbytes / 2**20:,.0f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the NumPy VectorStore')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--batch', type=int, default=64, help='Queries per batched search')
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--chunk', type=int, default=10_000, help='Vectors per add() call')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    for size in args.sizes:
+        run(size, args.dim, args.batch, args.k, args.chunk, args.repeats, rng)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
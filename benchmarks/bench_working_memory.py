@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Compare the structure-of-arrays WorkingMemory with a dict-per-item design.
+
+Reports bookkeeping bytes per item (measured with tracemalloc, excluding the
+stored values and embeddings, which both designs share) and the time to score
+attention and select the focused context over all items.
+
+    python -m benchmarks.bench_working_memory --items 100000
+"""
+
+import math
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from agent_patterns.memory import WorkingMemory
+
+
+class DictWorkingMemory:
+    """Baseline: one metadata dict per item, scored in a Python loop."""
+
+    def __init__(self, half_life=300.0):
+        self.half_life = half_life
+        self.items = {}
+
+    def store_result(self, key, value, relevance=0.0):
+        now = time.monotonic()
+        self.items[key] = {'value': value, 'created': now, 'last_access': now,
+                           'access_count': 0, 'relevance': relevance}
+
+    def get_focused_context(self, max_items=10):
+        now = time.monotonic()
+        scored = []
+        for key, item in self.items.items():
+            recency = 2 ** (-(now - item['last_access']) / self.half_life)
+            score = item['relevance'] + 0.5 * recency + 0.1 * math.log1p(item['access_count'])
+            scored.append((score, key))
+        scored.sort(reverse=True)
+        return [(key, self.items[key]['value']) for _, key in scored[:max_items]]
+
+
+def measure_bytes(build, n, keys, values, relevance):
+    tracemalloc.start()
+    memory = build()
+    for i in range(n):
+        memory.store_result(keys[i], values[i], relevance=float(relevance[i]))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memory, current / n
+
+
+def median_ms(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark working memory storage and attention scoring')
+    parser.add_argument('--items', type=int, default=100_000)
+    parser.add_argument('--focus', type=int, default=20, help='Items returned by get_focused_context')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    n = args.items
+    # Keys and values are created up front so only per-item bookkeeping is measured
+    keys = [f"result-{i}" for i in range(n)]
+    values = list(range(n))
+    relevance = rng.random(n)
+
+    soa, soa_bytes = measure_bytes(lambda: WorkingMemory(max_items=n), n, keys, values, relevance)
+    baseline, dict_bytes = measure_bytes(DictWorkingMemory, n, keys, values, relevance)
+
+    soa_ms = median_ms(lambda: soa.get_focused_context(args.focus), args.repeats)
+    dict_ms = median_ms(lambda: baseline.get_focused_context(args.focus), args.repeats)
+
+    print(f"{n:,} items")
+    print(f"dict per item       {dict_bytes:7.1f} B/item  scoring + top-{args.focus} {dict_ms:8.2f} ms")
+    print(f"structure of arrays {soa_bytes:7.1f} B/item  scoring + top-{args.focus} {soa_ms:8.2f} ms  "
+          f"({dict_bytes / soa_bytes:.1f}x less memory, {dict_ms / soa_ms:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
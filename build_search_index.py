@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Build a prebuilt full-text search index for the HTML edition of the book.
+
+The index is an inverted index with BM25 statistics, split into small JSON
+shards keyed by term prefix. The search box in templates/book.html loads the
+manifest once and then fetches only the shards that the query terms need, so
+searching never requires a server round-trip beyond static file loads.
+"""
+
+import os
+import re
+import glob
+import json
+import argparse
+from collections import Counter, defaultdict
+
+from link_glossary import parse_glossary, glossary_anchor
+
+# Query-time tokenization in templates/book.html must stay identical to this
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOPWORDS = sorted({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has',
+    'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to',
+    'was', 'were', 'will', 'with',
+})
+STOPWORDS_SET = frozenset(STOPWORDS)
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_LENGTH = 160
+
+#########################
+# MARKDOWN PARSING
+#########################
+
+def strip_front_matter(content):
+    """Remove a leading YAML front matter block from a markdown document."""
+    if content.startswith('---\n'):
+        end = content.find('\n---', 4)
+        if end != -1:
+            return content[end + 4:]
+    return content
+
+def heading_identifier(title, used_ids):
+    """Return the identifier pandoc assigns to a heading (auto_identifiers extension)."""
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', title)
+    text = re.sub(r'[`*]', '', text).lower()
+    text = re.sub(r'[^\w\s.-]', '', text)
+    text = re.sub(r'\s+', '-', text.strip())
+    text = re.sub(r'^[^a-z]+', '', text) or 'section'
+
+    identifier = text
+    suffix = 0
+    while identifier in used_ids:
+        suffix += 1
+        identifier = f"{text}-{suffix}"
+    used_ids.add(identifier)
+    return identifier
+
+def clean_text(text):
+    """Reduce markdown source to plain words for indexing and snippets."""
+    text = re.sub(r'!\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'[`*_#>|]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def split_chapter_sections(file_path, used_ids):
+    """Split a chapter into (title, anchor, text) sections at each heading."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = strip_front_matter(f.read())
+
+    sections = []
+    title, anchor, lines = None, None, []
+    in_fence = False
+    skip_fence = False
+
+    for line in content.split('\n'):
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            if not in_fence:
+                in_fence = True
+                # Diagram sources are noise for full-text search
+                skip_fence = stripped[3:].strip() == 'mermaid'
+            else:
+                in_fence = False
+                skip_fence = False
+            continue
+        if in_fence:
+            if not skip_fence:
+                lines.append(line)
+            continue
+
+        match = re.match(r'^(#{1,6})\s+(.*?)\s*#*\s*$', line)
+        if match:
+            if title is not None:
+                sections.append((title, anchor, clean_text('\n'.join(lines))))
+            title = match.group(2)
+            anchor = heading_identifier(title, used_ids)
+            lines = []
+        else:
+            lines.append(line)
+
+    if title is not None:
+        sections.append((title, anchor, clean_text('\n'.join(lines))))
+    return sections
+
+#########################
+# INDEX CONSTRUCTION
+#########################
+
+def tokenize(text):
+    """Lowercase, split on non-alphanumerics and drop stopwords and single characters."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower())
+            if len(t) > 1 and t not in STOPWORDS_SET]
+
+def collect_documents(chapter_files, glossary_file):
+    """Gather every searchable unit (chapter section or glossary entry) as a document."""
+    documents = []
+    used_ids = set()
+
+    for chapter_path in chapter_files:
+        for title, anchor, text in split_chapter_sections(chapter_path, used_ids):
+            documents.append({
+                'title': clean_text(title),
+                'url': f"#{anchor}",
+                'text': f"{title} {text}",
+                'snippet': text[:SNIPPET_LENGTH],
+            })
+
+    if glossary_file and os.path.exists(glossary_file):
+        for term, definition in parse_glossary(glossary_file):
+            definition = clean_text(definition)
+            documents.append({
+                'title': f"Glossary: {term}",
+                'url': f"#{glossary_anchor(term)}",
+                'text': f"{term} {definition}",
+                'snippet': definition[:SNIPPET_LENGTH],
+            })
+
+    return documents
+
+def build_index(documents):
+    """Build term -> postings with term frequencies, plus document lengths."""
+    postings = defaultdict(list)
+    lengths = []
+
+    for doc_id, document in enumerate(documents):
+        tokens = tokenize(document['text'])
+        lengths.append(len(tokens))
+        for term, tf in Counter(tokens).items():
+            postings[term].append((doc_id, tf))
+
+    return postings, lengths
+
+def encode_postings(entries):
+    """Flatten postings into [gap, tf, gap, tf, ...] with delta-encoded doc ids."""
+    flat = []
+    previous = 0
+    for doc_id, tf in entries:
+        flat.extend((doc_id - previous, tf))
+        previous = doc_id
+    return flat
+
+def write_index(documents, postings, lengths, output_dir, prefix_length):
+    """Write the manifest and the prefix shards to the output directory."""
+    os.makedirs(output_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(output_dir, 'shard-*.json')):
+        os.remove(stale)
+
+    shards = defaultdict(dict)
+    for term in sorted(postings):
+        entries = postings[term]
+        shards[term[:prefix_length]][term] = [len(entries), encode_postings(entries)]
+
+    for prefix, terms in shards.items():
+        shard_path = os.path.join(output_dir, f"shard-{prefix}.json")
+        with open(shard_path, 'w', encoding='utf-8') as f:
+            json.dump(terms, f, separators=(',', ':'))
+
+    manifest = {
+        'version': 1,
+        'prefix_length': prefix_length,
+        'k1': BM25_K1,
+        'b': BM25_B,
+        'doc_count': len(documents),
+        'avg_doc_length': sum(lengths) / max(len(lengths), 1),
+        'stopwords': STOPWORDS,
+        'shards': sorted(shards),
+        'docs': [[d['title'], d['url'], lengths[i], d['snippet']]
+                 for i, d in enumerate(documents)],
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'), ensure_ascii=False)
+
+    return len(shards)
+
+#########################
+# MAIN FUNCTION
+#########################
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the sharded full-text search index for the HTML book')
+    parser.add_argument('--chapters', default='chapters', help='Directory containing the chapter markdown files')
+    parser.add_argument('--glossary', default='GLOSSARY.md', help='Glossary markdown file to index')
+    parser.add_argument('--output', default='search', help='Directory to write the manifest and shards to')
+    parser.add_argument('--prefix-length', type=int, default=2, help='Number of leading term characters per shard')
+
+    args = parser.parse_args()
+
+    chapter_files = sorted(f for f in glob.glob(os.path.join(args.chapters, '*.md'))
+                           if os.path.basename(f) != 'README.md')
+
+    documents = collect_documents(chapter_files, args.glossary)
+    postings, lengths = build_index(documents)
+    num_shards = write_index(documents, postings, lengths, args.output, args.prefix_length)
+
+    print(f"Indexed {len(documents)} documents, {len(postings)} terms into {num_shards} shards in {args.output}/")
+    return 0
+
+if __name__ == "__main__":
+    main()
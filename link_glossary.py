@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Link glossary terms throughout the book in a single pass per chapter.
+
+All GLOSSARY.md terms are compiled into one Aho-Corasick automaton, so scanning
+a chapter costs time linear in its length no matter how many terms there are.
+The first occurrence of each term in a chapter is linked to its anchor in a
+generated glossary chapter. Fenced code (including mermaid diagrams), inline
+code, headings, existing links and raw HTML are never rewritten.
+
+The compiled automaton is cached on disk keyed by the glossary file's hash
+and ``AUTOMATON_VERSION``.
+"""
+
+import os
+import re
+import glob
+import pickle
+import hashlib
+import argparse
+from collections import deque
+
+CACHE_DIR = os.path.join('.cache', 'glossary')
+# Bump whenever the automaton's layout or matching rules change, so stale caches are not reused
+AUTOMATON_VERSION = 2
+
+#########################
+# GLOSSARY PARSING
+#########################
+
+def parse_glossary(file_path):
+    """Return (term, definition) pairs from the 'Term: definition' glossary lines."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+
+    entries = []
+    for line in lines:
+        term, sep, definition = line.partition(':')
+        if sep and definition.strip():
+            entries.append((term.strip(), definition.strip()))
+    return entries
+
+def glossary_anchor(term):
+    """Return the anchor id used for a glossary term in the generated glossary chapter."""
+    primary = term.split('(')[0]
+    slug = re.sub(r'[^a-z0-9]+', '-', primary.lower()).strip('-')
+    return f"glossary-{slug}"
+
+def term_variants(term):
+    """Expand 'Name (Expansion)' into both spellings plus their simple plurals."""
+    match = re.match(r'^(.*?)\s*\((.*)\)$', term)
+    names = [match.group(1), match.group(2)] if match else [term]
+
+    variants = []
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        variants.append(name)
+        if not name.endswith('s'):
+            variants.append(name + 's')
+    return variants
+
+def is_case_sensitive(variant):
+    """Acronyms such as LLM and mixed-case names such as ReAct only match with their exact capitalization."""
+    return any(c.isupper() for word in re.split(r'[\s-]+', variant) for c in word[1:])
+
+def is_word_char(char):
+    """Characters that continue a word, so a term must not start or end next to them ("multi-agent")."""
+    return char.isalnum() or char == '-'
+
+#########################
+# AHO-CORASICK AUTOMATON
+#########################
+
+def build_automaton(entries):
+    """Compile all term variants into goto/fail/output tables over lowercased text."""
+    goto = [{}]
+    outputs = [[]]
+    patterns = []
+
+    for term, _ in entries:
+        anchor = glossary_anchor(term)
+        for variant in term_variants(term):
+            pattern_id = len(patterns)
+            patterns.append((variant, anchor, is_case_sensitive(variant)))
+
+            state = 0
+            for char in variant.lower():
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(pattern_id)
+
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, child in goto[state].items():
+            queue.append(child)
+            if state:
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(char, 0)
+            outputs[child] = outputs[child] + outputs[fail[child]]
+
+    return {'goto': goto, 'fail': fail, 'outputs': outputs, 'patterns': patterns}
+
+def load_automaton(glossary_file, cache_dir=CACHE_DIR):
+    """Load the compiled automaton for this glossary revision, building it on a cache miss."""
+    with open(glossary_file, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    cache_path = os.path.join(cache_dir, f"{digest}-v{AUTOMATON_VERSION}.pickle")
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+
+    automaton = build_automaton(parse_glossary(glossary_file))
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        pickle.dump(automaton, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return automaton
+
+def find_matches(automaton, text, start, end):
+    """Yield (begin, end, pattern_id) for every whole-word match inside text[start:end]."""
+    goto, fail, outputs, patterns = (automaton['goto'], automaton['fail'],
+                                     automaton['outputs'], automaton['patterns'])
+    state = 0
+    for pos in range(start, end):
+        char = text[pos].lower()
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+
+        for pattern_id in outputs[state]:
+            variant, _, case_sensitive = patterns[pattern_id]
+            begin = pos + 1 - len(variant)
+            if begin < start:
+                continue
+            if begin > 0 and is_word_char(text[begin - 1]):
+                continue
+            if pos + 1 < len(text) and is_word_char(text[pos + 1]):
+                continue
+            if case_sensitive and text[begin:pos + 1] != variant:
+                continue
+            yield begin, pos + 1, pattern_id
+
+#########################
+# CHAPTER REWRITING
+#########################
+
+# Spans that must be left untouched outside fenced code blocks
+PROTECTED_INLINE = re.compile(
+    r'`[^`\n]*`'                      # inline code
+    r'|!?\[[^\]\n]*\]\([^)\n]*\)'     # links and images
+    r'|!?\[[^\]\n]*\]\{[^}\n]*\}'     # bracketed spans
+    r'|<[^>\n]+>'                     # raw HTML and autolinks
+    r'|https?://\S+'                  # bare URLs
+)
+
+def linkable_segments(content):
+    """Return (start, end) ranges of prose that may receive glossary links."""
+    segments = []
+    offset = 0
+    in_fence = False
+    in_front_matter = content.startswith('---\n')
+
+    for line_number, line in enumerate(content.split('\n')):
+        line_start = offset
+        offset += len(line) + 1
+        stripped = line.strip()
+
+        if in_front_matter:
+            if line_number > 0 and stripped == '---':
+                in_front_matter = False
+            continue
+        if stripped.startswith('```') or stripped.startswith('~~~'):
+            in_fence = not in_fence
+            continue
+        if in_fence or stripped.startswith('#'):
+            continue
+
+        cursor = line_start
+        for protected in PROTECTED_INLINE.finditer(line):
+            if protected.start() + line_start > cursor:
+                segments.append((cursor, protected.start() + line_start))
+            cursor = protected.end() + line_start
+        if line_start + len(line) > cursor:
+            segments.append((cursor, line_start + len(line)))
+
+    return segments
+
+def link_chapter(content, automaton):
+    """Link the first occurrence of each glossary term in one chapter."""
+    patterns = automaton['patterns']
+    linked_anchors = set()
+    replacements = []
+
+    for seg_start, seg_end in linkable_segments(content):
+        # Leftmost-longest, non-overlapping selection within the segment
+        candidates = sorted(find_matches(automaton, content, seg_start, seg_end),
+                            key=lambda m: (m[0], -(m[1] - m[0])))
+        last_end = seg_start
+        for begin, end, pattern_id in candidates:
+            if begin < last_end:
+                continue
+            anchor = patterns[pattern_id][1]
+            last_end = end
+            if anchor in linked_anchors:
+                continue
+            linked_anchors.add(anchor)
+            replacements.append((begin, end, anchor))
+
+    pieces = []
+    cursor = 0
+    for begin, end, anchor in replacements:
+        pieces.append(content[cursor:begin])
+        pieces.append(f"[{content[begin:end]}](#{anchor})")
+        cursor = end
+    pieces.append(content[cursor:])
+    return ''.join(pieces), len(replacements)
+
+def write_glossary_chapter(entries, output_path):
+    """Write the glossary as a definition list whose terms carry the link anchors."""
+    lines = ['# Glossary', '']
+    for term, definition in entries:
+        lines.append(f"[{term}]{{#{glossary_anchor(term)}}}")
+        lines.append(f":   {definition}")
+        lines.append('')
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+#########################
+# MAIN FUNCTION
+#########################
+
+def main():
+    parser = argparse.ArgumentParser(description='Link glossary terms into the book chapters')
+    parser.add_argument('--chapters', default='chapters', help='Directory containing the chapter markdown files')
+    parser.add_argument('--glossary', default='GLOSSARY.md', help='Glossary markdown file')
+    parser.add_argument('--output', default=os.path.join('build', 'linked'), help='Directory for the linked chapter copies')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Directory for the cached automaton')
+
+    args = parser.parse_args()
+
+    automaton = load_automaton(args.glossary, args.cache_dir)
+    os.makedirs(args.output, exist_ok=True)
+
+    chapter_files = sorted(f for f in glob.glob(os.path.join(args.chapters, '*.md'))
+                           if os.path.basename(f) != 'README.md')
+    total_links = 0
+    for chapter_path in chapter_files:
+        with open(chapter_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        linked, num_links = link_chapter(content, automaton)
+        total_links += num_links
+
+        output_path = os.path.join(args.output, os.path.basename(chapter_path))
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(linked)
+        print(f"Linked {num_links} glossary term(s) in {chapter_path}")
+
+    write_glossary_chapter(parse_glossary(args.glossary), os.path.join(args.output, 'glossary.md'))
+    print(f"Total glossary links: {total_links}")
+    return 0
+
+if __name__ == "__main__":
+    main()
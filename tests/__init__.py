@@ -0,0 +1 @@
+"""Tests for the agent_patterns reference implementations."""
@@ -0,0 +1,223 @@
+"""
+Tests for agent_patterns.tools.policies against a fault-injecting stub tool server.
+
+    python -m unittest tests.test_policies
+"""
+
+import time
+import asyncio
+import unittest
+
+from agent_patterns.tools import ToolRegistry
+from agent_patterns.tools.policies import (
+    PolicyExecutor,
+    RetryPolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    deadline,
+)
+
+
+class StubToolServer:
+    """Tool backend that fails the next `failures` calls and waits `latency` seconds per call."""
+
+    def __init__(self, failures=0, latency=0.0):
+        self.failures = failures
+        self.latency = latency
+        self.calls = 0
+        self.cancelled = 0
+
+    async def search(self, query):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('injected error')
+        return f"results for {query}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def build(server):
+    registry = ToolRegistry()
+    registry.register('search', server.search, {
+        'type': 'object',
+        'properties': {'query': {'type': 'string'}},
+        'required': ['query'],
+    })
+    return PolicyExecutor(registry)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class RetryTest(unittest.TestCase):
+
+    def test_retries_until_success(self):
+        server = StubToolServer(failures=2)
+        executor = build(server)
+        executor.configure('search', retry=RetryPolicy(max_attempts=3, base_delay=0.001, seed=0))
+        self.assertEqual(run(executor.invoke('search', {'query': 'q'})), 'results for q')
+        self.assertEqual(server.calls, 3)
+
+    def test_retries_stop_at_limit(self):
+        server = StubToolServer(failures=10)
+        executor = build(server)
+        executor.configure('search', retry=RetryPolicy(max_attempts=3, base_delay=0.001, seed=0))
+        with self.assertRaises(ConnectionError):
+            run(executor.invoke('search', {'query': 'q'}))
+        self.assertEqual(server.calls, 3)
+
+    def test_non_retryable_error_is_not_retried(self):
+        server = StubToolServer(failures=10)
+        executor = build(server)
+        executor.configure('search', retry=RetryPolicy(max_attempts=3, base_delay=0.001,
+                                                       retry_on=(TimeoutError,), seed=0))
+        with self.assertRaises(ConnectionError):
+            run(executor.invoke('search', {'query': 'q'}))
+        self.assertEqual(server.calls, 1)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        server = StubToolServer(failures=10)
+        executor = build(server)
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=5.0, clock=FakeClock())
+        executor.configure('search', breaker=breaker)
+
+        async def scenario():
+            for _ in range(3):
+                with self.assertRaises(ConnectionError):
+                    await executor.invoke('search', {'query': 'q'})
+            self.assertEqual(breaker.state, 'open')
+            with self.assertRaises(CircuitOpenError):
+                await executor.invoke('search', {'query': 'q'})
+
+        run(scenario())
+        self.assertEqual(server.calls, 3)
+        self.assertEqual(breaker.rejected, 1)
+
+    def test_half_open_trial_closes_on_success(self):
+        server = StubToolServer(failures=2)
+        executor = build(server)
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5.0, clock=clock)
+        executor.configure('search', breaker=breaker)
+
+        async def scenario():
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    await executor.invoke('search', {'query': 'q'})
+            clock.now = 4.9
+            with self.assertRaises(CircuitOpenError):
+                await executor.invoke('search', {'query': 'q'})
+            clock.now = 5.0
+            self.assertEqual(await executor.invoke('search', {'query': 'q'}), 'results for q')
+
+        run(scenario())
+        self.assertEqual(breaker.state, 'closed')
+        self.assertEqual(server.calls, 3)
+
+    def test_half_open_allows_one_trial_and_reopens_on_failure(self):
+        server = StubToolServer(failures=3, latency=0.01)
+        executor = build(server)
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5.0, clock=clock)
+        executor.configure('search', breaker=breaker)
+
+        async def scenario():
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    await executor.invoke('search', {'query': 'q'})
+            clock.now = 5.0
+            # Only the first of two concurrent calls is let through as the trial
+            trial, rejected = await asyncio.gather(executor.invoke('search', {'query': 'q'}),
+                                                   executor.invoke('search', {'query': 'q'}),
+                                                   return_exceptions=True)
+            self.assertIsInstance(trial, ConnectionError)
+            self.assertIsInstance(rejected, CircuitOpenError)
+
+        run(scenario())
+        self.assertEqual(breaker.state, 'open')
+        self.assertEqual(breaker.opened_at, 5.0)
+        self.assertEqual(server.calls, 3)
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def test_deadline_cancels_slow_call(self):
+        server = StubToolServer(latency=1.0)
+        executor = build(server)
+        executor.configure('search', timeout=5.0)
+
+        async def scenario():
+            start = time.monotonic()
+            with deadline(0.05):
+                with self.assertRaises(DeadlineExceeded):
+                    await executor.invoke('search', {'query': 'q'})
+            return time.monotonic() - start
+
+        self.assertLess(run(scenario()), 0.5)
+        self.assertEqual(server.cancelled, 1)
+
+    def test_deadline_stops_retries(self):
+        server = StubToolServer(failures=10, latency=0.02)
+        executor = build(server)
+        executor.configure('search', retry=RetryPolicy(max_attempts=100, base_delay=0.001, max_delay=0.001, seed=0))
+
+        async def scenario():
+            with deadline(0.1):
+                with self.assertRaises((ConnectionError, DeadlineExceeded)):
+                    await executor.invoke('search', {'query': 'q'})
+
+        run(scenario())
+        self.assertLess(server.calls, 100)
+
+    def test_nested_deadline_keeps_the_earlier_one(self):
+        server = StubToolServer(latency=1.0)
+        executor = build(server)
+        executor.configure('search')
+
+        async def scenario():
+            with deadline(0.05):
+                with deadline(10.0):
+                    with self.assertRaises(DeadlineExceeded):
+                        await executor.invoke('search', {'query': 'q'})
+
+        run(scenario())
+        self.assertEqual(server.cancelled, 1)
+
+
+class NoPolicyTest(unittest.TestCase):
+
+    def test_validates_arguments_once(self):
+        server = StubToolServer()
+        executor = build(server)
+        tool = executor.registry.get('search')
+        validate = tool.validate
+        checked = []
+
+        def counting(arguments):
+            checked.append(arguments)
+            return validate(arguments)
+
+        tool.validate = counting
+        self.assertEqual(run(executor.invoke('search', {'query': 'q'})), 'results for q')
+        self.assertEqual(len(checked), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()